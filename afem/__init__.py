@@ -18,5 +18,6 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
 import warnings
 
-# Always show warnings (maybe put them in the log?)
-warnings.simplefilter('always', Warning)
+# Always show warnings issued by AFEM without changing how warnings from
+# other packages are filtered (maybe put them in the log?)
+warnings.filterwarnings('always', module=r'afem(\.|$)')
@@ -19,7 +19,7 @@
 from OCC.Core.Quantity import Quantity_TOC_RGB, Quantity_Color
 from numpy.random import rand
 
-__all__ = ["Metadata", "NamedItem", "ViewableItem"]
+__all__ = ["Metadata", "NamedItem", "ViewableItem", "VersionedItem"]
 
 
 class Metadata(dict):
@@ -157,3 +157,73 @@ class ViewableItem(object):
         """
         r, g, b = rand(1, 3)[0]
         self._color = Quantity_Color(r, g, b, Quantity_TOC_RGB)
+
+
+class VersionedItem(object):
+    """
+    Base class for types that keep a version number and notify subscribers
+    when they change. The version starts at zero and is incremented every
+    time the item changes so it can be stored along with derived data to
+    check if the data is still valid.
+
+    Subscribers are callables with the signature
+    ``callback(item, event, old, new)`` where *item* is the changed item,
+    *event* is a string describing what changed (e.g., "shape"), and *old*
+    and *new* are the previous and current values.
+    """
+
+    def __init__(self):
+        self._version = 0
+        self._subscribers = []
+
+    @property
+    def version(self):
+        """
+        :return: The version. This increases every time the item changes.
+        :rtype: int
+        """
+        return self._version
+
+    def subscribe(self, callback):
+        """
+        Subscribe to change events. A callback is only added once.
+
+        :param callable callback: The callback.
+
+        :return: None.
+        """
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """
+        Unsubscribe from change events.
+
+        :param callable callback: The callback.
+
+        :return: None.
+        """
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def notify(self, event, old=None, new=None):
+        """
+        Increment the version and notify subscribers of a change. This should
+        be called if the item is modified in a way it cannot detect itself.
+
+        :param str event: The event.
+        :param old: The previous value.
+        :param new: The current value.
+
+        :return: None.
+        """
+        self._publish(self, event, old, new)
+
+    def _publish(self, item, event, old, new):
+        """
+        Increment the version and call the subscribers for a change of the
+        item, which may be this one or one it depends on.
+        """
+        self._version += 1
+        for callback in list(self._subscribers):
+            callback(item, event, old, new)
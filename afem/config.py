@@ -19,15 +19,29 @@
 import logging
 import sys
 
-# Initialize logger.
-with open('afem.log', 'w') as log:
-    log.write('-----------------------------\n')
-    log.write('AFEM LOGGING FILE INITIALIZED\n')
-    log.write('-----------------------------\n')
+
+class _LogFileHandler(logging.FileHandler):
+    """
+    File handler that creates the log file and writes its header when the
+    first record is emitted rather than when the handler is created.
+    """
+
+    def __init__(self, fn):
+        super(_LogFileHandler, self).__init__(fn, mode='w', delay=True)
+
+    def _open(self):
+        stream = super(_LogFileHandler, self)._open()
+        stream.write('-----------------------------\n')
+        stream.write('AFEM LOGGING FILE INITIALIZED\n')
+        stream.write('-----------------------------\n')
+        return stream
+
+
+# Initialize logger. The log file is not created until something is logged.
 logger = logging.getLogger('afem')
 logger.setLevel(logging.INFO)
-_fh = logging.FileHandler('afem.log')
 _fmt = logging.Formatter('%(levelname)s: %(message)s')
+_fh = _LogFileHandler('afem.log')
 _fh.setFormatter(_fmt)
 logger.addHandler(_fh)
 
@@ -92,6 +106,30 @@ class Settings(object):
         chdlr.setFormatter(_fmt)
         logger.addHandler(chdlr)
 
+    @staticmethod
+    def set_log_file(fn='afem.log'):
+        """
+        Set the file the main logger writes to. The file is created (and
+        truncated) when the first record is logged.
+
+        :param fn: The filename. If *None*, logging to a file is disabled.
+        :type fn: str or None
+
+        :return: None.
+        """
+        global _fh
+        if _fh is not None:
+            logger.removeHandler(_fh)
+            _fh.close()
+            _fh = None
+
+        if fn is None:
+            return None
+
+        _fh = _LogFileHandler(fn)
+        _fh.setFormatter(_fmt)
+        logger.addHandler(_fh)
+
     @staticmethod
     def set_loggging_level(level='info'):
         """
@@ -16,19 +16,24 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with this library; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+from bisect import bisect_right
 from collections import Sequence
 
-from afem.base.entities import NamedItem, ViewableItem
+from OCC.Core.GCPnts import GCPnts_AbscissaPoint
+
+from afem.adaptor.entities import AdaptorCurve, AdaptorSurface
+from afem.base.entities import NamedItem, ViewableItem, VersionedItem
 from afem.config import logger
 from afem.geometry.check import CheckGeom
 from afem.geometry.create import (PointFromParameter, PlaneFromParameter,
                                   PlaneByPoints)
 from afem.geometry.entities import TrimmedCurve
-from afem.geometry.project import ProjectPointToCurve, ProjectPointToSurface
+from afem.geometry.project import (ProjectPointToCurve, ProjectPointToSurface,
+                                  ProjectPointsToSurface)
 from afem.topology.bop import IntersectShapes
 from afem.topology.create import (CompoundByShapes, PointsAlongShapeByNumber,
                                   PointsAlongShapeByDistance, ShellByFaces,
-                                  WiresByConnectedEdges, FaceBySurface,
+                                  WiresByEdgeEndpoints, FaceBySurface,
                                   PlanesAlongShapeByNumber,
                                   PlanesAlongShapeByDistance)
 from afem.topology.distance import DistancePointToShapes
@@ -38,9 +43,12 @@ from afem.topology.modify import DivideC0Shape, DivideClosedShape
 __all__ = ["ShapeHolder"]
 
 
-class ShapeHolder(NamedItem, ViewableItem):
+class ShapeHolder(NamedItem, ViewableItem, VersionedItem):
     """
     Core class that holds a shape plus reference geometry and common methods.
+    Setting the shape or reference geometry increments the version and
+    notifies subscribers with a "shape", "cref", or "sref" event (see
+    :class:`.VersionedItem`).
 
     :param str name: The name.
     :param cref: The reference curve. If it is not a :class:`.TrimmedCurve`,
@@ -57,6 +65,10 @@ class ShapeHolder(NamedItem, ViewableItem):
                  expected_types=(Shape,)):
         super(ShapeHolder, self).__init__(name)
         ViewableItem.__init__(self)
+        VersionedItem.__init__(self)
+
+        # Cache for data derived from the shape and reference geometry
+        self._cache = {}
 
         # Set expected types
         if isinstance(expected_types, Sequence):
@@ -101,6 +113,18 @@ class ShapeHolder(NamedItem, ViewableItem):
     def shape(self, shape):
         self.set_shape(shape)
 
+    @property
+    def is_instance(self):
+        """
+        :return: *True* if the shape has a location and may share its
+            underlying topology with other shapes (see
+            :func:`.instance_shape`), *False* if not.
+        :rtype: bool
+        """
+        if self._shape is None:
+            return False
+        return not self._shape.object.Location().IsIdentity()
+
     @property
     def displayed_shape(self):
         """
@@ -163,6 +187,44 @@ class ShapeHolder(NamedItem, ViewableItem):
             return self.sref
         raise TypeError('Reference surface is not a plane.')
 
+    @property
+    def cref_edge(self):
+        """
+        :return: An edge of the reference curve. This is cached until the
+            reference curve is changed.
+        :rtype: afem.topology.entities.Edge
+        """
+        return self._cached('cref_edge', lambda: Edge.by_curve(self._cref))
+
+    @property
+    def cref_adaptor(self):
+        """
+        :return: An adaptor of the reference curve. This is cached until the
+            reference curve is changed.
+        :rtype: afem.adaptor.entities.AdaptorCurve
+        """
+        return self._cached('cref_adaptor',
+                            lambda: AdaptorCurve.to_adaptor(self._cref))
+
+    @property
+    def cref_length(self):
+        """
+        :return: The length of the reference curve. This is cached until the
+            reference curve is changed.
+        :rtype: float
+        """
+        return self._cref_table().length
+
+    @property
+    def sref_adaptor(self):
+        """
+        :return: An adaptor of the reference surface. This is cached until the
+            reference surface is changed.
+        :rtype: afem.adaptor.entities.AdaptorSurface
+        """
+        return self._cached('sref_adaptor',
+                            lambda: AdaptorSurface.to_adaptor(self._sref))
+
     @property
     def sref_shape(self):
         """
@@ -189,6 +251,58 @@ class ShapeHolder(NamedItem, ViewableItem):
         """
         return CompoundByShapes(self._shape.faces).compound
 
+    def clear_cache(self):
+        """
+        Clear data cached from the shape and reference geometry (e.g.,
+        adaptors, arc-length tables, and bounding boxes). Changing the shape
+        or reference geometry through this class does this automatically, but
+        it should be called if they are modified directly. Use
+        :meth:`.notify` instead to also let subscribers know.
+
+        :return: None.
+        """
+        self._cache.clear()
+
+    def notify(self, event, old=None, new=None):
+        """
+        Clear the cache, increment the version, and notify subscribers of a
+        change.
+
+        :param str event: The event.
+        :param old: The previous value.
+        :param new: The current value.
+
+        :return: None.
+        """
+        self._cache.clear()
+        VersionedItem.notify(self, event, old, new)
+
+    def _cached(self, key, func):
+        """
+        Get a cached value or compute it with *func* and cache it.
+        """
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = func()
+            self._cache[key] = value
+            return value
+
+    def _shape_bbox(self):
+        """
+        Compute the bounding box of the shape.
+        """
+        bbox = BBox()
+        bbox.add_shape(self._shape)
+        return bbox
+
+    def _cref_table(self):
+        """
+        Get the arc-length table of the reference curve.
+        """
+        return self._cached('cref_table',
+                            lambda: _ArcLengthTable(self.cref_adaptor))
+
     def set_shape(self, shape):
         """
         Set the shape.
@@ -216,7 +330,8 @@ class ShapeHolder(NamedItem, ViewableItem):
                                                       expected))
             logger.warning(msg)
 
-        self._shape = shape
+        old, self._shape = self._shape, shape
+        self.notify('shape', old, shape)
 
     def set_cref(self, cref):
         """
@@ -235,10 +350,12 @@ class ShapeHolder(NamedItem, ViewableItem):
         if not CheckGeom.is_curve(cref):
             raise TypeError('Invalid curve type.')
 
+        old = self._cref
         if isinstance(cref, TrimmedCurve):
             self._cref = cref
         else:
             self._cref = TrimmedCurve.by_parameters(cref)
+        self.notify('cref', old, self._cref)
 
     def set_sref(self, sref):
         """
@@ -260,13 +377,14 @@ class ShapeHolder(NamedItem, ViewableItem):
             raise TypeError(msg)
 
         # Set the surface
-        self._sref = sref
+        old, self._sref = self._sref, sref
 
         # Convert to a shape for robustness
         shape = FaceBySurface(sref).face
         shape = DivideClosedShape(shape).shape
         shape = DivideC0Shape(shape).shape
         self._sref_shape = shape
+        self.notify('sref', old, sref)
 
     def set_u1(self, u1):
         """
@@ -284,6 +402,7 @@ class ShapeHolder(NamedItem, ViewableItem):
             raise ValueError(msg)
 
         self._cref.set_trim(u1, self._cref.u2)
+        self.notify('cref', self._cref, self._cref)
 
     def set_u2(self, u2):
         """
@@ -301,6 +420,7 @@ class ShapeHolder(NamedItem, ViewableItem):
             raise ValueError(msg)
 
         self._cref.set_trim(self._cref.u1, u2)
+        self.notify('cref', self._cref, self._cref)
 
     def set_p1(self, p1):
         """
@@ -402,10 +522,14 @@ class ShapeHolder(NamedItem, ViewableItem):
         if u0 is None:
             u0 = self._cref.u1
 
+        table = self._cref_table()
         if is_rel:
-            ds *= self._cref.length
+            ds *= table.length
 
-        return PointFromParameter(self._cref, u0, ds).point
+        u = table.parameter(u0, ds)
+        if u is None:
+            return PointFromParameter(self.cref_adaptor, u0, ds).point
+        return self.cref_adaptor.eval(u)
 
     def points_by_number(self, n, d1=None, d2=None, shape1=None,
                          shape2=None):
@@ -425,10 +549,10 @@ class ShapeHolder(NamedItem, ViewableItem):
             point. This shape is intersected with the edge or wire.
 
         :return: The points.
-        :rtype: list(afem.geometry.entities.Point)
+        :rtype: afem.geometry.entities.PointArray
         """
-        edge = Edge.by_curve(self._cref)
-        builder = PointsAlongShapeByNumber(edge, n, d1, d2, shape1, shape2)
+        builder = PointsAlongShapeByNumber(self.cref_edge, n, d1, d2, shape1,
+                                           shape2)
         return builder.points
 
     def points_by_distance(self, maxd, nmin=0, d1=None, d2=None, shape1=None,
@@ -451,11 +575,10 @@ class ShapeHolder(NamedItem, ViewableItem):
             point. This shape is intersected with the edge or wire.
 
         :return: The points.
-        :rtype: list(afem.geometry.entities.Point)
+        :rtype: afem.geometry.entities.PointArray
         """
-        edge = Edge.by_curve(self._cref)
-        builder = PointsAlongShapeByDistance(edge, maxd, d1, d2, shape1,
-                                             shape2, nmin)
+        builder = PointsAlongShapeByDistance(self.cref_edge, maxd, d1, d2,
+                                             shape1, shape2, nmin)
         return builder.points
 
     def point_to_cref(self, pnt, direction=None):
@@ -469,7 +592,8 @@ class ShapeHolder(NamedItem, ViewableItem):
         :return: *True* if projected, *False* if not.
         :rtype: bool
         """
-        proj = ProjectPointToCurve(pnt, self._cref, direction, update=True)
+        proj = ProjectPointToCurve(pnt, self.cref_adaptor, direction,
+                                   update=True)
         if not proj.success:
             return False
         return True
@@ -478,8 +602,9 @@ class ShapeHolder(NamedItem, ViewableItem):
         """
         Project points to the reference curve.
 
-        :param list(afem.geometry.entities.Point) pnts: The points. Position
-            will be updated.
+        :param pnts: The points. Position will be updated.
+        :type pnts: list(afem.geometry.entities.Point) or
+            afem.geometry.entities.PointArray
         :param vector_like direction: Projection direction.
 
         :return: List of status for each point.
@@ -502,7 +627,7 @@ class ShapeHolder(NamedItem, ViewableItem):
         :return: *True* if projected, *False* if not.
         :rtype: bool
         """
-        proj = ProjectPointToSurface(pnt, self._sref, direction)
+        proj = ProjectPointToSurface(pnt, self.sref_adaptor, direction)
         if not proj.success:
             return False
 
@@ -514,13 +639,32 @@ class ShapeHolder(NamedItem, ViewableItem):
         """
         Project points to reference surface.
 
-        :param list(afem.geometry.entities.Point) pnts: The points. Position
-            will be updated.
+        :param pnts: The points. Position will be updated.
+        :type pnts: list(afem.geometry.entities.Point) or
+            afem.geometry.entities.PointArray
         :param vector_like direction: Projection direction.
 
         :return: List of status for each point.
         :rtype: list(bool)
+
+        .. note::
+
+            If no direction is given, the points are projected in a single
+            batch using :class:`.ProjectPointsToSurface`. Points that fail in
+            the batch are projected again one at a time and are not moved if
+            that fails too.
         """
+        if direction is None:
+            proj = ProjectPointsToSurface(pnts, self._sref)
+            success = proj.status.tolist()
+            xyz = proj.points.xyz
+            for i, p in enumerate(pnts):
+                if success[i]:
+                    p.set_xyz(xyz[i])
+                else:
+                    success[i] = self.point_to_sref(p)
+            return success
+
         success = []
         for p in pnts:
             status = self.point_to_sref(p, direction)
@@ -551,10 +695,15 @@ class ShapeHolder(NamedItem, ViewableItem):
         if u0 is None:
             u0 = self.cref.u1
 
+        table = self._cref_table()
         if is_rel:
-            ds *= self.cref.length
+            ds *= table.length
 
-        return PlaneFromParameter(self._cref, u0, ds, ref_pln, tol).plane
+        u = table.parameter(u0, ds)
+        if u is not None:
+            u0, ds = u, 0.
+        return PlaneFromParameter(self.cref_adaptor, u0, ds, ref_pln,
+                                  tol).plane
 
     def planes_by_number(self, n, ref_pln=None, d1=None, d2=None,
                          shape1=None, shape2=None):
@@ -583,9 +732,8 @@ class ShapeHolder(NamedItem, ViewableItem):
         :raise TypeError: If *shape* if not an edge or wire.
         :raise RuntimeError: If OCC method fails.
         """
-        edge = Edge.by_curve(self._cref)
-        return PlanesAlongShapeByNumber(edge, n, ref_pln, d1, d2, shape1,
-                                        shape2).planes
+        return PlanesAlongShapeByNumber(self.cref_edge, n, ref_pln, d1, d2,
+                                        shape1, shape2).planes
 
     def planes_by_distance(self, maxd, ref_pln=None, d1=None, d2=None,
                            shape1=None, shape2=None, nmin=0):
@@ -616,9 +764,8 @@ class ShapeHolder(NamedItem, ViewableItem):
         :raise TypeError: If *shape* if not an edge or wire.
         :raise RuntimeError: If OCC method fails.
         """
-        edge = Edge.by_curve(self._cref)
-        return PlanesAlongShapeByDistance(edge, maxd, ref_pln, d1, d2, shape1,
-                                          shape2, nmin).planes
+        return PlanesAlongShapeByDistance(self.cref_edge, maxd, ref_pln, d1,
+                                          d2, shape1, shape2, nmin).planes
 
     def make_shell(self):
         """
@@ -642,7 +789,7 @@ class ShapeHolder(NamedItem, ViewableItem):
         :rtype: afem.topology.entities.BBox
         """
         bbox = BBox()
-        bbox.add_shape(self._shape)
+        bbox.add_box(self._cached('bbox', self._shape_bbox))
         if tol is not None:
             bbox.enlarge(tol)
         return bbox
@@ -704,7 +851,7 @@ class ShapeHolder(NamedItem, ViewableItem):
         shape = bop.shape
 
         edges = shape.edges
-        builder = WiresByConnectedEdges(edges)
+        builder = WiresByEdgeEndpoints(edges)
         if builder.nwires == 0:
             msg = 'Failed to extract any curves.'
             raise RuntimeError(msg)
@@ -733,3 +880,68 @@ class ShapeHolder(NamedItem, ViewableItem):
             u1c, u2c = crv.reversed_u(u1c), crv.reversed_u(u2c)
 
         return TrimmedCurve.by_parameters(crv, u1c, u2c)
+
+
+class _ArcLengthTable(object):
+    """
+    Table of cumulative arc length at uniformly spaced parameters of a curve.
+    Distances along the curve are found by integrating only from the nearest
+    table entry.
+    """
+    _NSEGMENTS = 32
+
+    def __init__(self, adp_crv, tol=1.0e-7):
+        self._adp = adp_crv
+        self._tol = tol
+        u1, u2 = adp_crv.u1, adp_crv.u2
+        n = self._NSEGMENTS
+        du = (u2 - u1) / n
+        prms = [u1 + i * du for i in range(n)] + [u2]
+        lengths = [0.]
+        for ui, uj in zip(prms[:-1], prms[1:]):
+            lengths.append(lengths[-1] + self._length(ui, uj))
+        self._prms = prms
+        self._lengths = lengths
+
+    @property
+    def length(self):
+        """
+        :return: The total length.
+        :rtype: float
+        """
+        return self._lengths[-1]
+
+    def _length(self, u1, u2):
+        """
+        Signed length between two parameters.
+        """
+        if u1 == u2:
+            return 0.
+        if u1 > u2:
+            return -self._length(u2, u1)
+        return GCPnts_AbscissaPoint.Length_(self._adp.object, u1, u2,
+                                            self._tol)
+
+    def distance(self, u):
+        """
+        Arc length from the first parameter to *u*.
+        """
+        i = bisect_right(self._prms, u) - 1
+        i = min(max(i, 0), len(self._prms) - 2)
+        return self._lengths[i] + self._length(self._prms[i], u)
+
+    def parameter(self, u0, ds):
+        """
+        Parameter at a distance *ds* from *u0* or *None* if the result is
+        outside the table or the computation fails.
+        """
+        s = self.distance(u0) + ds
+        if s < 0. or s > self.length:
+            return None
+        i = bisect_right(self._lengths, s) - 1
+        i = min(max(i, 0), len(self._prms) - 2)
+        tool = GCPnts_AbscissaPoint(self._tol, self._adp.object,
+                                    s - self._lengths[i], self._prms[i])
+        if not tool.IsDone():
+            return None
+        return tool.Parameter()
@@ -0,0 +1,481 @@
+# This file is part of AFEM which provides an engineering toolkit for airframe
+# finite element modeling during conceptual design.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC (info@laughlinresearch.com)
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import json
+import struct
+
+from numpy import argsort, array, cumsum, fromfile, int32, memmap, zeros
+
+from afem.config import logger
+from afem.misc.trace import Tracer
+
+__all__ = ["MeshArrays", "write_binmesh", "read_binmesh"]
+
+# File signature and version
+_MAGIC = b'AFEMMESH'
+_VERSION = 1
+
+# Alignment of the header and each array in bytes
+_ALIGN = 64
+
+# Names and data types of the stored arrays
+_ARRAYS = [('node_ids', '<i4'),
+           ('node_xyz', '<f8'),
+           ('node_shapes', '<i4'),
+           ('elm_ids', '<i4'),
+           ('elm_types', '<i1'),
+           ('elm_shapes', '<i4'),
+           ('elm_offsets', '<i8'),
+           ('elm_nodes', '<i4'),
+           ('group_offsets', '<i8'),
+           ('group_members', '<i4')]
+
+
+class MeshArrays(object):
+    """
+    Nodes, elements, and groups of a mesh stored as flat arrays. Element
+    connectivity is stored in compressed form where the node IDs of element
+    *i* are ``elm_nodes[elm_offsets[i]:elm_offsets[i + 1]]``. Group
+    memberships are stored the same way using *group_offsets* and
+    *group_members*.
+
+    :param dict arrays: The arrays by name.
+    :param list(tuple(str, int)) groups: The name and element type of each
+        group.
+    """
+
+    def __init__(self, arrays, groups=()):
+        self._arrays = arrays
+        self._groups = [(str(name), int(type_)) for name, type_ in groups]
+
+    @property
+    def num_nodes(self):
+        """
+        :return: Number of nodes.
+        :rtype: int
+        """
+        return self._arrays['node_ids'].shape[0]
+
+    @property
+    def num_elms(self):
+        """
+        :return: Number of elements.
+        :rtype: int
+        """
+        return self._arrays['elm_ids'].shape[0]
+
+    @property
+    def num_groups(self):
+        """
+        :return: Number of groups.
+        :rtype: int
+        """
+        return len(self._groups)
+
+    @property
+    def node_ids(self):
+        """
+        :return: The node IDs.
+        :rtype: numpy.ndarray
+        """
+        return self._arrays['node_ids']
+
+    @property
+    def node_xyz(self):
+        """
+        :return: The node coordinates as an (n, 3) array.
+        :rtype: numpy.ndarray
+        """
+        return self._arrays['node_xyz']
+
+    @property
+    def node_shapes(self):
+        """
+        :return: The index of the shape each node is on. Zero if not on a
+            shape.
+        :rtype: numpy.ndarray
+        """
+        return self._arrays['node_shapes']
+
+    @property
+    def elm_ids(self):
+        """
+        :return: The element IDs.
+        :rtype: numpy.ndarray
+        """
+        return self._arrays['elm_ids']
+
+    @property
+    def elm_types(self):
+        """
+        :return: The element types as ``SMDSAbs_ElementType`` values.
+        :rtype: numpy.ndarray
+        """
+        return self._arrays['elm_types']
+
+    @property
+    def elm_shapes(self):
+        """
+        :return: The index of the shape each element is on. Zero if not on a
+            shape.
+        :rtype: numpy.ndarray
+        """
+        return self._arrays['elm_shapes']
+
+    @property
+    def elm_offsets(self):
+        """
+        :return: Offsets into the element connectivity.
+        :rtype: numpy.ndarray
+        """
+        return self._arrays['elm_offsets']
+
+    @property
+    def elm_nodes(self):
+        """
+        :return: The node IDs of all elements.
+        :rtype: numpy.ndarray
+        """
+        return self._arrays['elm_nodes']
+
+    @property
+    def group_names(self):
+        """
+        :return: The group names.
+        :rtype: list(str)
+        """
+        return [name for name, _ in self._groups]
+
+    def elm_nids(self, i):
+        """
+        Get the node IDs of an element.
+
+        :param int i: The element index (not its ID).
+
+        :return: The node IDs.
+        :rtype: numpy.ndarray
+        """
+        offsets = self._arrays['elm_offsets']
+        return self._arrays['elm_nodes'][offsets[i]:offsets[i + 1]]
+
+    def group_type(self, i):
+        """
+        Get the element type of a group.
+
+        :param int i: The group index.
+
+        :return: The element type as an ``SMDSAbs_ElementType`` value.
+        :rtype: int
+        """
+        return self._groups[i][1]
+
+    def group_ids(self, i):
+        """
+        Get the IDs of the members of a group.
+
+        :param int i: The group index.
+
+        :return: The node or element IDs.
+        :rtype: numpy.ndarray
+        """
+        offsets = self._arrays['group_offsets']
+        return self._arrays['group_members'][offsets[i]:offsets[i + 1]]
+
+    @classmethod
+    def from_mesh(cls, the_mesh, groups=()):
+        """
+        Gather the arrays from a mesh.
+
+        :param afem.smesh.entities.Mesh the_mesh: The mesh.
+        :param collections.Sequence(afem.smesh.entities.MeshGroup) groups:
+            Groups whose memberships should be stored.
+
+        :return: The mesh arrays.
+        :rtype: afem.exchange.binmesh.MeshArrays
+        """
+        ds = the_mesh.ds.object
+
+        # Nodes
+        nnodes = ds.NbNodes()
+        node_ids = zeros(nnodes, dtype='<i4')
+        node_xyz = zeros((nnodes, 3), dtype='<f8')
+        node_shapes = zeros(nnodes, dtype='<i4')
+        it = ds.nodesIterator(True)
+        i = 0
+        while it.more():
+            n = it.next()
+            node_ids[i] = n.GetID()
+            node_xyz[i] = n.X(), n.Y(), n.Z()
+            node_shapes[i] = n.getshapeId()
+            i += 1
+
+        # Elements
+        elm_ids, elm_types, elm_shapes = [], [], []
+        nelm_nodes, elm_nodes = [], []
+        for it in (ds.edgesIterator(True), ds.facesIterator(True),
+                   ds.volumesIterator(True)):
+            while it.more():
+                e = it.next()
+                elm_ids.append(e.GetID())
+                elm_types.append(int(e.GetType()))
+                elm_shapes.append(e.getshapeId())
+                nelm_nodes.append(e.NbNodes())
+                nit = e.nodeIterator()
+                while nit.more():
+                    elm_nodes.append(nit.next().GetID())
+        elm_offsets = zeros(len(elm_ids) + 1, dtype='<i8')
+        cumsum(nelm_nodes, out=elm_offsets[1:])
+
+        # Groups
+        group_info, members, sizes = [], [], []
+        for group in groups:
+            group_info.append((group.name, int(group.type)))
+            ids = []
+            it = group.object.GetGroupDS().GetElements()
+            while it.more():
+                ids.append(it.next().GetID())
+            members.extend(ids)
+            sizes.append(len(ids))
+        group_offsets = zeros(len(sizes) + 1, dtype='<i8')
+        cumsum(sizes, out=group_offsets[1:])
+
+        arrays = {'node_ids': node_ids,
+                  'node_xyz': node_xyz,
+                  'node_shapes': node_shapes,
+                  'elm_ids': array(elm_ids, dtype='<i4'),
+                  'elm_types': array(elm_types, dtype='<i1'),
+                  'elm_shapes': array(elm_shapes, dtype='<i4'),
+                  'elm_offsets': elm_offsets,
+                  'elm_nodes': array(elm_nodes, dtype='<i4'),
+                  'group_offsets': group_offsets,
+                  'group_members': array(members, dtype='<i4')}
+        return cls(arrays, group_info)
+
+    def save(self, fn):
+        """
+        Write the arrays to a binary file.
+
+        :param str fn: The filename.
+
+        :return: None.
+        """
+        # Lay out the arrays after the header
+        specs = {}
+        layout = []
+        offset = 0
+        for name, dt in _ARRAYS:
+            data = self._arrays[name].astype(dt, copy=False)
+            specs[name] = [dt, list(data.shape), offset]
+            layout.append((offset, data))
+            offset = _aligned(offset + data.nbytes)
+        header = json.dumps({'version': _VERSION,
+                             'arrays': specs,
+                             'groups': self._groups}).encode('utf-8')
+        start = _aligned(len(_MAGIC) + 8 + len(header))
+
+        with open(fn, 'wb') as fout:
+            fout.write(_MAGIC)
+            fout.write(struct.pack('<II', _VERSION, len(header)))
+            fout.write(header)
+            for pos, data in layout:
+                fout.seek(start + pos)
+                data.tofile(fout)
+            fout.truncate(start + offset)
+
+    @classmethod
+    def load(cls, fn, mmap=True):
+        """
+        Read the arrays from a binary file.
+
+        :param str fn: The filename.
+        :param bool mmap: Option to memory map the arrays instead of reading
+            them. The memory mapped arrays are read-only.
+
+        :return: The mesh arrays.
+        :rtype: afem.exchange.binmesh.MeshArrays
+
+        :raise ValueError: If the file is not a binary mesh file or its
+            version is not supported.
+        """
+        with open(fn, 'rb') as fin:
+            magic = fin.read(len(_MAGIC))
+            if magic != _MAGIC:
+                raise ValueError('Not a binary mesh file.')
+            version, nbytes = struct.unpack('<II', fin.read(8))
+            if version > _VERSION:
+                msg = 'Unsupported binary mesh version {}.'.format(version)
+                raise ValueError(msg)
+            header = json.loads(fin.read(nbytes).decode('utf-8'))
+            start = _aligned(len(_MAGIC) + 8 + nbytes)
+
+            arrays = {}
+            for name, (dt, shape, offset) in header['arrays'].items():
+                size = 1
+                for n in shape:
+                    size *= n
+                if size == 0:
+                    arrays[name] = zeros(shape, dtype=dt)
+                elif mmap:
+                    arrays[name] = memmap(fn, dtype=dt, mode='r',
+                                          offset=start + offset,
+                                          shape=tuple(shape))
+                else:
+                    fin.seek(start + offset)
+                    arrays[name] = fromfile(fin, dt, size).reshape(shape)
+
+        return cls(arrays, header['groups'])
+
+    def to_mesh(self, gen, shape=None):
+        """
+        Build a mesh from the arrays. Nodes and elements are added through a
+        :class:`.MeshHelper` on the shape with their stored shape index, so
+        *shape* should be the shape the original mesh was built on. The
+        positions of nodes on their shapes (i.e., their parameters) are not
+        restored. Only 2-node edges and 3- and 4-node faces are supported.
+
+        :param afem.smesh.entities.MeshGen gen: The mesh generator.
+        :param afem.topology.entities.Shape shape: The shape. If *None*, then
+            the mesh is not on geometry and shape indices are ignored.
+
+        :return: The mesh and the created groups.
+        :rtype: tuple(afem.smesh.entities.Mesh,
+            list(afem.smesh.entities.MeshGroup))
+        """
+        from afem.smesh.entities import Mesh
+        from afem.smesh.utils import MeshHelper
+
+        with Tracer.span('MeshArrays.to_mesh') as span:
+            the_mesh = gen.create_mesh(shape)
+            helper = MeshHelper(the_mesh).object
+            ds = the_mesh.ds.object
+
+            # Nodes ordered by shape index to set each shape once
+            node_shapes = self.node_shapes
+            if shape is None:
+                node_shapes = zeros(self.num_nodes, dtype=int32)
+            ids = self.node_ids.tolist()
+            xyz = self.node_xyz.tolist()
+            sids = node_shapes.tolist()
+            current = None
+            for k in argsort(node_shapes, kind='mergesort').tolist():
+                if sids[k] != current:
+                    current = sids[k]
+                    helper.SetSubShape(current)
+                x, y, z = xyz[k]
+                helper.AddNode(x, y, z, ids[k], 0., 0.)
+
+            # Elements
+            elm_shapes = self.elm_shapes
+            if shape is None:
+                elm_shapes = zeros(self.num_elms, dtype=int32)
+            ids = self.elm_ids.tolist()
+            types = self.elm_types.tolist()
+            sids = elm_shapes.tolist()
+            offsets = self.elm_offsets.tolist()
+            nids = self.elm_nodes.tolist()
+            edge, face = int(Mesh.EDGE), int(Mesh.FACE)
+            current = None
+            nskipped = 0
+            for k in argsort(elm_shapes, kind='mergesort').tolist():
+                nodes = [ds.FindNode(nid)
+                         for nid in nids[offsets[k]:offsets[k + 1]]]
+                if sids[k] != current:
+                    current = sids[k]
+                    helper.SetSubShape(current)
+                if types[k] == edge and len(nodes) == 2:
+                    helper.AddEdge(nodes[0], nodes[1], ids[k], True)
+                elif types[k] == face and len(nodes) in (3, 4):
+                    helper.AddFace(*(nodes + [ids[k], False]))
+                else:
+                    nskipped += 1
+            if nskipped:
+                logger.warning('Skipped {} unsupported elements when building '
+                               'a mesh from arrays.'.format(nskipped))
+
+            # Groups
+            groups = []
+            for i, (name, type_) in enumerate(self._groups):
+                group = the_mesh.create_group(name, _element_type(type_))
+                group_ds = group.object.GetGroupDS()
+                for id_ in self.group_ids(i).tolist():
+                    group_ds.Add(id_)
+                groups.append(group)
+
+            if span:
+                span.set(n_nodes=self.num_nodes, n_elms=self.num_elms,
+                         n_groups=self.num_groups)
+
+        return the_mesh, groups
+
+
+def write_binmesh(the_mesh, fn, groups=()):
+    """
+    Write a mesh to a binary file that can be memory mapped when read.
+
+    :param afem.smesh.entities.Mesh the_mesh: The mesh.
+    :param str fn: The filename.
+    :param collections.Sequence(afem.smesh.entities.MeshGroup) groups:
+        Groups whose memberships should be stored.
+
+    :return: The mesh arrays that were written.
+    :rtype: afem.exchange.binmesh.MeshArrays
+    """
+    with Tracer.span('write_binmesh', fn=fn) as span:
+        arrays = MeshArrays.from_mesh(the_mesh, groups)
+        arrays.save(fn)
+        if span:
+            span.set(n_nodes=arrays.num_nodes, n_elms=arrays.num_elms)
+    return arrays
+
+
+def read_binmesh(fn, mmap=True):
+    """
+    Read a binary mesh file.
+
+    :param str fn: The filename.
+    :param bool mmap: Option to memory map the arrays instead of reading
+        them.
+
+    :return: The mesh arrays. Use :meth:`.MeshArrays.to_mesh` to build a
+        mesh from them.
+    :rtype: afem.exchange.binmesh.MeshArrays
+    """
+    with Tracer.span('read_binmesh', fn=fn) as span:
+        arrays = MeshArrays.load(fn, mmap)
+        if span:
+            span.set(n_nodes=arrays.num_nodes, n_elms=arrays.num_elms)
+    return arrays
+
+
+def _aligned(nbytes):
+    """
+    Round up the number of bytes to the alignment.
+    """
+    return -(-nbytes // _ALIGN) * _ALIGN
+
+
+def _element_type(value):
+    """
+    Get the SMDSAbs_ElementType from its integer value.
+    """
+    from afem.smesh.entities import Mesh
+
+    for type_ in (Mesh.NODE, Mesh.EDGE, Mesh.FACE, Mesh.VOLUME):
+        if int(type_) == value:
+            return type_
+    raise ValueError('Unknown element type {}.'.format(value))
@@ -20,6 +20,7 @@ from OCC.Core.BRep import BRep_Builder
 from OCC.Core.BRepTools import breptools
 from OCC.Core.TopoDS import TopoDS_Shape
 
+from afem.misc.trace import Tracer
 from afem.topology.entities import Shape
 
 
@@ -32,7 +33,10 @@ def write_brep(shape, fn):
 
     :return: None.
     """
-    breptools.Write(shape.object, fn)
+    with Tracer.span('write_brep', fn=fn) as span:
+        if span:
+            span.set(n_faces=shape.num_faces)
+        breptools.Write(shape.object, fn)
 
 
 def read_brep(fn):
@@ -44,8 +48,12 @@ def read_brep(fn):
     :return: The shape.
     :rtype: afem.topology.entities.Shape
     """
-    shape = TopoDS_Shape()
-    builder = BRep_Builder()
-    breptools.Read(shape, fn, builder)
-
-    return Shape.wrap(shape)
+    with Tracer.span('read_brep', fn=fn) as span:
+        shape = TopoDS_Shape()
+        builder = BRep_Builder()
+        breptools.Read(shape, fn, builder)
+        shape = Shape.wrap(shape)
+        if span and shape is not None:
+            span.set(n_faces=shape.num_faces)
+
+    return shape
@@ -21,6 +21,7 @@ from OCC.Core.IGESControl import IGESControl_Reader, IGESControl_Writer
 from OCC.Core.Interface import Interface_Static
 
 from afem.config import Settings, units_dict
+from afem.misc.trace import Tracer
 from afem.topology.entities import Shape
 
 __all__ = ["IgesWrite", "IgesRead"]
@@ -88,7 +89,8 @@ class IgesWrite(object):
         :return: *True* if written, *False* if not.
         :rtype: bool
         """
-        return self._writer.Write(fn)
+        with Tracer.span('IgesWrite.write', fn=fn):
+            return self._writer.Write(fn)
 
 
 class IgesRead(object):
@@ -101,18 +103,21 @@ class IgesRead(object):
     def __init__(self, fn):
         self._reader = IGESControl_Reader()
 
-        # Read file
-        status = self._reader.ReadFile(fn)
-        if status != IFSelect_RetDone:
-            raise RuntimeError("Error reading IGES file.")
-
-        # Convert to desired units
-        Interface_Static.SetCVal("xstep.cascade.unit", Settings.units)
-
-        # Transfer
-        nroots = self._reader.TransferRoots()
-        if nroots > 0:
-            self._shape = Shape.wrap(self._reader.OneShape())
+        with Tracer.span('IgesRead', fn=fn) as span:
+            # Read file
+            status = self._reader.ReadFile(fn)
+            if status != IFSelect_RetDone:
+                raise RuntimeError("Error reading IGES file.")
+
+            # Convert to desired units
+            Interface_Static.SetCVal("xstep.cascade.unit", Settings.units)
+
+            # Transfer
+            nroots = self._reader.TransferRoots()
+            if nroots > 0:
+                self._shape = Shape.wrap(self._reader.OneShape())
+            if span:
+                span.set(n_roots=nroots)
 
     @property
     def object(self):
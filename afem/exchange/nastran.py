@@ -16,9 +16,22 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with this library; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
-__all__ = ["export_bdf"]
+from itertools import islice
 
+from numpy import (argsort, array, concatenate, cumsum, float64, full,
+                   int32, int64, unique, zeros)
 
+from afem.config import logger
+from afem.exchange.binmesh import MeshArrays
+from afem.misc.trace import Tracer, traced
+
+__all__ = ["export_bdf", "write_bdf", "read_bdf", "import_bdf"]
+
+# Supported cards and the number of grid points of the elements
+_CARDS = {'GRID': 0, 'CBAR': 2, 'CTRIA3': 3, 'CQUAD4': 4}
+
+
+@traced('export_bdf', attrs=('fn',))
 def export_bdf(the_mesh, fn):
     """
     Export groups of parts to Nastran bulk data format (only nodes and
@@ -41,50 +54,82 @@ def export_bdf(the_mesh, fn):
     if not fout:
         return False
 
-    fout.write("BEGIN BULK\n")
-
-    # Dummy property for shells.
-    fout.write("%-8s" % "PSHELL")
-    # PID
-    _write_field(1, fout)
-    # MID
-    _write_field(1, fout)
-    # T
-    _write_field(1., fout)
-    fout.write('\n')
+    _write_header(fout)
 
     # Write grids.
     for node in the_mesh.ds.node_iter:
-        fout.write("%-8s" % "GRID")
-        # ID
-        _write_field(node.id, fout)
-        # CP
-        _write_field(None, fout)
-        # X1
-        _write_field(node.x, fout)
-        # X2
-        _write_field(node.y, fout)
-        # X3
-        _write_field(node.z, fout)
-        # CD
-        _write_field(None, fout)
-        fout.write('\n')
+        _write_grid(fout, node.id, node.x, node.y, node.z)
 
     # Write elements.
     for elm in the_mesh.ds.faces_iter:
         if elm.is_tri:
-            fout.write("%-8s" % "CTRIA3")
+            _write_shell(fout, 'CTRIA3', elm.id, elm.nids)
         elif elm.is_quad:
-            fout.write("%-8s" % "CQUAD4")
-        else:
+            _write_shell(fout, 'CQUAD4', elm.id, elm.nids)
+
+    fout.write("ENDDATA")
+
+    fout.close()
+    return True
+
+
+@traced('write_bdf', attrs=('fn',))
+def write_bdf(arrays, fn, pids=None):
+    """
+    Write mesh arrays to Nastran bulk data format the same way as
+    :func:`.export_bdf`. Since the arrays are a snapshot of the mesh this
+    can be done in the background while the mesh is being changed.
+
+    :param afem.exchange.binmesh.MeshArrays arrays: The mesh arrays.
+    :param str fn: The filename.
+    :param numpy.ndarray pids: The positive property ID of each element in
+        the same order as the element IDs of the arrays (e.g., the part IDs
+        from :meth:`.MeshVehicle.part_map`). A dummy property is written for
+        each one. If *None* then all elements use property 1.
+
+    :return: *True* if done, *False* if not.
+    :rtype: bool
+
+    :raise ValueError: If the number of property IDs is not the number of
+        elements or if a face element has a property ID less than one (e.g.,
+        an element that is not on a part in :meth:`.MeshVehicle.part_map`).
+    """
+    from afem.smesh.entities import Mesh
+
+    if pids is None:
+        pids = full(arrays.num_elms, 1, dtype=int64)
+    pids = array(pids, dtype=int64)
+    if pids.shape != (arrays.num_elms,):
+        msg = 'Expected {} property IDs but got {}.'.format(arrays.num_elms,
+                                                           pids.size)
+        raise ValueError(msg)
+
+    face = int(Mesh.FACE)
+    is_face = arrays.elm_types == face
+    if (pids[is_face] < 1).any():
+        raise ValueError('Property IDs of face elements must be positive.')
+
+    fout = open(fn, 'w')
+
+    _write_header(fout, unique(pids[is_face]).tolist())
+
+    # Write grids.
+    for nid, (x, y, z) in zip(arrays.node_ids.tolist(),
+                              arrays.node_xyz.tolist()):
+        _write_grid(fout, nid, x, y, z)
+
+    # Write linear tri and quad elements.
+    offsets = arrays.elm_offsets.tolist()
+    nodes = arrays.elm_nodes
+    for i, (eid, type_, pid) in enumerate(zip(arrays.elm_ids.tolist(),
+                                              arrays.elm_types.tolist(),
+                                              pids.tolist())):
+        nnodes = offsets[i + 1] - offsets[i]
+        if type_ != face or nnodes not in (3, 4):
             continue
-        # EID
-        _write_field(elm.id, fout)
-        # PID
-        _write_field(1, fout)
-        for nid in elm.nids:
-            _write_field(nid, fout)
-        fout.write('\n')
+        card = 'CTRIA3' if nnodes == 3 else 'CQUAD4'
+        nids = nodes[offsets[i]:offsets[i + 1]].tolist()
+        _write_shell(fout, card, eid, nids, pid)
 
     fout.write("ENDDATA")
 
@@ -92,6 +137,118 @@ def export_bdf(the_mesh, fn):
     return True
 
 
+def read_bdf(fn, chunk_size=1000000):
+    """
+    Read the GRID, CBAR, CTRIA3, and CQUAD4 cards of a Nastran bulk data
+    file in small field, large field, or free field format. The file is read
+    in chunks of lines and the fields of each card type are converted in
+    bulk. Other cards are ignored and all grid coordinates are assumed to be
+    in the basic coordinate system.
+
+    A group is created for the elements of each property ID named
+    "PID <pid> edges" for CBAR elements and "PID <pid> faces" for shell
+    elements.
+
+    :param str fn: The filename.
+    :param int chunk_size: The number of lines read at a time.
+
+    :return: The nodes, elements, and groups as arrays. Use
+        :meth:`.MeshArrays.to_mesh` to build a mesh from them.
+    :rtype: afem.exchange.binmesh.MeshArrays
+    """
+    with Tracer.span('read_bdf', fn=fn) as span:
+        reader = _BdfCards()
+        with open(fn, 'r') as fin:
+            pending = []
+            while True:
+                chunk = list(islice(fin, chunk_size))
+                lines = pending + chunk
+                if not lines:
+                    break
+                pending = []
+                # Keep a large field card with its continuation line. The
+                # continuation itself starts with "*" but has no card name.
+                name, is_large, _ = _card_name(lines[-1])
+                if chunk and is_large and name in _CARDS:
+                    pending.append(lines.pop())
+                reader.add_lines(lines)
+
+        arrays = reader.arrays()
+        if span:
+            span.set(n_nodes=arrays.num_nodes, n_elms=arrays.num_elms)
+    return arrays
+
+
+def import_bdf(fn, gen, shape=None, chunk_size=1000000):
+    """
+    Read a Nastran bulk data file and build a mesh from it. See
+    :func:`.read_bdf` for the supported cards.
+
+    :param str fn: The filename.
+    :param afem.smesh.entities.MeshGen gen: The mesh generator.
+    :param afem.topology.entities.Shape shape: The shape to associate with
+        the mesh. Nodes and elements are not placed on its sub-shapes.
+    :param int chunk_size: The number of lines read at a time.
+
+    :return: The mesh and a group for the elements of each property ID.
+    :rtype: tuple(afem.smesh.entities.Mesh,
+        list(afem.smesh.entities.MeshGroup))
+    """
+    return read_bdf(fn, chunk_size).to_mesh(gen, shape)
+
+
+def _write_header(fout, pids=(1,)):
+    """
+    Write the start of the bulk data and dummy shell properties.
+    """
+    fout.write("BEGIN BULK\n")
+
+    # Dummy properties for shells.
+    for pid in pids:
+        fout.write("%-8s" % "PSHELL")
+        # PID
+        _write_field(pid, fout)
+        # MID
+        _write_field(1, fout)
+        # T
+        _write_field(1., fout)
+        fout.write('\n')
+
+
+def _write_grid(fout, nid, x, y, z):
+    """
+    Write a GRID card.
+    """
+    fout.write("%-8s" % "GRID")
+    # ID
+    _write_field(nid, fout)
+    # CP
+    _write_field(None, fout)
+    # X1
+    _write_field(x, fout)
+    # X2
+    _write_field(y, fout)
+    # X3
+    _write_field(z, fout)
+    # CD
+    _write_field(None, fout)
+    fout.write('\n')
+
+
+def _write_shell(fout, card, eid, nids, pid=1):
+    """
+    Write a CTRIA3 or CQUAD4 card.
+    """
+    fout.write("%-8s" % card)
+    # EID
+    _write_field(eid, fout)
+    # PID
+    _write_field(pid, fout)
+    for nid in nids:
+        _write_field(nid, fout)
+    fout.write('\n')
+
+
 def _write_field(value, fout, fmt='small'):
     """
     Write data to Nastran bulk data file.
@@ -263,3 +420,235 @@ def _write_field(value, fout, fmt='small'):
         # Write to file
         fout.write("%16s" % str_out[:16])
         return True
+
+
+class _BdfCards(object):
+    """
+    Collect the fields of the supported cards from lines of a bulk data file
+    and convert them in bulk.
+    """
+
+    def __init__(self):
+        self._data = {name: [] for name in _CARDS}
+        self._has_cp = False
+
+    def add_lines(self, lines):
+        """
+        Sort the lines by card name and format and convert their fields.
+        """
+        small = {name: [] for name in _CARDS}
+        large = {name: [] for name in _CARDS}
+        free = {name: [] for name in _CARDS}
+        for i, line in enumerate(lines):
+            name, is_large, is_free = _card_name(line)
+            if name not in _CARDS:
+                continue
+            nxt = lines[i + 1] if is_large and i + 1 < len(lines) else ''
+            if is_free:
+                fields = _split_free(line)
+                if is_large:
+                    fields = fields[:4] + _split_free(nxt)[:4]
+                free[name].append(fields)
+            elif is_large:
+                large[name].append((line, nxt))
+            else:
+                small[name].append(line)
+
+        for name in _CARDS:
+            for fields in (_small_fields(small[name]),
+                           _large_fields(large[name]),
+                           _free_fields(free[name])):
+                if fields.shape[0] > 0:
+                    self._add_fields(name, fields)
+
+    def _add_fields(self, name, fields):
+        """
+        Convert fields 2-9 of the cards.
+        """
+        if name == 'GRID':
+            ids = _to_int(fields[:, 0])
+            cp = _to_int(fields[:, 1])
+            xyz = _to_float(fields[:, 2:5])
+            if cp.any():
+                self._has_cp = True
+            self._data[name].append((ids, xyz))
+        else:
+            nnodes = _CARDS[name]
+            eids = _to_int(fields[:, 0])
+            pids = _to_int(fields[:, 1])
+            nids = _to_int(fields[:, 2:2 + nnodes])
+            self._data[name].append((eids, pids, nids))
+
+    def arrays(self):
+        """
+        Build the mesh arrays.
+        """
+        from afem.smesh.entities import Mesh
+
+        if self._has_cp:
+            logger.warning('GRID cards with a CP coordinate system were read '
+                           'as if in the basic coordinate system.')
+
+        grids = self._data['GRID']
+        node_ids = _concatenate([g[0] for g in grids], (0,), int64)
+        node_xyz = _concatenate([g[1] for g in grids], (0, 3), float64)
+
+        # Elements, edges first
+        eids, pids, types, nids, sizes = [], [], [], [], []
+        for name, type_ in (('CBAR', Mesh.EDGE), ('CTRIA3', Mesh.FACE),
+                            ('CQUAD4', Mesh.FACE)):
+            for e, p, n in self._data[name]:
+                eids.append(e)
+                pids.append(p)
+                types.append(full(e.shape[0], int(type_), dtype=int32))
+                nids.append(n.ravel())
+                sizes.append(full(e.shape[0], _CARDS[name], dtype=int64))
+        elm_ids = _concatenate(eids, (0,), int64)
+        elm_pids = _concatenate(pids, (0,), int64)
+        elm_types = _concatenate(types, (0,), int32)
+        elm_offsets = zeros(elm_ids.shape[0] + 1, dtype=int64)
+        cumsum(_concatenate(sizes, (0,), int64), out=elm_offsets[1:])
+
+        # Group elements by type and property ID
+        groups, members, gsizes = [], [], []
+        for type_, label in ((Mesh.EDGE, 'edges'), (Mesh.FACE, 'faces')):
+            indx = (elm_types == int(type_)).nonzero()[0]
+            if indx.size == 0:
+                continue
+            order = indx[argsort(elm_pids[indx], kind='mergesort')]
+            keys, starts = unique(elm_pids[order], return_index=True)
+            ends = list(starts[1:]) + [order.size]
+            for pid, i, j in zip(keys.tolist(), starts.tolist(), ends):
+                groups.append(('PID {} {}'.format(pid, label), int(type_)))
+                members.append(elm_ids[order[i:j]])
+                gsizes.append(j - i)
+        group_offsets = zeros(len(groups) + 1, dtype=int64)
+        cumsum(array(gsizes, dtype=int64), out=group_offsets[1:])
+
+        data = {'node_ids': node_ids,
+                'node_xyz': node_xyz,
+                'node_shapes': zeros(node_ids.shape[0], dtype=int32),
+                'elm_ids': elm_ids,
+                'elm_types': elm_types,
+                'elm_shapes': zeros(elm_ids.shape[0], dtype=int32),
+                'elm_offsets': elm_offsets,
+                'elm_nodes': _concatenate(nids, (0,), int64),
+                'group_offsets': group_offsets,
+                'group_members': _concatenate(members, (0,), int64)}
+        return MeshArrays(data, groups)
+
+
+def _card_name(line):
+    """
+    Get the card name of a line and if it is in large field and free field
+    format.
+    """
+    is_free = ',' in line
+    if is_free:
+        name = line.split(',', 1)[0]
+    else:
+        name = line[:8]
+    name = name.strip().upper()
+    is_large = name.endswith('*')
+    if is_large:
+        name = name[:-1]
+    return name, is_large, is_free
+
+
+def _fixed_width(lines, start, stop, width):
+    """
+    Split columns *start* to *stop* of each line into fields of equal width
+    using a single string array.
+    """
+    ncols = stop - start
+    text = ''.join([line.rstrip('\r\n').expandtabs(8)[start:stop].ljust(ncols)
+                    for line in lines])
+    nfields = ncols // width
+    return array([text]).view('U{}'.format(width)).reshape(-1, nfields)
+
+
+def _small_fields(lines):
+    """
+    Fields 2-9 of small field cards.
+    """
+    if not lines:
+        return zeros((0, 8), dtype='U8')
+    return _fixed_width(lines, 8, 72, 8)
+
+
+def _large_fields(pairs):
+    """
+    Fields 2-9 of large field cards from the first line and its
+    continuation.
+    """
+    if not pairs:
+        return zeros((0, 8), dtype='U16')
+    first = _fixed_width([p[0] for p in pairs], 8, 72, 16)
+    second = _fixed_width([p[1] for p in pairs], 8, 72, 16)
+    return concatenate([first, second], axis=1)
+
+
+def _split_free(line):
+    """
+    Fields 2-9 of a free field line padded with blank fields.
+    """
+    fields = line.rstrip('\r\n').split(',')[1:9]
+    return fields + [''] * (8 - len(fields))
+
+
+def _free_fields(rows):
+    """
+    Fields 2-9 of free field cards.
+    """
+    if not rows:
+        return zeros((0, 8), dtype='U16')
+    return array(rows, dtype='U16')
+
+
+def _to_int(fields):
+    """
+    Convert string fields to integers. Blank fields are zero.
+    """
+    try:
+        return fields.astype(int64)
+    except ValueError:
+        values = [int(v) if v.strip() else 0 for v in fields.ravel().tolist()]
+        return array(values, dtype=int64).reshape(fields.shape)
+
+
+def _to_float(fields):
+    """
+    Convert string fields to floats. Blank fields are zero and Nastran
+    exponents without an "E" are supported.
+    """
+    try:
+        return fields.astype(float64)
+    except ValueError:
+        values = [_nastran_float(v) for v in fields.ravel().tolist()]
+        return array(values, dtype=float64).reshape(fields.shape)
+
+
+def _nastran_float(value):
+    """
+    Convert a Nastran real field to a float.
+    """
+    value = value.strip().upper().replace('D', 'E')
+    if not value:
+        return 0.
+    try:
+        return float(value)
+    except ValueError:
+        # Implicit exponent like 1.5-3 or 1.5+3
+        for i in range(len(value) - 1, 0, -1):
+            if value[i] in '+-' and value[i - 1] != 'E':
+                return float(value[:i] + 'E' + value[i:])
+        raise
+
+
+def _concatenate(arrays, shape, dtype):
+    """
+    Concatenate arrays or return an empty array of the given shape.
+    """
+    if not arrays:
+        return zeros(shape, dtype=dtype)
+    return concatenate(arrays).astype(dtype, copy=False)
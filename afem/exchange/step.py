@@ -25,6 +25,7 @@ from OCC.Core.STEPControl import (STEPControl_AsIs, STEPControl_Writer,
 from OCC.Core.TCollection import TCollection_HAsciiString
 
 from afem.config import Settings, units_dict
+from afem.misc.trace import Tracer
 from afem.topology.entities import Shape
 
 __all__ = ["StepWrite", "StepRead"]
@@ -90,13 +91,14 @@ class StepWrite(object):
         :rtype: bool
         """
         added_shape = False
-        for shape in shapes:
-            shape = Shape.to_shape(shape)
-            if not shape:
-                continue
-            status = self._writer.Transfer(shape.object, STEPControl_AsIs)
-            if int(status) < int(IFSelect_RetError):
-                added_shape = True
+        with Tracer.span('StepWrite.transfer', n_shapes=len(shapes)):
+            for shape in shapes:
+                shape = Shape.to_shape(shape)
+                if not shape:
+                    continue
+                status = self._writer.Transfer(shape.object, STEPControl_AsIs)
+                if int(status) < int(IFSelect_RetError):
+                    added_shape = True
         return added_shape
 
     def set_name(self, shape, name):
@@ -126,7 +128,8 @@ class StepWrite(object):
         :return: *True* if written, *False* if not.
         :rtype: bool
         """
-        status = self._writer.Write(fn)
+        with Tracer.span('StepWrite.write', fn=fn):
+            status = self._writer.Write(fn)
         return int(status) < int(IFSelect_RetError)
 
 
@@ -141,18 +144,21 @@ class StepRead(object):
         self._reader = STEPControl_Reader()
         self._tr = self._reader.WS().TransferReader()
 
-        # Read file
-        status = self._reader.ReadFile(fn)
-        if status != IFSelect_RetDone:
-            raise RuntimeError("Error reading STEP file.")
-
-        # Convert to desired units
-        Interface_Static.SetCVal("xstep.cascade.unit", Settings.units)
-
-        # Transfer
-        nroots = self._reader.TransferRoots()
-        if nroots > 0:
-            self._shape = Shape.wrap(self._reader.OneShape())
+        with Tracer.span('StepRead', fn=fn) as span:
+            # Read file
+            status = self._reader.ReadFile(fn)
+            if status != IFSelect_RetDone:
+                raise RuntimeError("Error reading STEP file.")
+
+            # Convert to desired units
+            Interface_Static.SetCVal("xstep.cascade.unit", Settings.units)
+
+            # Transfer
+            nroots = self._reader.TransferRoots()
+            if nroots > 0:
+                self._shape = Shape.wrap(self._reader.OneShape())
+            if span:
+                span.set(n_roots=nroots)
 
     @property
     def object(self):
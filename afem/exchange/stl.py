@@ -18,6 +18,9 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
 from OCC.Core.StlAPI import StlAPI_Writer
 
+from afem.misc.trace import Tracer
+from afem.topology.tessellate import TessellationCache
+
 __all__ = ["StlWrite"]
 
 
@@ -29,13 +32,21 @@ class StlWrite(StlAPI_Writer):
     def __init__(self):
         super(StlWrite, self).__init__()
 
-    def write(self, shape, fn):
+    def write(self, shape, fn, deflection=0.001):
         """
         Converts shape to STL format and writes to a file.
         
         :param afem.topology.entities.Shape shape: The shape.
         :param str fn: The filename.
+        :param float deflection: The relative deflection used to tessellate
+            the shape through :class:`.TessellationCache`. If *None* then the
+            existing triangulation of the shape is used.
          
         :return: None.
         """
-        self.Write(shape.object, fn)
+        with Tracer.span('StlWrite.write', fn=fn) as span:
+            if span:
+                span.set(n_faces=shape.num_faces)
+            if deflection is not None:
+                TessellationCache.get(shape, deflection)
+            self.Write(shape.object, fn)
@@ -32,6 +32,7 @@ from afem.geometry import utils as geom_utils
 from afem.geometry.create import (PointFromParameter, NurbsSurfaceByInterp,
                                   NurbsCurveByPoints, NurbsCurveByApprox)
 from afem.geometry.entities import Geometry
+from afem.misc.trace import traced
 from afem.occ import utils as occ_utils
 from afem.oml.entities import Body
 from afem.topology.check import CheckShape
@@ -152,6 +153,7 @@ class ImportVSP(object):
         """
         return self._bodies.copy()
 
+    @traced('ImportVSP.import_step', attrs=('fn',))
     def import_step(self, fn):
         """
         Import a STEP file generated by the OpenVSP version that has been
@@ -217,6 +219,7 @@ class ImportVSP(object):
                 sref.set_vdomain(0., 1.)
                 sref.object.ExchangeUV()
                 sref.object.UReverse()
+                sref.clear_cache()
                 sref_id = metadata['ID']
                 href_surfs[sref_id] = sref
                 continue
@@ -227,6 +230,7 @@ class ImportVSP(object):
                 sref.set_vdomain(0., 1.)
                 sref.object.ExchangeUV()
                 sref.object.UReverse()
+                sref.clear_cache()
                 sref_id = metadata['ID']
                 vref_surfs[sref_id] = sref
                 continue
@@ -291,6 +295,7 @@ class ImportVSP(object):
         # Update
         self._bodies.update(bodies)
 
+    @traced('ImportVSP.export_step', attrs=('fn',))
     def export_step(self, fn, label_solids=True, label_faces=False,
                     names=None):
         """
@@ -352,6 +357,7 @@ class ImportVSP(object):
 
         doc.write_step(fn)
 
+    @traced('ImportVSP.save_bodies', attrs=('fn',))
     def save_bodies(self, fn):
         """
         Save the Body instances.
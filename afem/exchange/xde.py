@@ -30,11 +30,13 @@ from OCC.Core.TDF import TDF_ChildIterator, TDF_Label, TDF_LabelSequence
 from OCC.Core.TDataStd import TDataStd_Name, TDataStd_AsciiString
 from OCC.Core.TDocStd import TDocStd_Document
 from OCC.Core.TNaming import TNaming_NamedShape
+from OCC.Core.TopLoc import TopLoc_Location
 from OCC.Core.XCAFApp import XCAFApp_Application
 from OCC.Core.XCAFDoc import XCAFDoc_DocumentTool, XCAFDoc_Color
 from OCC.Core.XmlXCAFDrivers import xmlxcafdrivers
 
 from afem.config import units_dict, Settings
+from afem.misc.trace import traced
 from afem.topology.entities import Shape
 
 __all__ = ["XdeDocument", "XdeLabel"]
@@ -113,6 +115,7 @@ class XdeDocument(object):
         self._init_tool()
         return True
 
+    @traced('XdeDocument.save_as', attrs=('fn',))
     def save_as(self, fn):
         """
         Save the document.
@@ -137,6 +140,7 @@ class XdeDocument(object):
         """
         self._doc.Close()
 
+    @traced('XdeDocument.read_step', attrs=('fn',))
     def read_step(self, fn):
         """
         Read and translate a STEP file.
@@ -159,6 +163,7 @@ class XdeDocument(object):
         label = XCAFDoc_DocumentTool.ShapesLabel_(self._doc.Main())
         return XdeLabel(label)
 
+    @traced('XdeDocument.transfer_step')
     def transfer_step(self, schema='AP203', units=None):
         """
         Transfer the document in preparation for STEP export.
@@ -209,6 +214,7 @@ class XdeDocument(object):
         item.SetName(TCollection_HAsciiString(name))
         return True
 
+    @traced('XdeDocument.write_step', attrs=('fn',))
     def write_step(self, fn, schema='AP203', units=None):
         """
         Write the document to a STEP file.
@@ -305,6 +311,39 @@ class XdeDocument(object):
             label.set_name(name)
         return label
 
+    def add_instance(self, shape, name=None):
+        """
+        Add a new top-level shape as a reference to its non-located shape
+        rather than a copy. The non-located shape is added first if it is not
+        already in the document. This is meant for shapes created by
+        :func:`.instance_shape`.
+
+        :param afem.topology.entities.Shape shape: The shape.
+        :param str name: The label name.
+
+        :return: The shape label.
+        :rtype: afem.exchange.xde.XdeLabel
+        """
+        loc = shape.object.Location()
+        if loc.IsIdentity():
+            return self.add_shape(shape, name, False)
+
+        # The orientation is not stored on references, so store the
+        # prototype with the orientation it had before mirroring
+        proto = Shape.wrap(shape.object.Located(TopLoc_Location()))
+        if loc.Transformation().IsNegative():
+            proto.reverse()
+
+        proto_label = self.find_shape(proto)
+        if proto_label is None:
+            proto_label = self.add_shape(proto, None, False)
+
+        label = self.new_shape()
+        self._tool.MakeReference_(label.object, proto_label.object, loc)
+        if name is not None:
+            label.set_name(name)
+        return label
+
     def remove_shape(self, label, remove_completely=True):
         """
         Remove a shape.
@@ -493,9 +532,13 @@ class XdeLabel(object):
         """
         shape = TNaming_NamedShape()
         status, shape = self._label.FindAttribute(shape.GetID_(), shape)
-        if status:
-            return Shape.wrap(shape.Get())
-        return None
+        if not status:
+            return None
+        shape = shape.Get()
+        # Instances with a mirrored location are reversed
+        if shape.Location().Transformation().IsNegative():
+            shape.Reverse()
+        return Shape.wrap(shape)
 
     @property
     def string(self):
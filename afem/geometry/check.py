@@ -19,7 +19,8 @@
 
 from afem.geometry.entities import (Point, Point2D, Vector, Vector2D,
                                     Direction, Plane, Curve, TrimmedCurve,
-                                    NurbsCurve2D, Line, Surface, Axis3)
+                                    NurbsCurve2D, Line, Surface, Axis3,
+                                    PointArray)
 
 __all__ = ["CheckGeom"]
 
@@ -72,14 +73,40 @@ class CheckGeom(object):
         """
         Convert entities to points if possible.
 
-        :param list(point_like) geoms: List of entities.
+        :param geoms: List of entities.
+        :type geoms: list(point_like) or afem.geometry.entities.PointArray
 
-        :return: List of points.
-        :rtype: list(afem.geometry.entities.Point)
+        :return: List of points. If a :class:`.PointArray` is given it is
+            returned as is.
+        :rtype: list(afem.geometry.entities.Point) or
+            afem.geometry.entities.PointArray
         """
+        if isinstance(geoms, PointArray):
+            return geoms
         return [CheckGeom.to_point(p) for p in geoms if
                 CheckGeom.is_point_like(p)]
 
+    @staticmethod
+    def to_point_array(geoms):
+        """
+        Convert entities to a :class:`.PointArray` if possible. Entities that
+        are not point_like are skipped.
+
+        :param geoms: List of entities.
+        :type geoms: list(point_like) or array_like or
+            afem.geometry.entities.PointArray
+
+        :return: The points.
+        :rtype: afem.geometry.entities.PointArray
+        """
+        if isinstance(geoms, PointArray):
+            return geoms
+        try:
+            return PointArray(geoms)
+        except (TypeError, ValueError):
+            return PointArray([p for p in geoms if
+                               CheckGeom.is_point_like(p)])
+
     @staticmethod
     def is_point2d_like(geom):
         """
@@ -269,11 +296,15 @@ class CheckGeom(object):
         Find the point nearest to a given point.
 
         :param point_like p: The point.
-        :param  list(point_like) pnts: List of points.
+        :param pnts: List of points.
+        :type pnts: list(point_like) or afem.geometry.entities.PointArray
 
         :return: The nearest point.
         :rtype: afem.geometry.entities.Point
         """
+        if isinstance(pnts, PointArray):
+            return pnts.nearest(p)
+
         p = CheckGeom.to_point(p)
         pnts = [CheckGeom.to_point(pi) for pi in pnts]
 
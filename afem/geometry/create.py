@@ -34,7 +34,7 @@ from OCC.Core.TColgp import TColgp_Array1OfPnt
 from OCC.Core.gce import gce_MakeCirc
 from OCC.Core.gp import gp_Ax3, gp_Pln, gp_Quaternion, gp_Trsf
 from OCC.Core.gp import gp_Extrinsic_XYZ
-from numpy import array, cross, mean, zeros
+from numpy import array, cos, cross, mean, sin, zeros
 from numpy.linalg import norm
 from scipy.linalg import lu_factor, lu_solve
 
@@ -45,7 +45,7 @@ from afem.geometry.check import CheckGeom
 from afem.geometry.entities import (Direction, Vector, Point, Line, Circle,
                                     Plane, NurbsCurve, Geometry, NurbsCurve2D,
                                     Curve, TrimmedCurve, Axis3,
-                                    NurbsSurface)
+                                    NurbsSurface, PointArray)
 from afem.geometry.project import ProjectPointToCurve, ProjectPointToSurface
 from afem.occ import utils as occ_utils
 
@@ -62,7 +62,7 @@ __all__ = ["PointByXYZ", "PointByArray",
            "TrimmedCurveByPoints",
            "PlaneByNormal", "PlaneByAxes", "PlaneByPoints", "PlaneByApprox",
            "PlaneFromParameter", "PlaneByOrientation",
-           "PlaneByCurveAndSurface",
+           "PlaneByCurveAndSurface", "PlaneFamily",
            "PlanesAlongCurveByNumber",
            "PlanesAlongCurveByDistance", "PlanesBetweenPlanesByNumber",
            "PlanesBetweenPlanesByDistance",
@@ -211,16 +211,14 @@ class PointsAlongCurveByNumber(object):
         self._is_done = tool.IsDone()
         self._npts = 0
         self._prms = []
-        self._pnts = []
+        self._pnts = PointArray()
         self._ds = None
 
         if self._is_done:
             self._npts = tool.NbPoints()
-            for i in range(1, self._npts + 1):
-                u = tool.Parameter(i)
-                p = adp_crv.eval(u)
-                self._pnts.append(p)
-                self._prms.append(u)
+            self._prms = [tool.Parameter(i) for i in
+                          range(1, self._npts + 1)]
+            self._pnts = _eval_points(adp_crv, self._prms)
 
         # Point spacing
         self._ds = None
@@ -240,7 +238,7 @@ class PointsAlongCurveByNumber(object):
     def points(self):
         """
         :return: The points.
-        :rtype: list(afem.geometry.entities.Point)
+        :rtype: afem.geometry.entities.PointArray
         """
         return self._pnts
 
@@ -265,10 +263,10 @@ class PointsAlongCurveByNumber(object):
     def interior_points(self):
         """
         :return: The points between the first and last points.
-        :rtype: list(afem.geometry.entities.Point)
+        :rtype: afem.geometry.entities.PointArray
         """
         if self.npts < 3:
-            return []
+            return PointArray()
         return self._pnts[1:-1]
 
 
@@ -332,13 +330,8 @@ class PointsAlongCurveByDistance(object):
 
         # Gather results
         npts = ua.NbPoints()
-        pnts = []
-        prms = []
-        for i in range(1, npts + 1):
-            u = ua.Parameter(i)
-            p = adp_crv.eval(u)
-            pnts.append(p)
-            prms.append(u)
+        prms = [ua.Parameter(i) for i in range(1, npts + 1)]
+        pnts = _eval_points(adp_crv, prms)
         self._npts = npts
         self._prms = prms
         self._pnts = pnts
@@ -361,7 +354,7 @@ class PointsAlongCurveByDistance(object):
     def points(self):
         """
         :return: The points.
-        :rtype: list(afem.geometry.entities.Point)
+        :rtype: afem.geometry.entities.PointArray
         """
         return self._pnts
 
@@ -386,10 +379,10 @@ class PointsAlongCurveByDistance(object):
     def interior_points(self):
         """
         :return: The points between the first and last points.
-        :rtype: list(afem.geometry.entities.Point)
+        :rtype: afem.geometry.entities.PointArray
         """
         if self.npts < 3:
-            return []
+            return PointArray()
         return self._pnts[1:-1]
 
 
@@ -1185,12 +1178,7 @@ class PlaneByCurveAndSurface(object):
     """
 
     def __init__(self, crv, srf, u):
-        origin = crv.eval(u)
-        u, v = ProjectPointToSurface(origin, srf).nearest_param
-        srf_nrm = srf.norm(u, v)
-        crv_deriv = crv.deriv(u, 1)
-        vx = Direction(srf_nrm.Crossed(crv_deriv))
-        n = Direction(crv_deriv)
+        origin, n, vx = _curve_and_surface_axes(crv, srf, u)
         ax3 = gp_Ax3(origin, n, vx)
         self._pln = Plane(Geom_Plane(ax3))
 
@@ -1203,6 +1191,181 @@ class PlaneByCurveAndSurface(object):
         return self._pln
 
 
+class PlaneFamily(object):
+    """
+    A family of planes stored as arrays of origins, normals, and x-axes. The
+    :class:`.Plane` objects are only created when :attr:`.planes` is first
+    accessed, and they are created from the same origin and direction
+    objects a plane-by-plane construction would use. Rotations applied
+    before that are done on all the arrays at once.
+
+    :param origins: The origins.
+    :type origins: afem.geometry.entities.PointArray or
+        collections.Sequence(point_like)
+    :param collections.Sequence(OCC.Core.gp.gp_Dir) normals: The normals.
+    :param collections.Sequence(OCC.Core.gp.gp_Dir) xdirs: The x-axes. If
+        *None* then each x-axis is chosen from the normal the same way as
+        :meth:`.Plane.by_normal`.
+    """
+
+    def __init__(self, origins, normals, xdirs=None):
+        self._origins = PointArray(origins)
+        self._normals = list(normals)
+        self._xdirs = None if xdirs is None else list(xdirs)
+        self._plns = None
+
+    def __len__(self):
+        return len(self._origins)
+
+    @property
+    def nplanes(self):
+        """
+        :return: The number of planes.
+        :rtype: int
+        """
+        return len(self._origins)
+
+    @property
+    def is_built(self):
+        """
+        :return: *True* if the planes have been created, *False* if not.
+        :rtype: bool
+        """
+        return self._plns is not None
+
+    @property
+    def origins(self):
+        """
+        :return: The origins as an (n, 3) array.
+        :rtype: numpy.ndarray
+        """
+        self._update()
+        return self._origins.xyz
+
+    @property
+    def normals(self):
+        """
+        :return: The unit normals as an (n, 3) array.
+        :rtype: numpy.ndarray
+        """
+        self._update()
+        return _dir_array(self._normals)
+
+    @property
+    def xdirs(self):
+        """
+        :return: The unit x-axes as an (n, 3) array.
+        :rtype: numpy.ndarray
+        """
+        self._update()
+        if self._xdirs is None:
+            self._xdirs = [gp_Ax3(p, n).XDirection() for p, n in
+                           zip(self._origins, self._normals)]
+        return _dir_array(self._xdirs)
+
+    @property
+    def planes(self):
+        """
+        :return: The planes. They are created the first time this is
+            accessed.
+        :rtype: list(afem.geometry.entities.Plane)
+        """
+        if self._plns is None:
+            if self._xdirs is None:
+                self._plns = [Plane(Geom_Plane(p, n)) for p, n in
+                              zip(self._origins, self._normals)]
+            else:
+                self._plns = [Plane(Geom_Plane(gp_Ax3(p, n, vx))) for
+                              p, n, vx in zip(self._origins, self._normals,
+                                              self._xdirs)]
+        return self._plns
+
+    def distances(self, pnt):
+        """
+        Compute the distance from a point to each plane.
+
+        :param point_like pnt: The point.
+
+        :return: The distances.
+        :rtype: numpy.ndarray
+        """
+        pnt = CheckGeom.to_point(pnt)
+        d = (pnt.xyz - self.origins) * self.normals
+        return abs(d.sum(axis=1))
+
+    def subset(self, start=None, stop=None):
+        """
+        Get a family with a range of the planes. Planes that are already
+        created are shared.
+
+        :param int start: The first index.
+        :param int stop: The index after the last one.
+
+        :return: The new family.
+        :rtype: afem.geometry.create.PlaneFamily
+        """
+        self._update()
+        xdirs = None if self._xdirs is None else self._xdirs[start:stop]
+        family = PlaneFamily(self._origins.xyz[start:stop],
+                             self._normals[start:stop], xdirs)
+        if self._plns is not None:
+            family._plns = self._plns[start:stop]
+        return family
+
+    def rotate_x(self, angle):
+        """
+        Rotate each of the planes around their local x-axis.
+
+        :param float angle: The rotation angle in degrees.
+
+        :return: None.
+        """
+        if self._plns is not None:
+            for pln in self._plns:
+                pln.rotate_x(angle)
+            return
+
+        vx = self.xdirs
+        vn = self.normals
+        a = radians(angle)
+        vn = vn * cos(a) + cross(vx, vn) * sin(a)
+        self._normals = [Direction(*n) for n in vn.tolist()]
+
+    def rotate_y(self, angle):
+        """
+        Rotate each of the planes around their local y-axis.
+
+        :param float angle: The rotation angle in degrees.
+
+        :return: None.
+        """
+        if self._plns is not None:
+            for pln in self._plns:
+                pln.rotate_y(angle)
+            return
+
+        vx = self.xdirs
+        vn = self.normals
+        vy = cross(vn, vx)
+        a = radians(angle)
+        c, s = cos(a), sin(a)
+        vx, vn = vx * c + cross(vy, vx) * s, vn * c + cross(vy, vn) * s
+        self._normals = [Direction(*n) for n in vn.tolist()]
+        self._xdirs = [Direction(*x) for x in vx.tolist()]
+
+    def _update(self):
+        """
+        Update the origins and directions from the planes if they were
+        created since they may have been modified.
+        """
+        if self._plns is None:
+            return
+        axes = [pln.gp_pln.Position() for pln in self._plns]
+        self._origins = PointArray([ax.Location() for ax in axes])
+        self._normals = [ax.Direction() for ax in axes]
+        self._xdirs = [ax.XDirection() for ax in axes]
+
+
 class PlanesAlongCurveByNumber(object):
     """
     Create planes along a curve using a specified number. The origin of the
@@ -1241,25 +1404,15 @@ class PlanesAlongCurveByNumber(object):
         prms = pnt_builder.parameters
         spacing = pnt_builder.spacing
 
-        plns = []
         if isinstance(ref_pln, Plane):
             gp_pln = ref_pln.gp_pln
             ax1 = gp_pln.Axis()
             dn = ax1.Direction()
-            for p in pnts:
-                pln = Plane(Geom_Plane(p, dn))
-                plns.append(pln)
+            dirs = [dn] * npts
         else:
-            for i in range(npts):
-                p = pnts[i]
-                u = prms[i]
-                vn = adp_crv.deriv(u, 1)
-                dn = Direction(vn)
-                pln = Plane(Geom_Plane(p, dn))
-                plns.append(pln)
-
-        self._plns = plns
-        self._nplns = npts
+            dirs = [Direction(adp_crv.deriv(u, 1)) for u in prms]
+
+        self._family = PlaneFamily(pnts, dirs)
         self._prms = prms
         self._ds = spacing
 
@@ -1269,7 +1422,15 @@ class PlanesAlongCurveByNumber(object):
         :return: The number of planes.
         :rtype: int
         """
-        return self._nplns
+        return self._family.nplanes
+
+    @property
+    def family(self):
+        """
+        :return: The origins and directions of the planes.
+        :rtype: afem.geometry.create.PlaneFamily
+        """
+        return self._family
 
     @property
     def planes(self):
@@ -1277,7 +1438,7 @@ class PlanesAlongCurveByNumber(object):
         :return: The planes.
         :rtype: list(afem.geometry.entities.Plane)
         """
-        return self._plns
+        return self._family.planes
 
     @property
     def parameters(self):
@@ -1304,7 +1465,7 @@ class PlanesAlongCurveByNumber(object):
         """
         if self.nplanes < 3:
             return []
-        return self._plns[1:-1]
+        return self.planes[1:-1]
 
 
 class PlanesAlongCurveByDistance(object):
@@ -1350,25 +1511,15 @@ class PlanesAlongCurveByDistance(object):
         prms = pnt_builder.parameters
         spacing = pnt_builder.spacing
 
-        plns = []
         if isinstance(ref_pln, Plane):
             gp_pln = ref_pln.gp_pln
             ax1 = gp_pln.Axis()
             dn = ax1.Direction()
-            for p in pnts:
-                pln = Plane(Geom_Plane(p, dn))
-                plns.append(pln)
+            dirs = [dn] * npts
         else:
-            for i in range(npts):
-                p = pnts[i]
-                u = prms[i]
-                vn = adp_crv.deriv(u, 1)
-                dn = Direction(vn)
-                pln = Plane(Geom_Plane(p, dn))
-                plns.append(pln)
-
-        self._plns = plns
-        self._nplns = npts
+            dirs = [Direction(adp_crv.deriv(u, 1)) for u in prms]
+
+        self._family = PlaneFamily(pnts, dirs)
         self._prms = prms
         self._ds = spacing
 
@@ -1378,7 +1529,15 @@ class PlanesAlongCurveByDistance(object):
         :return: The number of planes.
         :rtype: int
         """
-        return self._nplns
+        return self._family.nplanes
+
+    @property
+    def family(self):
+        """
+        :return: The origins and directions of the planes.
+        :rtype: afem.geometry.create.PlaneFamily
+        """
+        return self._family
 
     @property
     def planes(self):
@@ -1386,7 +1545,7 @@ class PlanesAlongCurveByDistance(object):
         :return: The planes.
         :rtype: list(afem.geometry.entities.Plane)
         """
-        return self._plns
+        return self._family.planes
 
     @property
     def parameters(self):
@@ -1413,7 +1572,7 @@ class PlanesAlongCurveByDistance(object):
         """
         if self.nplanes < 3:
             return []
-        return self._plns[1:-1]
+        return self.planes[1:-1]
 
 
 class PlanesBetweenPlanesByNumber(object):
@@ -1457,24 +1616,21 @@ class PlanesBetweenPlanesByNumber(object):
         c = NurbsCurveByPoints([p1, p2]).curve
         builder = PlanesAlongCurveByNumber(c, n, pln1, d1=d1, d2=d2)
 
-        plns = builder.planes
-        nplns = builder.nplanes
+        family = builder.family
         spacing = None
 
-        if plns and plns[0].distance(c.p1) <= 1.0e-7:
-            plns.pop(0)
-            nplns -= 1
-        if plns and plns[-1].distance(c.p2) <= 1.0e-7:
-            plns.pop(-1)
-            nplns -= 1
+        i1, i2 = 0, family.nplanes
+        if i2 > 0 and family.distances(c.p1)[0] <= 1.0e-7:
+            i1 += 1
+        if i2 > i1 and family.distances(c.p2)[-1] <= 1.0e-7:
+            i2 -= 1
+        family = family.subset(i1, i2)
 
-        if nplns > 1:
-            p1 = plns[0].eval(0., 0.)
-            p2 = plns[1].eval(0., 0.)
-            spacing = p1.distance(p2)
+        if family.nplanes > 1:
+            p1, p2 = family.origins[:2].tolist()
+            spacing = Point(*p1).distance(Point(*p2))
 
-        self._plns = plns
-        self._nplns = nplns
+        self._family = family
         self._ds = spacing
 
     @property
@@ -1483,7 +1639,15 @@ class PlanesBetweenPlanesByNumber(object):
         :return: The number of planes.
         :rtype: int
         """
-        return self._nplns
+        return self._family.nplanes
+
+    @property
+    def family(self):
+        """
+        :return: The origins and directions of the planes.
+        :rtype: afem.geometry.create.PlaneFamily
+        """
+        return self._family
 
     @property
     def planes(self):
@@ -1491,7 +1655,7 @@ class PlanesBetweenPlanesByNumber(object):
         :return: The planes.
         :rtype: list(afem.geometry.entities.Plane)
         """
-        return self._plns
+        return self._family.planes
 
     @property
     def spacing(self):
@@ -1510,7 +1674,7 @@ class PlanesBetweenPlanesByNumber(object):
         """
         if self.nplanes < 3:
             return []
-        return self._plns[1:-1]
+        return self.planes[1:-1]
 
 
 class PlanesBetweenPlanesByDistance(object):
@@ -1551,24 +1715,21 @@ class PlanesBetweenPlanesByDistance(object):
         builder = PlanesAlongCurveByDistance(c, maxd, pln1, d1=d1, d2=d2,
                                              nmin=nmin)
 
-        plns = builder.planes
-        nplns = builder.nplanes
+        family = builder.family
         spacing = None
 
-        if plns and plns[0].distance(c.p1) <= 1.0e-7:
-            plns.pop(0)
-            nplns -= 1
-        if plns and plns[-1].distance(c.p2) <= 1.0e-7:
-            plns.pop(-1)
-            nplns -= 1
+        i1, i2 = 0, family.nplanes
+        if i2 > 0 and family.distances(c.p1)[0] <= 1.0e-7:
+            i1 += 1
+        if i2 > i1 and family.distances(c.p2)[-1] <= 1.0e-7:
+            i2 -= 1
+        family = family.subset(i1, i2)
 
-        if nplns > 1:
-            p1 = plns[0].eval(0., 0.)
-            p2 = plns[1].eval(0., 0.)
-            spacing = p1.distance(p2)
+        if family.nplanes > 1:
+            p1, p2 = family.origins[:2].tolist()
+            spacing = Point(*p1).distance(Point(*p2))
 
-        self._plns = plns
-        self._nplns = nplns
+        self._family = family
         self._ds = spacing
 
     @property
@@ -1577,7 +1738,15 @@ class PlanesBetweenPlanesByDistance(object):
         :return: The number of planes.
         :rtype: int
         """
-        return self._nplns
+        return self._family.nplanes
+
+    @property
+    def family(self):
+        """
+        :return: The origins and directions of the planes.
+        :rtype: afem.geometry.create.PlaneFamily
+        """
+        return self._family
 
     @property
     def planes(self):
@@ -1585,7 +1754,7 @@ class PlanesBetweenPlanesByDistance(object):
         :return: The planes.
         :rtype: list(afem.geometry.entities.Plane)
         """
-        return self._plns
+        return self._family.planes
 
     @property
     def spacing(self):
@@ -1604,7 +1773,7 @@ class PlanesBetweenPlanesByDistance(object):
         """
         if self.nplanes < 3:
             return []
-        return self._plns[1:-1]
+        return self.planes[1:-1]
 
 
 class PlanesAlongCurveAndSurfaceByDistance(object):
@@ -1643,14 +1812,14 @@ class PlanesAlongCurveAndSurfaceByDistance(object):
         prms = pnt_builder.parameters
         spacing = pnt_builder.spacing
 
-        plns = []
-        for i in range(npts):
-            u = prms[i]
-            pln = PlaneByCurveAndSurface(c, s, u).plane
-            plns.append(pln)
+        origins, dirs, xdirs = [], [], []
+        for u in prms:
+            origin, n, vx = _curve_and_surface_axes(c, s, u)
+            origins.append(origin)
+            dirs.append(n)
+            xdirs.append(vx)
 
-        self._plns = plns
-        self._nplns = npts
+        self._family = PlaneFamily(origins, dirs, xdirs)
         self._prms = prms
         self._ds = spacing
 
@@ -1660,7 +1829,15 @@ class PlanesAlongCurveAndSurfaceByDistance(object):
         :return: The number of planes.
         :rtype: int
         """
-        return self._nplns
+        return self._family.nplanes
+
+    @property
+    def family(self):
+        """
+        :return: The origins and directions of the planes.
+        :rtype: afem.geometry.create.PlaneFamily
+        """
+        return self._family
 
     @property
     def planes(self):
@@ -1668,7 +1845,7 @@ class PlanesAlongCurveAndSurfaceByDistance(object):
         :return: The planes.
         :rtype: list(afem.geometry.entities.Plane)
         """
-        return self._plns
+        return self._family.planes
 
     @property
     def parameters(self):
@@ -1695,7 +1872,7 @@ class PlanesAlongCurveAndSurfaceByDistance(object):
         """
         if self.nplanes < 3:
             return []
-        return self._plns[1:-1]
+        return self.planes[1:-1]
 
     def rotate_x(self, angle):
         """
@@ -1705,8 +1882,7 @@ class PlanesAlongCurveAndSurfaceByDistance(object):
 
         :return: None.
         """
-        for pln in self.planes:
-            pln.rotate_x(angle)
+        self._family.rotate_x(angle)
 
     def rotate_y(self, angle):
         """
@@ -1716,8 +1892,7 @@ class PlanesAlongCurveAndSurfaceByDistance(object):
 
         :return: None.
         """
-        for pln in self.planes:
-            pln.rotate_y(angle)
+        self._family.rotate_y(angle)
 
 
 # NURBSSURFACE ----------------------------------------------------------------
@@ -1940,3 +2115,33 @@ class NurbsSurfaceByApprox(object):
         :rtype: float
         """
         return self._tol2d_reached
+
+
+def _curve_and_surface_axes(crv, srf, u):
+    """
+    Find the origin, normal, and x-axis of a plane along a curve on a
+    surface (see :class:`.PlaneByCurveAndSurface`).
+    """
+    origin = crv.eval(u)
+    u, v = ProjectPointToSurface(origin, srf).nearest_param
+    srf_nrm = srf.norm(u, v)
+    crv_deriv = crv.deriv(u, 1)
+    vx = Direction(srf_nrm.Crossed(crv_deriv))
+    n = Direction(crv_deriv)
+    return origin, n, vx
+
+
+def _dir_array(dirs):
+    """
+    Gather the components of directions in an (n, 3) array.
+    """
+    return array([d.Coord() for d in dirs], dtype=float).reshape(-1, 3)
+
+
+def _eval_points(adp_crv, prms):
+    """
+    Evaluate the adaptor curve at each parameter and gather the results in a
+    single point array.
+    """
+    value = adp_crv.object.Value
+    return PointArray([value(u).Coord() for u in prms])
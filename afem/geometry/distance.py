@@ -20,13 +20,17 @@ from math import sqrt
 
 from OCC.Core.Extrema import (Extrema_ExtCC, Extrema_ExtCS, Extrema_ExtPC,
                           Extrema_ExtPS, Extrema_ExtSS)
+from numpy import (argsort, array, clip, concatenate, einsum, float64, full,
+                   inf, int32, isfinite, linspace, minimum, zeros)
+from numpy.linalg import norm
+from scipy.spatial import cKDTree
 
 from afem.adaptor.entities import AdaptorCurve, AdaptorSurface
 from afem.geometry.check import CheckGeom
 
 __all__ = ["DistancePointToCurve", "DistancePointToSurface",
            "DistanceCurveToCurve", "DistanceCurveToSurface",
-           "DistanceSurfaceToSurface"]
+           "DistanceSurfaceToSurface", "CurveIndex"]
 
 
 class DistancePointToCurve(object):
@@ -505,3 +509,168 @@ class DistanceSurfaceToSurface(object):
         :rtype: list(afem.geometry.entities.Point)
         """
         return self._pnts2
+
+
+class CurveIndex(object):
+    """
+    Spatial index for finding the curve nearest to a point. Each curve is
+    sampled once into a polyline. For a query point, the distance to the
+    nearest sample is an upper bound of the minimum distance. Every point of
+    the curve between two samples is within half the arc length between them
+    of one of the samples, so the distance to each polyline segment less half
+    that arc length is a lower bound for its curve. The exact distance is only
+    calculated for curves whose lower bound does not exceed the best distance
+    found so far.
+
+    :param crvs: The curves. Anything accepted by
+        :meth:`.AdaptorCurve.to_adaptor` may be used.
+    :type crvs: collections.Sequence(afem.adaptor.entities.AdaptorCurve or
+        afem.geometry.entities.Curve or afem.topology.entities.Edge or
+        afem.topology.entities.Wire)
+    :param int nsample: Number of points used to sample each curve.
+    :param float tol: The tolerance used for the exact distance.
+
+    :raise ValueError: If no curves are provided.
+    """
+
+    def __init__(self, crvs, nsample=33, tol=1.0e-10):
+        crvs = list(crvs)
+        if not crvs:
+            raise ValueError('No curves provided.')
+        self._crvs = crvs
+        self._tol = tol
+        self._adps = [AdaptorCurve.to_adaptor(c) for c in crvs]
+
+        # Sample bounded curves and build their polyline segments
+        ncrvs = len(crvs)
+        nsample = max(nsample, 2)
+        pnts, starts, ends, pads = [], [], [], []
+        pnt_owners, seg_owners = [], []
+        unbounded = []
+        for i, adp in enumerate(self._adps):
+            u1, u2 = adp.u1, adp.u2
+            if not (isfinite(u1) and isfinite(u2)):
+                unbounded.append(i)
+                continue
+            prms = linspace(u1, u2, nsample).tolist()
+            xyz = array([adp.eval(u).xyz for u in prms], dtype=float64)
+            arcs = array([adp.arc_length(ua, ub) for ua, ub in
+                          zip(prms[:-1], prms[1:])], dtype=float64)
+            pnts.append(xyz)
+            starts.append(xyz[:-1])
+            ends.append(xyz[1:])
+            pnt_owners.append(full(nsample, i, dtype=int32))
+            seg_owners.append(full(nsample - 1, i, dtype=int32))
+            pads.append(0.5 * arcs + tol)
+
+        self._unbounded = array(unbounded, dtype=int32)
+        if pnts:
+            pnts = concatenate(pnts)
+            self._kdt = cKDTree(pnts)
+            self._pnt_owner = concatenate(pnt_owners)
+            self._a = concatenate(starts)
+            self._ab = concatenate(ends) - self._a
+            self._ab2 = einsum('ij,ij->i', self._ab, self._ab)
+            self._seg_owner = concatenate(seg_owners)
+            self._pad = concatenate(pads)
+        else:
+            self._kdt = None
+        self._ncrvs = ncrvs
+
+    @property
+    def ncrvs(self):
+        """
+        :return: Number of curves.
+        :rtype: int
+        """
+        return self._ncrvs
+
+    @property
+    def curves(self):
+        """
+        :return: The curves in the order they were provided.
+        :rtype: list
+        """
+        return self._crvs
+
+    def nearest(self, pnt):
+        """
+        Find the curve nearest to the point.
+
+        :param point_like pnt: The point.
+
+        :return: The index of the nearest curve and the distance to it.
+        :rtype: tuple(int, float)
+        """
+        pnt = CheckGeom.to_point(pnt)
+        return self._nearest(pnt)
+
+    def nearest_many(self, pnts):
+        """
+        Find the curve nearest to each point.
+
+        :param pnts: The points.
+        :type pnts: collections.Sequence(point_like) or
+            afem.geometry.entities.PointArray
+
+        :return: The indices of the nearest curves and the distances to them.
+        :rtype: tuple(numpy.ndarray, numpy.ndarray)
+        """
+        pnts = [CheckGeom.to_point(p) for p in pnts]
+        indices = zeros(len(pnts), dtype=int32)
+        distances = zeros(len(pnts), dtype=float64)
+        for k, p in enumerate(pnts):
+            indices[k], distances[k] = self._nearest(p)
+        return indices, distances
+
+    def _nearest(self, pnt):
+        """
+        Find the nearest curve to a point.
+        """
+        lbounds = zeros(self._ncrvs, dtype=float64)
+        best_i, best_d = -1, inf
+        if self._kdt is not None:
+            xyz = pnt.xyz
+
+            # Upper bound from the nearest sample
+            d, k = self._kdt.query(xyz)
+            best_i, best_d = int(self._pnt_owner[k]), d
+
+            # Lower bounds from the polyline segments
+            ap = xyz - self._a
+            t = einsum('ij,ij->i', ap, self._ab)
+            t = clip(t / self._ab2.clip(1.0e-300), 0., 1.)
+            dseg = norm(ap - t[:, None] * self._ab, axis=1) - self._pad
+            lbounds.fill(inf)
+            minimum.at(lbounds, self._seg_owner, dseg.clip(0.))
+            lbounds[self._unbounded] = 0.
+
+        # Refine in the order of the lower bounds
+        for i in argsort(lbounds, kind='mergesort').tolist():
+            if lbounds[i] > best_d:
+                break
+            d = _exact_distance(pnt, self._adps[i], self._tol)
+            if d is not None and d < best_d:
+                best_i, best_d = i, d
+
+        return best_i, best_d
+
+
+def _exact_distance(pnt, adp_crv, tol):
+    """
+    Minimum distance between a point and an adaptor curve including its end
+    points, or None if it could not be computed.
+    """
+    dmin = None
+    tool = Extrema_ExtPC(pnt, adp_crv.object, tol)
+    if tool.IsDone():
+        for i in range(1, tool.NbExt() + 1):
+            di = sqrt(tool.SquareDistance(i))
+            if dmin is None or di < dmin:
+                dmin = di
+    for u in (adp_crv.u1, adp_crv.u2):
+        if isfinite(u):
+            di = pnt.Distance(adp_crv.eval(u))
+            if dmin is None or di < dmin:
+                dmin = di
+    return dmin
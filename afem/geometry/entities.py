@@ -18,6 +18,7 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
 from math import radians
 
+from OCC.Core.BRep import BRep_Builder
 from OCC.Core.BRepBuilderAPI import (BRepBuilderAPI_MakeFace,
                                  BRepBuilderAPI_MakeEdge,
                                  BRepBuilderAPI_MakeVertex)
@@ -44,12 +45,17 @@ from OCC.Core.GeomAbs import GeomAbs_SurfaceOfRevolution, GeomAbs_SurfaceOfExtru
 from OCC.Core.GeomAbs import GeomAbs_OffsetSurface, GeomAbs_OtherSurface
 from OCC.Core.GeomAdaptor import GeomAdaptor_Curve, GeomAdaptor_Surface
 from OCC.Core.GeomLib import GeomLib_IsPlanarSurface
+from OCC.Core.ShapeAnalysis import ShapeAnalysis_Surface
 from OCC.Core.TColStd import (TColStd_Array1OfInteger, TColStd_Array1OfReal,
                           TColStd_Array2OfReal)
 from OCC.Core.TColgp import TColgp_Array1OfPnt, TColgp_Array2OfPnt
+from OCC.Core.TopoDS import TopoDS_Compound
 from OCC.Core.gp import (gp_Ax1, gp_Ax2, gp_Ax3, gp_Dir, gp_Pnt, gp_Pnt2d,
                      gp_Vec2d, gp_Dir2d, gp_Vec)
-from numpy import add, array, float64, subtract, ones
+from numpy import (add, arange, argmin, array, ascontiguousarray, asarray,
+                   empty, float64, inf, integer, linspace, ndarray, nonzero,
+                   sqrt, subtract, vstack, zeros)
+from numpy.linalg import norm
 
 from afem.base.entities import ViewableItem
 from afem.geometry import utils as geom_utils
@@ -59,6 +65,7 @@ from afem.occ import utils as occ_utils
 __all__ = ["Geometry2D", "Point2D", "Vector2D", "Direction2D",
            "Curve2D", "NurbsCurve2D",
            "Geometry", "Point", "Direction", "Vector", "Axis1", "Axis3",
+           "PointArray", "VectorArray",
            "Curve", "Line", "Circle", "Ellipse", "NurbsCurve", "TrimmedCurve",
            "Surface", "Plane", "NurbsSurface"]
 
@@ -1770,6 +1777,360 @@ class Axis3(gp_Ax3):
         return cls(p, n, x)
 
 
+# Arrays of points and vectors backed by a single (n, 3) buffer.
+class _PointView(Point):
+    """
+    A point that is bound to a row of a coordinate array. Changes made through
+    the point methods are written back to the array.
+    """
+
+    def __init__(self, xyz, index):
+        super(_PointView, self).__init__(*xyz[index])
+        self._xyz_buffer = xyz
+        self._xyz_index = index
+
+    def _sync(self):
+        self._xyz_buffer[self._xyz_index] = self.X(), self.Y(), self.Z()
+
+    @property
+    def x(self):
+        return self.X()
+
+    @x.setter
+    def x(self, x):
+        self.SetX(x)
+        self._sync()
+
+    @property
+    def y(self):
+        return self.Y()
+
+    @y.setter
+    def y(self, y):
+        self.SetY(y)
+        self._sync()
+
+    @property
+    def z(self):
+        return self.Z()
+
+    @z.setter
+    def z(self, z):
+        self.SetZ(z)
+        self._sync()
+
+    def set_xyz(self, xyz):
+        status = super(_PointView, self).set_xyz(xyz)
+        self._sync()
+        return status
+
+    def translate(self, v):
+        status = super(_PointView, self).translate(v)
+        self._sync()
+        return status
+
+    def mirror(self, pln):
+        status = super(_PointView, self).mirror(pln)
+        self._sync()
+        return status
+
+    def scale(self, pnt, s):
+        status = super(_PointView, self).scale(pnt, s)
+        self._sync()
+        return status
+
+    def rotate(self, ax1, angle):
+        status = super(_PointView, self).rotate(ax1, angle)
+        self._sync()
+        return status
+
+    def rotate_xyz(self, origin, x, y, z):
+        super(_PointView, self).rotate_xyz(origin, x, y, z)
+        self._sync()
+
+
+class _VectorView(Vector):
+    """
+    A vector that is bound to a row of a coordinate array. Changes made
+    through the vector methods are written back to the array.
+    """
+
+    def __init__(self, xyz, index):
+        super(_VectorView, self).__init__(*xyz[index])
+        self._xyz_buffer = xyz
+        self._xyz_index = index
+
+    def _sync(self):
+        self._xyz_buffer[self._xyz_index] = self.X(), self.Y(), self.Z()
+
+    @property
+    def x(self):
+        return self.X()
+
+    @x.setter
+    def x(self, x):
+        self.SetX(x)
+        self._sync()
+
+    @property
+    def y(self):
+        return self.Y()
+
+    @y.setter
+    def y(self, y):
+        self.SetY(y)
+        self._sync()
+
+    @property
+    def z(self):
+        return self.Z()
+
+    @z.setter
+    def z(self, z):
+        self.SetZ(z)
+        self._sync()
+
+    def reverse(self):
+        super(_VectorView, self).reverse()
+        self._sync()
+
+    def normalize(self):
+        super(_VectorView, self).normalize()
+        self._sync()
+
+    def scale(self, scale):
+        super(_VectorView, self).scale(scale)
+        self._sync()
+
+    def mirror(self, pln):
+        status = super(_VectorView, self).mirror(pln)
+        self._sync()
+        return status
+
+    def rotate(self, ax1, angle):
+        status = super(_VectorView, self).rotate(ax1, angle)
+        self._sync()
+        return status
+
+
+class _Array3D(object):
+    """
+    Base class for a collection of 3-D entities stored in a contiguous (n, 3)
+    array of floats.
+    """
+    # Type returned when accessing a single item
+    _VIEW_TYPE = None
+    _ITEM_TYPE = None
+
+    def __init__(self, xyz=()):
+        if isinstance(xyz, _Array3D):
+            xyz = xyz.xyz
+        elif not isinstance(xyz, ndarray):
+            xyz = [tuple(p.Coord()) if isinstance(p, (gp_Pnt, gp_Vec, gp_Dir))
+                   else p for p in xyz]
+        xyz = asarray(xyz, dtype=float64)
+        if xyz.size == 0:
+            xyz = xyz.reshape(0, 3)
+        if xyz.ndim != 2 or xyz.shape[1] != 3:
+            msg = 'Expected an array of shape (n, 3) but got {}.'.format(
+                xyz.shape)
+            raise ValueError(msg)
+        self._xyz = ascontiguousarray(xyz)
+
+    def __str__(self):
+        return '{}({})'.format(self.__class__.__name__, len(self))
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, len(self))
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or dtype == float64:
+            if copy:
+                return self._xyz.copy()
+            return self._xyz
+        return self._xyz.astype(dtype)
+
+    def __len__(self):
+        return self._xyz.shape[0]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._VIEW_TYPE(self._xyz, i)
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, integer)):
+            if item < 0:
+                item += len(self)
+            if not 0 <= item < len(self):
+                raise IndexError('Index out of range.')
+            return self._VIEW_TYPE(self._xyz, item)
+        return self.__class__(self._xyz[item])
+
+    def __setitem__(self, item, value):
+        self._xyz[item] = value
+
+    def __add__(self, other):
+        if isinstance(other, _Array3D):
+            return self.__class__(vstack((self._xyz, other.xyz)))
+        return NotImplemented
+
+    @property
+    def xyz(self):
+        """
+        :return: The underlying (n, 3) array. Modifying it modifies the
+            items of this collection.
+        :rtype: numpy.ndarray
+        """
+        return self._xyz
+
+    def index(self, item, tol=0.):
+        """
+        Find the index of the first item equal to the given one.
+
+        :param item: The item.
+        :type item: point_like or vector_like
+        :param float tol: Tolerance for comparing coordinates.
+
+        :return: The index.
+        :rtype: int
+
+        :raise ValueError: If the item is not found.
+        """
+        d = norm(self._xyz - array(item, dtype=float64), axis=1)
+        indx = nonzero(d <= tol)[0]
+        if indx.size == 0:
+            raise ValueError('Item is not in the collection.')
+        return int(indx[0])
+
+    def copy(self):
+        """
+        Return a new copy of the collection.
+
+        :return: The new collection.
+        :rtype: afem.geometry.entities.PointArray or
+            afem.geometry.entities.VectorArray
+        """
+        return self.__class__(self._xyz.copy())
+
+    def to_list(self):
+        """
+        Convert the collection to a list of independent entities.
+
+        :return: The list.
+        :rtype: list(afem.geometry.entities.Point) or
+            list(afem.geometry.entities.Vector)
+        """
+        return [self._ITEM_TYPE(*xyz) for xyz in self._xyz.tolist()]
+
+
+class PointArray(_Array3D, ViewableItem):
+    """
+    A collection of points stored in a contiguous (n, 3) array of floats.
+    Accessing a single item returns a :class:`.Point` created on demand
+    whose changes made through the :class:`.Point` methods are written back
+    to the array. Slicing returns a new :class:`.PointArray` sharing the same
+    data when possible.
+
+    :param xyz: The points.
+    :type xyz: array_like or collections.Sequence(point_like)
+
+    :raise ValueError: If the points cannot be converted to an (n, 3) array.
+    """
+    _VIEW_TYPE = _PointView
+    _ITEM_TYPE = Point
+
+    def __init__(self, xyz=()):
+        super(PointArray, self).__init__(xyz)
+        ViewableItem.__init__(self)
+        self.set_color(1, 1, 0)
+
+    @property
+    def displayed_shape(self):
+        """
+        :return: The shape to be displayed.
+        :rtype: OCC.Core.TopoDS.TopoDS_Compound
+        """
+        compound = TopoDS_Compound()
+        builder = BRep_Builder()
+        builder.MakeCompound(compound)
+        for xyz in self._xyz.tolist():
+            v = BRepBuilderAPI_MakeVertex(gp_Pnt(*xyz)).Vertex()
+            builder.Add(compound, v)
+        return compound
+
+    def distance(self, other):
+        """
+        Compute the distance between each point and the other point.
+
+        :param point_like other: The other point.
+
+        :return: The distances.
+        :rtype: numpy.ndarray
+        """
+        other = Point.to_point(other)
+        return norm(self._xyz - other.xyz, axis=1)
+
+    def nearest(self, other):
+        """
+        Find the point nearest to the given point.
+
+        :param point_like other: The other point.
+
+        :return: The nearest point.
+        :rtype: afem.geometry.entities.Point
+
+        :raise ValueError: If the collection is empty.
+        """
+        if len(self) == 0:
+            raise ValueError('The collection is empty.')
+        return self[int(argmin(self.distance(other)))]
+
+    def translate(self, v):
+        """
+        Translate all the points along the vector.
+
+        :param vector_like v: The translation vector.
+
+        :return: *True* if translated.
+        :rtype: bool
+        """
+        v = Vector.to_vector(v)
+        self._xyz += v.xyz
+        return True
+
+
+class VectorArray(_Array3D):
+    """
+    A collection of vectors stored in a contiguous (n, 3) array of floats.
+    Accessing a single item returns a :class:`.Vector` created on demand
+    whose changes made through the :class:`.Vector` methods are written back
+    to the array.
+
+    :param xyz: The vectors.
+    :type xyz: array_like or collections.Sequence(vector_like)
+
+    :raise ValueError: If the vectors cannot be converted to an (n, 3) array.
+    """
+    _VIEW_TYPE = _VectorView
+    _ITEM_TYPE = Vector
+
+    @property
+    def mag(self):
+        """
+        :return: The magnitude of each vector.
+        :rtype: numpy.ndarray
+        """
+        return norm(self._xyz, axis=1)
+
+    def normalize(self):
+        """
+        Normalize each vector in place.
+
+        :return: None.
+        """
+        self._xyz /= self.mag.reshape(-1, 1)
+
+
 # Transient types that are wrapped.
 class Geometry(ViewableItem):
     """
@@ -1826,6 +2187,7 @@ class Geometry(ViewableItem):
             raise TypeError(msg)
         super(Geometry, self).__init__()
         self._object = obj
+        self._cache = {}
 
         # Set default color
         if isinstance(self, Curve):
@@ -1841,6 +2203,31 @@ class Geometry(ViewableItem):
         """
         return self._object
 
+    def clear_cache(self):
+        """
+        Clear data cached from the underlying object (e.g., control points
+        and knots). The methods of this class that modify the geometry do this
+        automatically, but it should be called if the underlying OpenCASCADE
+        object is modified directly.
+
+        :return: None.
+        """
+        self._cache.clear()
+
+    def _cached(self, key, func):
+        """
+        Get a cached value or compute it with *func* and cache it. Cached
+        arrays are marked read-only since they are shared between calls.
+        """
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = func()
+            if isinstance(value, ndarray):
+                value.flags.writeable = False
+            self._cache[key] = value
+            return value
+
     def translate(self, v):
         """
         Translate the geometry along the vector.
@@ -1854,6 +2241,7 @@ class Geometry(ViewableItem):
         """
         v = Vector.to_vector(v)
         self.object.Translate(v)
+        self.clear_cache()
         return True
 
     def mirror(self, pln):
@@ -1869,6 +2257,7 @@ class Geometry(ViewableItem):
         gp_ax2 = gp_Ax2()
         gp_ax2.SetAxis(gp_pln.Axis())
         self.object.Mirror(gp_ax2)
+        self.clear_cache()
         return True
 
     def scale(self, pnt, s):
@@ -1883,6 +2272,7 @@ class Geometry(ViewableItem):
         """
         pnt = Point.to_point(pnt)
         self.object.Scale(pnt, s)
+        self.clear_cache()
         return True
 
     def rotate(self, ax1, angle):
@@ -1897,6 +2287,20 @@ class Geometry(ViewableItem):
         """
         angle = radians(angle)
         self.object.Rotate(ax1, angle)
+        self.clear_cache()
+        return True
+
+    def transform(self, trsf):
+        """
+        Transform the geometry.
+
+        :param OCC.Core.gp.gp_Trsf trsf: The transformation.
+
+        :return: *True* if transformed.
+        :rtype: bool
+        """
+        self.object.Transform(trsf)
+        self.clear_cache()
         return True
 
 
@@ -2062,6 +2466,7 @@ class Curve(Geometry):
         :return: None.
         """
         self.object.Reverse()
+        self.clear_cache()
 
     def reversed_u(self, u):
         """
@@ -2268,61 +2673,80 @@ class NurbsCurve(Curve):
     @property
     def knots(self):
         """
-        :return: Knot vector.
+        :return: Knot vector. The array is cached and read-only.
         :rtype: numpy.ndarray
         """
-        tcol_array = TColStd_Array1OfReal(1, self.object.NbKnots())
-        self.object.Knots(tcol_array)
-        return occ_utils.to_np_from_tcolstd_array1_real(tcol_array)
+        return self._cached('knots', self._get_knots)
 
     @property
     def mult(self):
         """
-        :return: Multiplicity of knot vector.
+        :return: Multiplicity of knot vector. The array is cached and
+            read-only.
         :rtype: numpy.ndarray
         """
-        tcol_array = TColStd_Array1OfInteger(1, self.object.NbKnots())
-        self.object.Multiplicities(tcol_array)
-        return occ_utils.to_np_from_tcolstd_array1_integer(tcol_array)
+        return self._cached('mult', self._get_mult)
 
     @property
     def uk(self):
         """
-        :return: Knot sequence.
+        :return: Knot sequence. The array is cached and read-only.
         :rtype: numpy.ndarray
         """
-        tcol_knot_seq = TColStd_Array1OfReal(1, self.object.NbPoles() +
-                                             self.object.Degree() + 1)
-        self.object.KnotSequence(tcol_knot_seq)
-        return occ_utils.to_np_from_tcolstd_array1_real(tcol_knot_seq)
+        return self._cached('uk', self._get_uk)
 
     @property
     def cp(self):
         """
-        :return: Control points.
+        :return: Control points. The array is cached and read-only.
         :rtype: numpy.ndarray
         """
-        tcol_array = TColgp_Array1OfPnt(1, self.object.NbPoles())
-        self.object.Poles(tcol_array)
-        return occ_utils.to_np_from_tcolgp_array1_pnt(tcol_array)
+        return self._cached('cp', self._get_cp)
 
     @property
     def w(self):
         """
-        :return: Weights of control points.
+        :return: Weights of control points. The array is cached and
+            read-only.
         :rtype: numpy.ndarray
         """
-        tcol_array = TColStd_Array1OfReal(1, self.object.NbPoles())
-        self.object.Weights(tcol_array)
-        return occ_utils.to_np_from_tcolstd_array1_real(tcol_array)
+        return self._cached('w', self._get_w)
 
     @property
     def cpw(self):
         """
-        :return: Homogeneous control points.
+        :return: Homogeneous control points. The array is cached and
+            read-only.
         :rtype: numpy.ndarray
         """
-        return geom_utils.homogenize_array1d(self.cp, self.w)
+        return self._cached('cpw', lambda: geom_utils.homogenize_array1d(
+            self.cp, self.w))
+
+    def _get_knots(self):
+        tcol_array = TColStd_Array1OfReal(1, self.object.NbKnots())
+        self.object.Knots(tcol_array)
+        return occ_utils.to_np_from_tcolstd_array1_real(tcol_array)
+
+    def _get_mult(self):
+        tcol_array = TColStd_Array1OfInteger(1, self.object.NbKnots())
+        self.object.Multiplicities(tcol_array)
+        return occ_utils.to_np_from_tcolstd_array1_integer(tcol_array)
+
+    def _get_uk(self):
+        tcol_knot_seq = TColStd_Array1OfReal(1, self.object.NbPoles() +
+                                             self.object.Degree() + 1)
+        self.object.KnotSequence(tcol_knot_seq)
+        return occ_utils.to_np_from_tcolstd_array1_real(tcol_knot_seq)
+
+    def _get_cp(self):
+        tcol_array = TColgp_Array1OfPnt(1, self.object.NbPoles())
+        self.object.Poles(tcol_array)
+        return occ_utils.to_np_from_tcolgp_array1_pnt(tcol_array)
+
+    def _get_w(self):
+        tcol_array = TColStd_Array1OfReal(1, self.object.NbPoles())
+        self.object.Weights(tcol_array)
+        return occ_utils.to_np_from_tcolstd_array1_real(tcol_array)
 
     def set_domain(self, u1=0., u2=1.):
         """
@@ -2340,6 +2764,7 @@ class NurbsCurve(Curve):
         self.object.Knots(tcol_knots)
         geom_utils.reparameterize_knots(u1, u2, tcol_knots)
         self.object.SetKnots(tcol_knots)
+        self.clear_cache()
         return True
 
     def segment(self, u1, u2):
@@ -2355,6 +2780,7 @@ class NurbsCurve(Curve):
         if u1 > u2:
             return False
         self.object.Segment(u1, u2)
+        self.clear_cache()
         return True
 
     def set_cp(self, i, cp, weight=None):
@@ -2372,6 +2798,7 @@ class NurbsCurve(Curve):
             self.object.SetPole(i, cp)
         else:
             self.object.SetPole(i, cp, weight)
+        self.clear_cache()
 
     @classmethod
     def by_data(cls, cp, knots, mult, p, weights=None, is_periodic=False):
@@ -2704,6 +3131,28 @@ class Surface(Geometry):
             return proj.LowerDistanceParameters(0., 0.)
         raise RuntimeError('Failed to invert point.')
 
+    def project_points(self, pnts, tol=1.0e-7):
+        """
+        Project many points to the surface. The solver is initialized once
+        per surface and cached. Each solve is warm-started from the previous
+        solution or the nearest sample of a coarse grid on the surface,
+        falling back to a global search if the local solution is not at
+        least as close as the starting guess.
+
+        :param pnts: The points.
+        :type pnts: afem.geometry.entities.PointArray or
+            list(point_like) or array_like
+        :param float tol: Tolerance.
+
+        :return: The (u, v) parameters as an (n, 2) array, the nearest points
+            on the surface as an (n, 3) array, and the distances as an (n, )
+            array.
+        :rtype: tuple(numpy.ndarray)
+        """
+        xyz = PointArray(pnts).xyz
+        inverter = self._cached('inverter', lambda: _SurfaceInverter(self))
+        return inverter.perform(xyz, tol)
+
     @staticmethod
     def wrap(surface):
         """
@@ -2783,6 +3232,7 @@ class Plane(Surface):
         pln = self.gp_pln
         pln.Rotate(pln.XAxis(), radians(angle))
         self.object.SetPln(pln)
+        self.clear_cache()
 
     def rotate_y(self, angle):
         """
@@ -2795,6 +3245,7 @@ class Plane(Surface):
         pln = self.gp_pln
         pln.Rotate(pln.YAxis(), radians(angle))
         self.object.SetPln(pln)
+        self.clear_cache()
 
     @classmethod
     def by_system(cls, ax3):
@@ -2863,94 +3314,124 @@ class NurbsSurface(Surface):
     @property
     def uknots(self):
         """
-        :return: Knot vector in u-direction.
+        :return: Knot vector in u-direction. The array is cached and read-only.
         :rtype: numpy.ndarray
         """
-        tcol_array = TColStd_Array1OfReal(1, self.object.NbUKnots())
-        self.object.UKnots(tcol_array)
-        return occ_utils.to_np_from_tcolstd_array1_real(tcol_array)
+        return self._cached('uknots', self._get_uknots)
 
     @property
     def umult(self):
         """
-        :return: Multiplicity of knot vector in u-direction.
+        :return: Multiplicity of knot vector in u-direction. The array is
+            cached and read-only.
         :rtype: numpy.ndarray
         """
-        tcol_array = TColStd_Array1OfInteger(1, self.object.NbUKnots())
-        self.object.UMultiplicities(tcol_array)
-        return occ_utils.to_np_from_tcolstd_array1_integer(tcol_array)
+        return self._cached('umult', self._get_umult)
 
     @property
     def uk(self):
         """
-        :return: Knot sequence in u-direction.
+        :return: Knot sequence in u-direction. The array is cached and
+            read-only.
         :rtype: numpy.ndarray
         """
-        tcol_knot_seq = TColStd_Array1OfReal(1, self.object.NbUPoles() +
-                                             self.object.UDegree() + 1)
-        self.object.UKnotSequence(tcol_knot_seq)
-        return occ_utils.to_np_from_tcolstd_array1_real(tcol_knot_seq)
+        return self._cached('uk', self._get_uk)
 
     @property
     def vknots(self):
         """
-        :return: Knot vector in v-direction.
+        :return: Knot vector in v-direction. The array is cached and read-only.
         :rtype: numpy.ndarray
         """
-        tcol_array = TColStd_Array1OfReal(1, self.object.NbVKnots())
-        self.object.VKnots(tcol_array)
-        return occ_utils.to_np_from_tcolstd_array1_real(tcol_array)
+        return self._cached('vknots', self._get_vknots)
 
     @property
     def vmult(self):
         """
-        :return: Multiplicity of knot vector in v-direction.
+        :return: Multiplicity of knot vector in v-direction. The array is
+            cached and read-only.
         :rtype: numpy.ndarray
         """
-        tcol_array = TColStd_Array1OfInteger(1, self.object.NbVKnots())
-        self.object.VMultiplicities(tcol_array)
-        return occ_utils.to_np_from_tcolstd_array1_integer(tcol_array)
+        return self._cached('vmult', self._get_vmult)
 
     @property
     def vk(self):
         """
-        :return: Knot sequence in v-direction.
+        :return: Knot sequence in v-direction. The array is cached and
+            read-only.
         :rtype: numpy.ndarray
         """
-        tcol_knot_seq = TColStd_Array1OfReal(1, self.object.NbVPoles() +
-                                             self.object.VDegree() + 1)
-        self.object.VKnotSequence(tcol_knot_seq)
-        return occ_utils.to_np_from_tcolstd_array1_real(tcol_knot_seq)
+        return self._cached('vk', self._get_vk)
 
     @property
     def cp(self):
         """
-        :return: Control points.
+        :return: Control points. The array is cached and read-only.
         :rtype: numpy.ndarray
         """
-        tcol_array = TColgp_Array2OfPnt(1, self.object.NbUPoles(),
-                                        1, self.object.NbVPoles())
-        self.object.Poles(tcol_array)
-        return occ_utils.to_np_from_tcolgp_array2_pnt(tcol_array)
+        return self._cached('cp', self._get_cp)
 
     @property
     def w(self):
         """
-        :return: Weights of control points.
+        :return: Weights of control points. The array is cached and read-only.
         :rtype: numpy.ndarray
         """
-        tcol_array = TColStd_Array2OfReal(1, self.object.NbUPoles(),
-                                          1, self.object.NbVPoles())
-        self.object.Weights(tcol_array)
-        return occ_utils.to_np_from_tcolstd_array2_real(tcol_array)
+        return self._cached('w', self._get_w)
 
     @property
     def cpw(self):
         """
-        :return: Homogeneous control points.
+        :return: Homogeneous control points. The array is cached and
+            read-only.
         :rtype: numpy.ndarray
         """
-        return geom_utils.homogenize_array2d(self.cp, self.w)
+        return self._cached('cpw', lambda: geom_utils.homogenize_array2d(
+            self.cp, self.w))
+
+    def _get_uknots(self):
+        tcol_array = TColStd_Array1OfReal(1, self.object.NbUKnots())
+        self.object.UKnots(tcol_array)
+        return occ_utils.to_np_from_tcolstd_array1_real(tcol_array)
+
+    def _get_umult(self):
+        tcol_array = TColStd_Array1OfInteger(1, self.object.NbUKnots())
+        self.object.UMultiplicities(tcol_array)
+        return occ_utils.to_np_from_tcolstd_array1_integer(tcol_array)
+
+    def _get_uk(self):
+        tcol_knot_seq = TColStd_Array1OfReal(1, self.object.NbUPoles() +
+                                             self.object.UDegree() + 1)
+        self.object.UKnotSequence(tcol_knot_seq)
+        return occ_utils.to_np_from_tcolstd_array1_real(tcol_knot_seq)
+
+    def _get_vknots(self):
+        tcol_array = TColStd_Array1OfReal(1, self.object.NbVKnots())
+        self.object.VKnots(tcol_array)
+        return occ_utils.to_np_from_tcolstd_array1_real(tcol_array)
+
+    def _get_vmult(self):
+        tcol_array = TColStd_Array1OfInteger(1, self.object.NbVKnots())
+        self.object.VMultiplicities(tcol_array)
+        return occ_utils.to_np_from_tcolstd_array1_integer(tcol_array)
+
+    def _get_vk(self):
+        tcol_knot_seq = TColStd_Array1OfReal(1, self.object.NbVPoles() +
+                                             self.object.VDegree() + 1)
+        self.object.VKnotSequence(tcol_knot_seq)
+        return occ_utils.to_np_from_tcolstd_array1_real(tcol_knot_seq)
+
+    def _get_cp(self):
+        tcol_array = TColgp_Array2OfPnt(1, self.object.NbUPoles(),
+                                        1, self.object.NbVPoles())
+        self.object.Poles(tcol_array)
+        return occ_utils.to_np_from_tcolgp_array2_pnt(tcol_array)
+
+    def _get_w(self):
+        tcol_array = TColStd_Array2OfReal(1, self.object.NbUPoles(),
+                                          1, self.object.NbVPoles())
+        self.object.Weights(tcol_array)
+        return occ_utils.to_np_from_tcolstd_array2_real(tcol_array)
 
     def set_udomain(self, u1=0., u2=1.):
         """
@@ -2968,6 +3449,7 @@ class NurbsSurface(Surface):
         self.object.UKnots(tcol_knots)
         geom_utils.reparameterize_knots(u1, u2, tcol_knots)
         self.object.SetUKnots(tcol_knots)
+        self.clear_cache()
         return True
 
     def set_vdomain(self, v1=0., v2=1.):
@@ -2986,6 +3468,7 @@ class NurbsSurface(Surface):
         self.object.VKnots(tcol_knots)
         geom_utils.reparameterize_knots(v1, v2, tcol_knots)
         self.object.SetVKnots(tcol_knots)
+        self.clear_cache()
         return True
 
     def local_to_global_param(self, d, *args):
@@ -3035,6 +3518,7 @@ class NurbsSurface(Surface):
         if u1 > u2 or v1 > v2:
             return False
         self.object.CheckAndSegment(u1, u2, v1, v2)
+        self.clear_cache()
         return True
 
     def locate_u(self, u, tol2d=1.0e-9, with_knot_repetition=False):
@@ -3080,6 +3564,7 @@ class NurbsSurface(Surface):
         :return: None.
         """
         self.object.InsertUKnot(u, m, tol2d)
+        self.clear_cache()
 
     def insert_vknot(self, v, m=1, tol2d=1.0e-9):
         """
@@ -3094,6 +3579,7 @@ class NurbsSurface(Surface):
         :return: None.
         """
         self.object.InsertVKnot(v, m, tol2d)
+        self.clear_cache()
 
     def set_uknots(self, uknots):
         """
@@ -3110,6 +3596,7 @@ class NurbsSurface(Surface):
         if uk.Size() != self.object.NbUKnots():
             raise ValueError('Incorrect number of knot values.')
         self.object.SetUKnots(uk)
+        self.clear_cache()
 
     def set_vknots(self, vknots):
         """
@@ -3126,6 +3613,7 @@ class NurbsSurface(Surface):
         if vk.Size() != self.object.NbVKnots():
             raise ValueError('Incorrect number of knot values.')
         self.object.SetVKnots(vk)
+        self.clear_cache()
 
     def set_cp(self, i, j, cp, weight=None):
         """
@@ -3143,6 +3631,7 @@ class NurbsSurface(Surface):
             self.object.SetPole(i, j, cp)
         else:
             self.object.SetPole(i, j, cp, weight)
+        self.clear_cache()
 
     def set_cp_row(self, u_index, cp, weights=None):
         """
@@ -3162,6 +3651,7 @@ class NurbsSurface(Surface):
         else:
             tcol_w = occ_utils.to_tcolstd_array1_real(weights)
             self.object.SetPoleRow(u_index, tcol_gp, tcol_w)
+        self.clear_cache()
 
     def set_cp_col(self, v_index, cp, weights=None):
         """
@@ -3181,6 +3671,7 @@ class NurbsSurface(Surface):
         else:
             tcol_w = occ_utils.to_tcolstd_array1_real(weights)
             self.object.SetPoleCol(v_index, tcol_gp, tcol_w)
+        self.clear_cache()
 
     @classmethod
     def by_data(cls, cp, uknots, vknots, umult, vmult, p, q, weights=None,
@@ -3206,17 +3697,105 @@ class NurbsSurface(Surface):
         tcol_umult = occ_utils.to_tcolstd_array1_integer(umult)
         tcol_vknots = occ_utils.to_tcolstd_array1_real(vknots)
         tcol_vmult = occ_utils.to_tcolstd_array1_integer(vmult)
-        if weights is None:
-            weights = ones((tcol_cp.ColLength(), tcol_cp.RowLength()))
-        tcol_weights = occ_utils.to_tcolstd_array2_real(weights)
 
         geom_srf = Geom_BSplineSurface(tcol_cp, tcol_uknots, tcol_vknots,
                                        tcol_umult, tcol_vmult, p, q,
                                        is_u_periodic, is_v_periodic)
 
-        # Set the weights since using in construction causes an error.
-        for i in range(1, tcol_weights.ColLength() + 1):
-            for j in range(1, tcol_weights.RowLength() + 1):
-                geom_srf.SetWeight(i, j, tcol_weights.Value(i, j))
+        # Set the weights since using in construction causes an error. The
+        # surface is non-rational by default so unit weights are skipped.
+        if weights is not None:
+            weights = asarray(weights, dtype=float64)
+            set_weight = geom_srf.SetWeight
+            for i, row in enumerate(weights.tolist(), 1):
+                for j, w in enumerate(row, 1):
+                    if w != 1.:
+                        set_weight(i, j, w)
 
         return cls(geom_srf)
+
+
+class _SurfaceInverter(object):
+    """
+    Reusable point inversion on a surface using a single
+    ``ShapeAnalysis_Surface`` instance and a coarse grid of samples for
+    starting guesses.
+    """
+    _NSAMPLES = 16
+
+    def __init__(self, srf):
+        geom = srf.object
+        self._geom = geom
+        self._sas = ShapeAnalysis_Surface(geom)
+        self._grid_uv = None
+        self._grid_xyz = None
+
+        u1, u2, v1, v2 = srf.u1, srf.u2, srf.v1, srf.v2
+        if max(abs(u1), abs(u2), abs(v1), abs(v2)) >= 1.0e100:
+            return None
+
+        n = self._NSAMPLES
+        uv = [(u, v) for u in linspace(u1, u2, n).tolist()
+              for v in linspace(v1, v2, n).tolist()]
+        value = geom.Value
+        self._grid_uv = uv
+        self._grid_xyz = array([value(u, v).Coord() for u, v in uv])
+
+    def perform(self, xyz, tol):
+        n = xyz.shape[0]
+        uv = empty((n, 2), dtype=float64)
+        pnts = empty((n, 3), dtype=float64)
+        dist = empty(n, dtype=float64)
+        if n == 0:
+            return uv, pnts, dist
+
+        if self._grid_xyz is not None:
+            indx, dgrid = _nearest_samples(xyz, self._grid_xyz)
+            seeds = [self._grid_uv[i] for i in indx.tolist()]
+            bounds = dgrid.tolist()
+        else:
+            seeds = [None] * n
+            bounds = [inf] * n
+
+        # Distance between consecutive input points to decide if the previous
+        # solution is a better starting guess
+        step = zeros(n, dtype=float64)
+        step[1:] = norm(xyz[1:] - xyz[:-1], axis=1)
+        step = step.tolist()
+
+        sas = self._sas
+        value = self._geom.Value
+        prev_uv, prev_d = None, 0.
+        for i, (x, y, z) in enumerate(xyz.tolist()):
+            p = gp_Pnt(x, y, z)
+            seed, bound = seeds[i], bounds[i]
+            if prev_uv is not None and prev_d + step[i] < bound:
+                seed, bound = prev_uv, prev_d + step[i]
+            if seed is None:
+                sol = sas.ValueOfUV(p, tol)
+            else:
+                sol = sas.NextValueOfUV(gp_Pnt2d(seed[0], seed[1]), p, tol,
+                                        bound + tol)
+            u, v = sol.X(), sol.Y()
+            q = value(u, v)
+            prev_uv, prev_d = (u, v), p.Distance(q)
+            uv[i] = prev_uv
+            pnts[i] = q.Coord()
+            dist[i] = prev_d
+
+        return uv, pnts, dist
+
+
+def _nearest_samples(xyz, samples, chunk=1024):
+    """
+    Find the index of and distance to the nearest sample for each point.
+    """
+    n = xyz.shape[0]
+    indx = empty(n, dtype=int)
+    dist = empty(n, dtype=float64)
+    for i in range(0, n, chunk):
+        d2 = ((xyz[i:i + chunk, None, :] - samples[None, :, :]) ** 2).sum(-1)
+        j = d2.argmin(axis=1)
+        indx[i:i + chunk] = j
+        dist[i:i + chunk] = sqrt(d2[arange(j.size), j])
+    return indx, dist
@@ -16,23 +16,25 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with this library; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+from concurrent.futures import ThreadPoolExecutor
+
 from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_MakeEdge
-from OCC.Core.Extrema import Extrema_ExtPC
 from OCC.Core.GeomAPI import GeomAPI_IntCS
 from OCC.Core.GeomInt import GeomInt_IntSS
 from OCC.Core.IntTools import IntTools_EdgeEdge
 from OCC.Core.ShapeFix import ShapeFix_ShapeTolerance
 from OCC.Core.TopAbs import TopAbs_VERTEX
-from numpy import float64, inf, mean, sqrt, zeros
+from numpy import (argsort, array, float64, inf, int32, isfinite, linspace,
+                   mean, searchsorted, zeros)
 from scipy.spatial import KDTree
 
-from afem.adaptor.entities import AdaptorCurve
 from afem.geometry.check import CheckGeom
-from afem.geometry.entities import Curve, Point
+from afem.geometry.distance import CurveIndex
+from afem.geometry.entities import Curve, NurbsCurve, Point, PointArray
 
 __all__ = ["CurveIntersector", "IntersectCurveCurve",
            "IntersectCurveSurface", "SurfaceIntersector",
-           "IntersectSurfaceSurface"]
+           "IntersectSurfaceSurface", "IntersectCurvesCurves"]
 
 
 class CurveIntersector(object):
@@ -145,34 +147,9 @@ class IntersectCurveCurve(CurveIntersector):
     def __init__(self, crv1, crv2, itol=1.0e-7):
         super(IntersectCurveCurve, self).__init__(crv1, crv2)
 
-        # Build edges from curve
-        e1 = BRepBuilderAPI_MakeEdge(crv1.object).Edge()
-        e2 = BRepBuilderAPI_MakeEdge(crv2.object).Edge()
-
-        # Set tolerance to be half intersection tolerance
-        shp_tol = ShapeFix_ShapeTolerance()
-        tol = itol / 2.
-        shp_tol.SetTolerance(e1, tol)
-        shp_tol.SetTolerance(e2, tol)
-
-        # Perform edge-edge intersection
-        cci = IntTools_EdgeEdge(e1, e2)
-        cci.Perform()
-
-        # Gather results of point intersection only
-        results = []
-        common_parts = cci.CommonParts()
-        for i in range(1, common_parts.Length() + 1):
-            common_part = common_parts.Value(i)
-            if not common_part.Type() == TopAbs_VERTEX:
-                continue
-            u1 = common_part.VertexParameter1()
-            u2 = common_part.VertexParameter2()
-            p1 = crv1.eval(u1)
-            p2 = crv2.eval(u2)
-            pi = mean([p1, p2], axis=0)
-            pi = Point(*pi)
-            results.append([(u1, u2), pi])
+        e1 = _intersection_edge(crv1, itol)
+        e2 = _intersection_edge(crv2, itol)
+        results = _intersect_edges(crv1, e1, crv2, e2)
 
         npts = len(results)
         self._set_results(npts, results)
@@ -221,6 +198,7 @@ class SurfaceIntersector(object):
 
     def __init__(self):
         self._crvs = []
+        self._index = None
 
     @property
     def ncrvs(self):
@@ -257,17 +235,47 @@ class SurfaceIntersector(object):
         """
         return self._crvs[indx - 1]
 
+    @property
+    def curve_index(self):
+        """
+        :return: A spatial index of the intersection curves. It is built on
+            first use.
+        :rtype: afem.geometry.distance.CurveIndex
+        """
+        if self._index is None:
+            self._index = CurveIndex(self._crvs)
+        return self._index
+
     def curve_nearest_point(self, pnt):
         """
-        Get the index of the intersection curve that is nearest to the given
-        reference point.
+        Get the intersection curve that is nearest to the given reference
+        point.
 
         :param point_like pnt: Reference point.
 
-        :return: Index of curve nearest point.
-        :rtype: int
+        :return: Curve nearest point.
+        :rtype: afem.geometry.entities.Curve
+        """
+        if not self._crvs:
+            return None
+        i, _ = self.curve_index.nearest(pnt)
+        return self._crvs[i]
+
+    def curves_nearest_points(self, pnts):
+        """
+        Get the intersection curve that is nearest to each reference point.
+
+        :param pnts: Reference points.
+        :type pnts: collections.Sequence(point_like) or
+            afem.geometry.entities.PointArray
+
+        :return: Curves nearest each point.
+        :rtype: list(afem.geometry.entities.Curve)
         """
-        return _curve_nearest_point(pnt, self._crvs)
+        if not self._crvs:
+            return [None] * len(pnts)
+        indices, _ = self.curve_index.nearest_many(pnts)
+        return [self._crvs[i] for i in indices.tolist()]
 
 
 class IntersectSurfaceSurface(SurfaceIntersector):
@@ -306,42 +314,234 @@ class IntersectSurfaceSurface(SurfaceIntersector):
         return self._tol3d
 
 
-def _distance_point_to_curve(point, curve):
+class IntersectCurvesCurves(object):
     """
-    Find the minimum distance between a point and a curve.
+    Many-to-many curve-curve intersection. An axis-aligned bounding box is
+    built for each curve from its control points (NURBS curves) or from a
+    sampled polyline (other curves). Candidate pairs are found by sweeping
+    the boxes along the x-axis and the exact intersection of
+    :class:`.IntersectCurveCurve` is only performed on the candidates.
+
+    :param collections.Sequence(afem.geometry.entities.Curve) crvs1: The
+        first curves.
+    :param crvs2: The second curves. If *None* is provided, then the curves
+        of *crvs1* are intersected with each other and only pairs with
+        i < j are reported.
+    :type crvs2: collections.Sequence(afem.geometry.entities.Curve) or None
+    :param float itol: The intersection tolerance.
+    :param int nsample: Number of points used to sample curves that are not
+        NURBS curves when building their bounding box.
+    :param int nthreads: Number of threads used for the exact intersections.
+        If less than two, the intersections are performed serially.
     """
-    # OCC extrema.
-    adp_crv = AdaptorCurve.to_adaptor(curve)
-    ext_pc = Extrema_ExtPC(point, adp_crv.object)
-    if not ext_pc.IsDone():
-        return None
 
-    # Find the minimum result.
-    n_ext = ext_pc.NbExt()
-    for i in range(1, n_ext + 1):
-        if ext_pc.IsMin(i):
-            d = ext_pc.SquareDistance(i)
-            return sqrt(d)
+    def __init__(self, crvs1, crvs2=None, itol=1.0e-7, nsample=33,
+                 nthreads=1):
+        crvs1 = list(crvs1)
+        is_self = crvs2 is None
+        crvs2 = crvs1 if is_self else list(crvs2)
+
+        # Broad phase
+        pad = 0.5 * itol
+        boxes1 = _curve_boxes(crvs1, nsample, pad)
+        boxes2 = boxes1 if is_self else _curve_boxes(crvs2, nsample, pad)
+        pairs = _overlapping_boxes(boxes1, boxes2, is_self)
+        self._ncandidates = len(pairs)
+
+        # Build each edge only once
+        edges1 = {}
+        edges2 = edges1 if is_self else {}
+        for i, j in pairs:
+            if i not in edges1:
+                edges1[i] = _intersection_edge(crvs1[i], itol)
+            if j not in edges2:
+                edges2[j] = _intersection_edge(crvs2[j], itol)
+
+        def _intersect(pair):
+            i, j = pair
+            return _intersect_edges(crvs1[i], edges1[i], crvs2[j], edges2[j])
+
+        # Narrow phase
+        if nthreads > 1 and len(pairs) > 1:
+            with ThreadPoolExecutor(nthreads) as executor:
+                all_results = list(executor.map(_intersect, pairs))
+        else:
+            all_results = [_intersect(pair) for pair in pairs]
+
+        # Gather results
+        indices, prms, xyz = [], [], []
+        for (i, j), results in zip(pairs, all_results):
+            for (u1, u2), p in results:
+                indices.append((i, j))
+                prms.append((u1, u2))
+                xyz.append(p.xyz)
+
+        npts = len(indices)
+        self._indices = array(indices, dtype=int32).reshape(npts, 2)
+        self._prms = array(prms, dtype=float64).reshape(npts, 2)
+        self._pnts = PointArray(array(xyz, dtype=float64).reshape(npts, 3))
+
+    @property
+    def ncandidates(self):
+        """
+        :return: Number of curve pairs whose bounding boxes overlapped and
+            were intersected.
+        :rtype: int
+        """
+        return self._ncandidates
+
+    @property
+    def npts(self):
+        """
+        :return: Number of intersection points.
+        :rtype: int
+        """
+        return self._indices.shape[0]
+
+    @property
+    def success(self):
+        """
+        :return: *True* if any intersection was found, *False* if not.
+        :rtype: bool
+        """
+        return self.npts > 0
+
+    @property
+    def indices(self):
+        """
+        :return: Indices (i, j) of the curves in the first and second list
+            for each intersection point.
+        :rtype: numpy.ndarray
+        """
+        return self._indices
+
+    @property
+    def parameters(self):
+        """
+        :return: Parameters (u_i, u_j) on each curve for each intersection
+            point.
+        :rtype: numpy.ndarray
+        """
+        return self._prms
+
+    @property
+    def points(self):
+        """
+        :return: The intersection points.
+        :rtype: afem.geometry.entities.PointArray
+        """
+        return self._pnts
+
+    @property
+    def table(self):
+        """
+        :return: The results as rows of (i, j, u_i, u_j, x, y, z).
+        :rtype: numpy.ndarray
+        """
+        data = zeros((self.npts, 7), dtype=float64)
+        data[:, :2] = self._indices
+        data[:, 2:4] = self._prms
+        data[:, 4:] = self._pnts.xyz
+        return data
 
-    return None
+    def pair_results(self, i, j):
+        """
+        Get the results of a single pair of curves.
+
+        :param int i: Index of the curve in the first list.
+        :param int j: Index of the curve in the second list.
+
+        :return: The parameters and the points of the intersections between
+            the two curves.
+        :rtype: tuple(numpy.ndarray, afem.geometry.entities.PointArray)
+        """
+        mask = (self._indices[:, 0] == i) & (self._indices[:, 1] == j)
+        return self._prms[mask], self._pnts[mask]
 
 
-def _curve_nearest_point(point, curves):
+def _intersection_edge(crv, itol):
+    """
+    Build an edge from the curve with a tolerance of half the intersection
+    tolerance.
+    """
+    e = BRepBuilderAPI_MakeEdge(crv.object).Edge()
+    ShapeFix_ShapeTolerance().SetTolerance(e, itol / 2.)
+    return e
+
+
+def _intersect_edges(crv1, e1, crv2, e2):
+    """
+    Intersect two edges built from curves and return the point results as
+    [(u1, u2), point].
+    """
+    cci = IntTools_EdgeEdge(e1, e2)
+    cci.Perform()
+
+    # Gather results of point intersection only
+    results = []
+    common_parts = cci.CommonParts()
+    for i in range(1, common_parts.Length() + 1):
+        common_part = common_parts.Value(i)
+        if not common_part.Type() == TopAbs_VERTEX:
+            continue
+        u1 = common_part.VertexParameter1()
+        u2 = common_part.VertexParameter2()
+        p1 = crv1.eval(u1)
+        p2 = crv2.eval(u2)
+        pi = mean([p1, p2], axis=0)
+        pi = Point(*pi)
+        results.append([(u1, u2), pi])
+    return results
+
+
+def _curve_boxes(crvs, nsample, pad):
+    """
+    Axis-aligned bounding boxes of the curves as an (n, 6) array of
+    (xmin, ymin, zmin, xmax, ymax, zmax). Unbounded curves get an infinite
+    box.
+    """
+    boxes = zeros((len(crvs), 6), dtype=float64)
+    for i, crv in enumerate(crvs):
+        u1, u2 = crv.u1, crv.u2
+        if not (isfinite(u1) and isfinite(u2)):
+            boxes[i, :3], boxes[i, 3:] = -inf, inf
+            continue
+        if isinstance(crv, NurbsCurve):
+            # Convex hull property
+            xyz = crv.cp
+            tol = pad
+        else:
+            prms = linspace(u1, u2, max(nsample, 2)).tolist()
+            xyz = array([crv.eval(u).xyz for u in prms])
+            # A point on a span is within half its arc length of one of the
+            # span ends, unlike half the chord which the arc can bow beyond
+            arcs = [crv.arc_length(ua, ub) for ua, ub in
+                    zip(prms[:-1], prms[1:])]
+            tol = pad + 0.5 * max(arcs)
+        boxes[i, :3] = xyz.min(axis=0) - tol
+        boxes[i, 3:] = xyz.max(axis=0) + tol
+    return boxes
+
+
+def _overlapping_boxes(boxes1, boxes2, is_self):
     """
-    Find the curve nearest to the point.
+    Find the pairs (i, j) of overlapping boxes by sorting the second set of
+    boxes on their minimum x-value.
     """
-    ncrvs = len(curves)
-    if ncrvs == 0:
-        return None
-    if ncrvs == 1:
-        return curves[0]
-
-    cmin = curves[0]
-    dmin = _distance_point_to_curve(point, cmin)
-    for c in curves[1:]:
-        di = _distance_point_to_curve(point, c)
-        if di < dmin:
-            dmin = di
-            cmin = c
-
-    return cmin
+    order = argsort(boxes2[:, 0], kind='mergesort')
+    xmin2 = boxes2[order, 0]
+    pairs = []
+    for i, box in enumerate(boxes1):
+        # Boxes that start before this one ends
+        cand = order[:searchsorted(xmin2, box[3], side='right')]
+        if is_self:
+            cand = cand[cand > i]
+        if cand.size == 0:
+            continue
+        other = boxes2[cand]
+        mask = ((other[:, 3] >= box[0]) &
+                (other[:, 1] <= box[4]) & (other[:, 4] >= box[1]) &
+                (other[:, 2] <= box[5]) & (other[:, 5] >= box[2]))
+        for j in sorted(cand[mask].tolist()):
+            pairs.append((i, j))
+    return pairs
@@ -18,17 +18,19 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
 from math import sqrt
 
+from numpy import array, float64, ones
+from numpy.linalg import norm
 from OCC.Core.Extrema import (Extrema_ExtPC, Extrema_ExtCC, Extrema_POnCurv,
                           Extrema_ExtPS, Extrema_ExtCS, Extrema_POnSurf)
 from OCC.Core.GeomProjLib import geomprojlib
 
 from afem.adaptor.entities import AdaptorCurve, AdaptorSurface
 from afem.geometry.check import CheckGeom
-from afem.geometry.entities import Curve, Line
+from afem.geometry.entities import Curve, Line, PointArray, Surface
 
 __all__ = ["PointProjector", "ProjectPointToCurve",
-           "ProjectPointToSurface", "CurveProjector", "ProjectCurveToPlane",
-           "ProjectCurveToSurface"]
+           "ProjectPointToSurface", "ProjectPointsToSurface",
+           "CurveProjector", "ProjectCurveToPlane", "ProjectCurveToSurface"]
 
 
 class PointProjector(object):
@@ -250,6 +252,90 @@ class ProjectPointToSurface(PointProjector):
             pnt.set_xyz(self.nearest_point)
 
 
+class ProjectPointsToSurface(object):
+    """
+    Project many points to a surface in a batch. The solver is initialized
+    once per surface and each solve is warm-started from the previous solution
+    or a coarse grid of samples on the surface. Only the nearest result is
+    computed for each point.
+
+    A point is considered projected if it lies on the surface or the
+    segment to its nearest point is orthogonal to the surface. Otherwise the
+    nearest point was found on a boundary of the surface and the status of
+    the point is *False*, which is where :class:`.ProjectPointToSurface`
+    would find no solution.
+
+    :param pnts: Points to project.
+    :type pnts: afem.geometry.entities.PointArray or
+        list(afem.geometry.entities.Point) or array_like
+    :param srf: Surface to project to. If a face is given its underlying
+        surface is used.
+    :type srf: afem.geometry.entities.Surface or afem.topology.entities.Face
+    :param float tol: Tolerance.
+    :param bool update: Option to update the location of the points to match
+        the nearest points. Only applies if *pnts* is a
+        :class:`.PointArray` or a list of points.
+    """
+
+    def __init__(self, pnts, srf, tol=1.0e-7, update=False):
+        if not isinstance(srf, Surface):
+            srf = srf.surface
+
+        self._uv, xyz, self._d = srf.project_points(pnts, tol)
+        self._pnts = PointArray(xyz)
+        self._status = _orthogonal(srf, PointArray(pnts).xyz, xyz, self._uv,
+                                   self._d, tol)
+
+        if update:
+            if isinstance(pnts, PointArray):
+                pnts.xyz[:] = xyz
+            else:
+                for p, xyz_i in zip(pnts, xyz.tolist()):
+                    p.set_xyz(xyz_i)
+
+    @property
+    def npts(self):
+        """
+        :return: Number of projected points.
+        :rtype: int
+        """
+        return len(self._d)
+
+    @property
+    def status(self):
+        """
+        :return: The status of each point. *True* if the point was projected
+            and *False* if not.
+        :rtype: numpy.ndarray
+        """
+        return self._status
+
+    @property
+    def parameters(self):
+        """
+        :return: The (u, v) parameters of the nearest points as an (n, 2)
+            array.
+        :rtype: numpy.ndarray
+        """
+        return self._uv
+
+    @property
+    def points(self):
+        """
+        :return: The nearest points.
+        :rtype: afem.geometry.entities.PointArray
+        """
+        return self._pnts
+
+    @property
+    def distances(self):
+        """
+        :return: The projection distances.
+        :rtype: numpy.ndarray
+        """
+        return self._d
+
+
 class CurveProjector(object):
     """
     Base class for curve projections.
@@ -319,3 +405,26 @@ class ProjectCurveToSurface(CurveProjector):
         # OCC projection
         hcrv = geomprojlib.Project(crv.object, srf.object)
         self._crv = Curve(hcrv)
+
+
+def _orthogonal(srf, xyz, pnts, uv, dist, tol, angular_tol=1.0e-5):
+    """
+    Check that the segment from each point to its nearest point on the
+    surface is orthogonal to the surface.
+    """
+    status = dist <= tol
+    indx = (~status).nonzero()[0]
+    if indx.size == 0:
+        return status
+
+    r = (xyz[indx] - pnts[indx]) / dist[indx, None]
+    ok = ones(indx.size, dtype=bool)
+    for nu, nv in [(1, 0), (0, 1)]:
+        d = array([srf.deriv(u, v, nu, nv).xyz for u, v in
+                   uv[indx].tolist()], dtype=float64)
+        mag = norm(d, axis=1)
+        nz = mag > 0.
+        cos = abs((r[nz] * d[nz]).sum(axis=1)) / mag[nz]
+        ok[nz] &= cos <= angular_tol
+    status[indx] = ok
+    return status
@@ -19,7 +19,8 @@
 from __future__ import division, division
 
 from OCC.Core.BSplCLib import bsplclib
-from numpy import array, diff, float64, floor, hstack, sqrt, sum, zeros
+from numpy import (array, concatenate, diff, float64, floor, hstack, sqrt,
+                   sum, zeros)
 from numpy.linalg import norm
 
 
@@ -70,13 +71,8 @@ def homogenize_array1d(cp, w):
 
 
 def homogenize_array2d(cp, w):
-    n, m, _ = cp.shape
-    cpw = zeros((n, m, 4), dtype=float)
-    for i in range(n):
-        for j in range(m):
-            cpw[i, j, :3] = cp[i, j] * w[i, j]
-            cpw[i, j, 3] = w[i, j]
-    return cpw
+    _w = w[:, :, None]
+    return concatenate((cp * _w, _w), axis=2)
 
 
 def dehomogenize_array1d(cpw):
@@ -86,12 +82,8 @@ def dehomogenize_array1d(cpw):
 
 
 def dehomogenize_array2d(cpw):
-    cp = cpw[:, :, :3]
     w = cpw[:, :, -1]
-    n, m = cp.shape[0:2]
-    for i in range(n):
-        for j in range(m):
-            cp[i, j] /= w[i, j]
+    cp = cpw[:, :, :3] / w[:, :, None]
     return cp, w
 
 
@@ -21,6 +21,7 @@ import os
 from afem.base.entities import ViewableItem
 #from afem.smesh.entities import Mesh, SubMesh, MeshGroup
 from afem.structure.group import Group
+from afem.topology.tessellate import TessellationCache
 #from afem.structure.mesh import MeshVehicle
 
 
@@ -88,6 +89,7 @@ class BasicViewer(wx.Frame):
         self.SetIcon(ico)
 
         # Store some defaults
+        self._deflection = None
         self._x0, self._y0 = 0., 0.
         self._black = Quantity_Color(Quantity_NOC_BLACK)
 
@@ -244,6 +246,17 @@ class BasicViewer(wx.Frame):
         self._my_view.ZFitAll()
         self._my_view.Redraw()
 
+    def set_deflection(self, deflection):
+        """
+        Set the deflection used to tessellate displayed shapes. Shapes are
+        then tessellated through :class:`.TessellationCache` so the result
+        is shared with other users of the cache.
+        :param float deflection: The relative deflection. If *None* then the
+            viewer tessellates shapes itself.
+        :return: None.
+        """
+        self._deflection = deflection
+
     def display_ais(self, ais_shape, update=True):
         """
         Display an AIS_Shape.
@@ -253,7 +266,8 @@ class BasicViewer(wx.Frame):
         """
         self._my_context.Display(ais_shape, update)
 
-    def display_shape(self, shape, rgb=None, transparency=None, material=None):
+    def display_shape(self, shape, rgb=None, transparency=None, material=None,
+                      deflection=None):
         """
         Display a shape.
         :param OCC.Core.TopoDS.TopoDS_Shape shape: The shape.
@@ -261,11 +275,20 @@ class BasicViewer(wx.Frame):
         :type rgb: collections.Sequence(float) or OCC.Core.Quantity.Quantity_Color
         :param float transparency: The transparency (0 to 1).
         :param OCC.Core.Graphic3d.Graphic3d_NameOfMaterial material: The material.
+        :param float deflection: The relative deflection used to tessellate
+            the shape through :class:`.TessellationCache`. If not provided
+            then the viewer deflection is used.
         :return: The AIS_Shape created for the part.
         :rtype: OCC.Core.AIS.AIS_Shape
         """
         ais_shape = AIS_Shape(shape)
 
+        if deflection is None:
+            deflection = self._deflection
+        if deflection is not None:
+            TessellationCache.get(shape, deflection)
+            ais_shape.Attributes().SetAutoTriangulation(False)
+
         if isinstance(rgb, (tuple, list)):
             r, g, b = rgb
             if r > 1.:
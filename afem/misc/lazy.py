@@ -0,0 +1,102 @@
+# This file is part of AFEM which provides an engineering toolkit for airframe
+# finite element modeling during conceptual design.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC (info@laughlinresearch.com)
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import ast
+import os
+import sys
+from importlib import import_module
+
+__all__ = ["lazy_package"]
+
+
+def lazy_package(package, submodules):
+    """
+    Set up a package so that the public names of its submodules are imported
+    on first access rather than when the package is imported. This is
+    equivalent to ``from package.submodule import *`` for each submodule, but
+    defers loading OpenCASCADE and SMESH until they are needed.
+
+    The public names of each submodule are read from its ``__all__`` list
+    without importing it. If a name is exported by more than one submodule,
+    the last one wins, as it would with star imports. Before Python 3.7 the
+    submodules are imported immediately.
+
+    Usage in a package ``__init__.py``:
+
+    >>> __getattr__, __dir__, __all__ = lazy_package(__name__, ['entities'])
+
+    :param str package: The package name (i.e., ``__name__``).
+    :param list(str) submodules: The submodule names in import order.
+
+    :return: The module level ``__getattr__`` and ``__dir__`` functions and
+        the ``__all__`` list.
+    :rtype: tuple(collections.Callable, collections.Callable, list(str))
+
+    :raise ValueError: If a submodule does not define a literal ``__all__``.
+    """
+    path = os.path.dirname(sys.modules[package].__file__)
+
+    name_to_module = {}
+    for submodule in submodules:
+        fn = os.path.join(path, submodule + '.py')
+        for name in _read_all(fn):
+            name_to_module[name] = submodule
+    all_ = sorted(name_to_module)
+
+    # Module level __getattr__ requires Python 3.7 (PEP 562), so import
+    # everything up front on older versions.
+    if sys.version_info < (3, 7):
+        module = sys.modules[package]
+        for submodule in submodules:
+            sub = import_module('.'.join([package, submodule]))
+            for name in _read_all(os.path.join(path, submodule + '.py')):
+                setattr(module, name, getattr(sub, name))
+
+    submodules = set(submodules)
+
+    def __getattr__(name):
+        if name in name_to_module:
+            module = import_module('.'.join([package, name_to_module[name]]))
+            value = getattr(module, name)
+        elif name in submodules:
+            value = import_module('.'.join([package, name]))
+        else:
+            msg = 'module {!r} has no attribute {!r}'.format(package, name)
+            raise AttributeError(msg)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(all_) | submodules)
+
+    return __getattr__, __dir__, all_
+
+
+def _read_all(fn):
+    """
+    Read the ``__all__`` list of a module from its source without importing
+    it.
+    """
+    with open(fn, 'r') as fin:
+        src = fin.read()
+    key = '\n__all__ = ['
+    i = src.find(key)
+    if i < 0:
+        raise ValueError('No __all__ found in {}.'.format(fn))
+    j = src.index(']', i)
+    return ast.literal_eval(src[i + len(key) - 1:j + 1])
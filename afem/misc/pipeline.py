@@ -0,0 +1,218 @@
+# This file is part of AFEM which provides an engineering toolkit for airframe
+# finite element modeling during conceptual design.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC (info@laughlinresearch.com)
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from timeit import default_timer
+
+from afem.config import logger
+from afem.misc.trace import Tracer
+
+__all__ = ["Pipeline", "Stage"]
+
+
+class Stage(object):
+    """
+    A stage of a :class:`.Pipeline`.
+
+    :param str name: The name.
+    :param collections.Callable func: The function.
+    :param tuple args: Positional arguments of the function.
+    :param dict kwargs: Keyword arguments of the function.
+    :param collections.Sequence(str) deps: Names of the stages that must
+        finish first.
+    :param bool background: Option to run the stage on a worker.
+
+    :var str name: The name.
+    :var tuple(str) deps: Names of the stages that must finish first.
+    :var bool background: Option to run the stage on a worker.
+    :var str status: The status ("pending", "done", "failed", or "skipped").
+    :var result: The value returned by the function.
+    :var error: The exception raised by the function, if any.
+    :var float start: Start time in seconds relative to the start of the
+        pipeline.
+    :var float time: Time to run the function in seconds.
+    """
+
+    def __init__(self, name, func, args=(), kwargs=None, deps=(),
+                 background=False):
+        self.name = name
+        self.deps = tuple(deps)
+        self.background = background
+        self.status = 'pending'
+        self.result = None
+        self.error = None
+        self.start = None
+        self.time = None
+        self._func = func
+        self._args = tuple(args)
+        self._kwargs = dict(kwargs or {})
+
+
+class Pipeline(object):
+    """
+    Run stages in the order they are added, except that background stages
+    run on a pool of workers while the main thread continues with the next
+    stages. A stage starts only after the stages it depends on finish, and
+    it is skipped if any of them fail. This is meant to overlap file output
+    like Nastran, STEP, XDE, or STL export with the geometry and mesh work
+    that follows.
+
+    Background stages should only use data that the main thread will not
+    change while they run. For example, gather a mesh into
+    :class:`.MeshArrays` in a foreground stage and write it in a background
+    stage with :func:`.write_bdf`, or pass shapes that later stages replace
+    rather than modify.
+
+    :param int nworkers: Number of workers for background stages.
+    :param bool processes: Option to run background stages in separate
+        processes rather than threads. The functions, arguments, and results
+        must then be picklable so this is only suitable for array data.
+    """
+
+    def __init__(self, nworkers=2, processes=False):
+        self._nworkers = nworkers
+        self._processes = processes
+        self._stages = OrderedDict()
+
+    @property
+    def stages(self):
+        """
+        :return: The stages in the order they were added.
+        :rtype: list(afem.misc.pipeline.Stage)
+        """
+        return list(self._stages.values())
+
+    @property
+    def timings(self):
+        """
+        :return: Dictionary where the key is the stage name and the value is
+            the time in seconds or *None* if the stage did not run.
+        :rtype: collections.OrderedDict
+        """
+        return OrderedDict((s.name, s.time) for s in self._stages.values())
+
+    def add_stage(self, name, func, args=(), kwargs=None, deps=(),
+                  background=False):
+        """
+        Add a stage.
+
+        :param str name: The name. It must be unique.
+        :param collections.Callable func: The function.
+        :param tuple args: Positional arguments of the function.
+        :param dict kwargs: Keyword arguments of the function.
+        :param collections.Sequence(str) deps: Names of the stages that must
+            finish first. They must already be added.
+        :param bool background: Option to run the stage on a worker.
+
+        :return: The stage.
+        :rtype: afem.misc.pipeline.Stage
+
+        :raise ValueError: If the name is already used or a dependency is not
+            found.
+        """
+        if name in self._stages:
+            raise ValueError('A stage named {} already exists.'.format(name))
+        for dep in deps:
+            if dep not in self._stages:
+                msg = 'Dependency {} of stage {} not found.'.format(dep, name)
+                raise ValueError(msg)
+        stage = Stage(name, func, args, kwargs, deps, background)
+        self._stages[name] = stage
+        return stage
+
+    def result(self, name):
+        """
+        Get the result of a stage.
+
+        :param str name: The stage name.
+
+        :return: The value returned by the stage function.
+
+        :raise KeyError: If the stage is not found.
+        """
+        return self._stages[name].result
+
+    def run(self, raise_error=True):
+        """
+        Run the stages and wait for all background stages to finish.
+
+        :param bool raise_error: Option to raise an error if any stage fails
+            or is skipped.
+
+        :return: Dictionary where the key is the stage name and the value is
+            its result.
+        :rtype: collections.OrderedDict
+
+        :raise RuntimeError: If a stage fails or is skipped and *raise_error*
+            is *True*.
+        """
+        t0 = default_timer()
+        futures = {}
+        procs = None
+        if self._processes:
+            procs = ProcessPoolExecutor(self._nworkers)
+        try:
+            with ThreadPoolExecutor(self._nworkers) as threads:
+                for stage in self._stages.values():
+                    deps = [futures[d] for d in stage.deps if d in futures]
+                    if stage.background:
+                        futures[stage.name] = threads.submit(
+                            self._run_stage, stage, deps, t0, procs)
+                    else:
+                        self._run_stage(stage, deps, t0, None)
+        finally:
+            if procs is not None:
+                procs.shutdown()
+
+        failed = [s.name for s in self._stages.values()
+                  if s.status != 'done']
+        if failed and raise_error:
+            msg = 'Pipeline stages failed or skipped: {}'.format(
+                ', '.join(failed))
+            raise RuntimeError(msg)
+        return OrderedDict((s.name, s.result) for s in self._stages.values())
+
+    def _run_stage(self, stage, deps, t0, procs):
+        """
+        Wait for the dependencies and then run the stage.
+        """
+        for future in deps:
+            future.result()
+        for dep in stage.deps:
+            if self._stages[dep].status != 'done':
+                stage.status = 'skipped'
+                logger.warning('Skipping stage {} since {} did not '
+                               'finish.'.format(stage.name, dep))
+                return
+
+        stage.start = default_timer() - t0
+        with Tracer.span('Pipeline.stage', stage=stage.name,
+                         background=stage.background):
+            try:
+                if procs is not None:
+                    stage.result = procs.submit(stage._func, *stage._args,
+                                                **stage._kwargs).result()
+                else:
+                    stage.result = stage._func(*stage._args, **stage._kwargs)
+                stage.status = 'done'
+            except Exception as e:
+                stage.error = e
+                stage.status = 'failed'
+                logger.error('Stage {} failed: {}'.format(stage.name, e))
+        stage.time = default_timer() - t0 - stage.start
@@ -0,0 +1,404 @@
+# This file is part of AFEM which provides an engineering toolkit for airframe
+# finite element modeling during conceptual design.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC (info@laughlinresearch.com)
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import json
+import os
+import threading
+from functools import wraps
+from inspect import signature
+from timeit import default_timer
+
+__all__ = ["Tracer", "TraceSpan", "TracedType", "traced"]
+
+
+class TraceSpan(object):
+    """
+    A single timed span recorded by the :class:`.Tracer`.
+
+    :param str name: The span name.
+    :param dict attrs: Span attributes (e.g., shape counts and tolerances).
+    :param parent: The enclosing span, if any.
+    :type parent: afem.misc.trace.TraceSpan or None
+
+    :var str name: The span name.
+    :var dict attrs: Span attributes.
+    :var float start: Start time in seconds.
+    :var float end: End time in seconds.
+    :var int depth: Nesting depth (0 for a root span).
+    :var int tid: Identifier of the thread that recorded the span.
+    """
+    __slots__ = ('name', 'attrs', 'parent', 'depth', 'start', 'end', 'tid',
+                 '_child_time')
+
+    def __init__(self, name, attrs, parent):
+        self.name = name
+        self.attrs = attrs
+        self.parent = parent
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.start = 0.
+        self.end = 0.
+        self.tid = threading.current_thread().ident
+        self._child_time = 0.
+
+    def __enter__(self):
+        Tracer._push(self)
+        self.start = default_timer()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.end = default_timer()
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+        Tracer._pop(self)
+        return False
+
+    @property
+    def duration(self):
+        """
+        :return: The span duration in seconds.
+        :rtype: float
+        """
+        return self.end - self.start
+
+    @property
+    def self_time(self):
+        """
+        :return: The span duration minus the time spent in child spans.
+        :rtype: float
+        """
+        return self.duration - self._child_time
+
+    def set(self, **attrs):
+        """
+        Add or update span attributes.
+
+        :return: None.
+        """
+        self.attrs.update(attrs)
+
+
+class _NullSpan(object):
+    """
+    Span returned when tracing is disabled. It is falsy so that callers can
+    skip computing attributes with ``if span: ...``.
+    """
+    __slots__ = ()
+
+    def __bool__(self):
+        return False
+
+    __nonzero__ = __bool__
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_null_span = _NullSpan()
+
+
+class Tracer(object):
+    """
+    Global tracer for timing hot paths. Tracing is disabled by default, in
+    which case :meth:`.Tracer.span` returns a shared no-op span.
+
+    Usage:
+
+    >>> from afem.misc.trace import Tracer
+    >>> Tracer.enable()
+    >>> with Tracer.span('my step', n=10) as span:
+    ...     span.set(result=1)
+    >>> print(Tracer.summary())
+    >>> Tracer.to_chrome('afem.trace.json')
+
+    :var bool enabled: Option indicating if tracing is enabled.
+    """
+    enabled = False
+
+    _spans = []
+    _lock = threading.Lock()
+    _local = threading.local()
+
+    @classmethod
+    def enable(cls, clear=True):
+        """
+        Enable tracing.
+
+        :param bool clear: Option to clear previously recorded spans.
+
+        :return: None.
+        """
+        if clear:
+            cls.clear()
+        cls.enabled = True
+
+    @classmethod
+    def disable(cls):
+        """
+        Disable tracing. Recorded spans are kept.
+
+        :return: None.
+        """
+        cls.enabled = False
+
+    @classmethod
+    def clear(cls):
+        """
+        Clear all recorded spans.
+
+        :return: None.
+        """
+        with cls._lock:
+            del cls._spans[:]
+
+    @classmethod
+    def spans(cls):
+        """
+        :return: Copy of the completed spans in the order they finished.
+        :rtype: list(afem.misc.trace.TraceSpan)
+        """
+        with cls._lock:
+            return list(cls._spans)
+
+    @classmethod
+    def span(cls, name, **attrs):
+        """
+        Create a span to be used as a context manager.
+
+        :param str name: The span name.
+        :param attrs: Span attributes.
+
+        :return: The span. This is a falsy no-op span if tracing is disabled.
+        :rtype: afem.misc.trace.TraceSpan
+        """
+        if not cls.enabled:
+            return _null_span
+        return TraceSpan(name, attrs, cls._current())
+
+    @classmethod
+    def summary(cls, sort_by='total'):
+        """
+        Build a summary table of the recorded spans grouped by name.
+
+        :param str sort_by: Column to sort by ('total', 'self', 'count',
+            'mean', 'max', or 'name').
+
+        :return: The summary table.
+        :rtype: str
+
+        :raise KeyError: If *sort_by* is not a supported column.
+        """
+        stats = {}
+        for s in cls.spans():
+            row = stats.setdefault(s.name, [s.name, 0, 0., 0., 0.])
+            row[1] += 1
+            row[2] += s.duration
+            row[3] += s.self_time
+            row[4] = max(row[4], s.duration)
+
+        keys = {'name': lambda r: r[0],
+                'count': lambda r: -r[1],
+                'total': lambda r: -r[2],
+                'self': lambda r: -r[3],
+                'mean': lambda r: -r[2] / r[1],
+                'max': lambda r: -r[4]}
+        rows = sorted(stats.values(), key=keys[sort_by])
+
+        width = max([len(r[0]) for r in rows] + [4])
+        head = '{:<{w}}  {:>7}' + '  {:>11}' * 4
+        line = '{:<{w}}  {:>7d}' + '  {:>11.6f}' * 4
+        lines = [head.format('Span', 'Count', 'Total (s)', 'Self (s)',
+                             'Mean (s)', 'Max (s)', w=width)]
+        lines.append('-' * len(lines[0]))
+        for name, n, total, self_, max_ in rows:
+            lines.append(line.format(name, n, total, self_, total / n, max_,
+                                     w=width))
+        return '\n'.join(lines)
+
+    @classmethod
+    def to_chrome(cls, fn):
+        """
+        Write the recorded spans as a Chrome trace file. The file can be
+        viewed in ``chrome://tracing`` or Perfetto.
+
+        :param str fn: The filename.
+
+        :return: None.
+        """
+        pid = os.getpid()
+        events = []
+        for s in cls.spans():
+            events.append({'name': s.name,
+                           'cat': 'afem',
+                           'ph': 'X',
+                           'ts': s.start * 1.e6,
+                           'dur': s.duration * 1.e6,
+                           'pid': pid,
+                           'tid': s.tid,
+                           'args': _jsonable(s.attrs)})
+        events.sort(key=lambda e: e['ts'])
+        with open(fn, 'w') as fout:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, fout)
+
+    @classmethod
+    def to_json(cls, fn):
+        """
+        Write the recorded spans to a JSON file as a list of records with
+        name, start, duration, depth, parent, thread, and attributes.
+
+        :param str fn: The filename.
+
+        :return: None.
+        """
+        spans = cls.spans()
+        index = dict((id(s), i) for i, s in enumerate(spans))
+        records = []
+        for s in spans:
+            parent = None
+            if s.parent is not None:
+                parent = index.get(id(s.parent))
+            records.append({'name': s.name,
+                            'start': s.start,
+                            'duration': s.duration,
+                            'self_time': s.self_time,
+                            'depth': s.depth,
+                            'parent': parent,
+                            'tid': s.tid,
+                            'attrs': _jsonable(s.attrs)})
+        with open(fn, 'w') as fout:
+            json.dump(records, fout, indent=1)
+
+    @classmethod
+    def _stack(cls):
+        try:
+            return cls._local.stack
+        except AttributeError:
+            cls._local.stack = []
+            return cls._local.stack
+
+    @classmethod
+    def _current(cls):
+        stack = cls._stack()
+        return stack[-1] if stack else None
+
+    @classmethod
+    def _push(cls, span):
+        cls._stack().append(span)
+
+    @classmethod
+    def _pop(cls, span):
+        stack = cls._stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+        if span.parent is not None:
+            span.parent._child_time += span.duration
+        with cls._lock:
+            cls._spans.append(span)
+
+
+def traced(name=None, attrs=None):
+    """
+    Decorator that records a span around each call of a function when
+    tracing is enabled.
+
+    :param str name: The span name. If not provided the qualified name of
+        the function is used.
+    :param attrs: Span attributes. Either a sequence of parameter names whose
+        values are recorded, or a function called with the same arguments as
+        the decorated function that returns a dictionary. They are only
+        evaluated when tracing is enabled.
+    :type attrs: collections.Sequence(str) or collections.Callable or None
+
+    :return: The decorator.
+    """
+
+    def decorator(func):
+        label = name
+        if label is None:
+            label = getattr(func, '__qualname__', func.__name__)
+
+        get_attrs = attrs
+        if attrs is not None and not callable(attrs):
+            get_attrs = _param_getter(func, attrs)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not Tracer.enabled:
+                return func(*args, **kwargs)
+            span_attrs = {}
+            if get_attrs is not None:
+                span_attrs = get_attrs(*args, **kwargs)
+            with TraceSpan(label, span_attrs, Tracer._current()):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class TracedType(type):
+    """
+    Metaclass that records a span around the construction of each instance
+    when tracing is enabled. The span is named after the instantiated class
+    so nested base class initializers are not double counted. If the instance
+    defines a ``_trace_attrs()`` method, its dictionary is added to the span
+    after construction.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        if not Tracer.enabled:
+            return type.__call__(cls, *args, **kwargs)
+        with TraceSpan(cls.__name__, {}, Tracer._current()) as span:
+            obj = type.__call__(cls, *args, **kwargs)
+            if hasattr(obj, '_trace_attrs'):
+                span.set(**obj._trace_attrs())
+            return obj
+
+
+def _param_getter(func, names):
+    """
+    Build a function that returns the values of the named parameters of
+    *func* for a given call.
+    """
+    sig = signature(func)
+    names = tuple(names)
+
+    def get(*args, **kwargs):
+        bound = sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return dict((key, bound.arguments[key]) for key in names)
+
+    return get
+
+
+def _jsonable(attrs):
+    """
+    Convert attribute values to types supported by JSON.
+    """
+    out = {}
+    for key, value in attrs.items():
+        if value is None or isinstance(value, (bool, int, float, str)):
+            out[key] = value
+        else:
+            out[key] = str(value)
+    return out
@@ -16,6 +16,8 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with this library; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+from itertools import chain
+
 from OCC.Core.TColStd import (TColStd_Array1OfInteger, TColStd_Array1OfReal,
                           TColStd_Array2OfReal, TColStd_HSequenceOfReal)
 from OCC.Core.TColgp import (TColgp_Array1OfPnt, TColgp_Array1OfPnt2d,
@@ -23,7 +25,7 @@ from OCC.Core.TColgp import (TColgp_Array1OfPnt, TColgp_Array1OfPnt2d,
                          TColgp_HArray1OfPnt2d)
 from OCC.Core.TopoDS import TopoDS_ListOfShape
 from OCC.Core.gp import gp_Pnt, gp_Pnt2d
-from numpy import array as np_array, zeros
+from numpy import asarray, fromiter, float64
 
 from afem.misc.utils import is_array_like
 
@@ -50,100 +52,132 @@ def to_gp_pnt2d(p):
     return None
 
 
-def to_tcolgp_array1_pnt(pnts):
+def _as_coords(pnts, dim):
     """
-    Convert the 1-D array of point_like entities to OCC data.
+    Return the points as a list of coordinate lists if they are stored in a
+    numeric array of shape (n, dim), otherwise return *None*. This lets bulk
+    data skip the per-item type checks.
+    """
+    if isinstance(pnts, (gp_Pnt, gp_Pnt2d)) or not hasattr(pnts, '__array__'):
+        return None
+    try:
+        xyz = asarray(pnts, dtype=float64)
+    except (TypeError, ValueError):
+        return None
+    if xyz.ndim != 2 or xyz.shape[1] != dim:
+        return None
+    return xyz.tolist()
 
-    :param array_like pnts: Array of points to convert.
 
-    :return: OCC array of points.
-    :rtype: TColgp_Array1OfPnt
+def _filter_points(pnts, to_gp):
+    """
+    Convert each point_like entity and skip those that cannot be converted.
     """
     gp_pnts = []
     for gp in pnts:
-        gp = to_gp_pnt(gp)
+        gp = to_gp(gp)
         if not gp:
             continue
         gp_pnts.append(gp)
+    return gp_pnts
 
-    n = len(gp_pnts)
-    array = TColgp_Array1OfPnt(1, n)
-    for i, gp in enumerate(gp_pnts, 1):
-        array.SetValue(i, gp)
 
+def _fill_array1_pnt(array, pnts, gp_type, coords):
+    """
+    Fill a 1-D OCC array of points.
+    """
+    set_value = array.SetValue
+    if coords is not None:
+        for i, xyz in enumerate(coords, 1):
+            set_value(i, gp_type(*xyz))
+    else:
+        for i, gp in enumerate(pnts, 1):
+            set_value(i, gp)
     return array
 
 
+def to_tcolgp_array1_pnt(pnts):
+    """
+    Convert the 1-D array of point_like entities to OCC data. If *pnts* is a
+    numeric array of shape (n, 3) the points are transferred in bulk without
+    per-item checks.
+
+    :param array_like pnts: Array of points to convert.
+
+    :return: OCC array of points.
+    :rtype: TColgp_Array1OfPnt
+    """
+    coords = _as_coords(pnts, 3)
+    if coords is None:
+        pnts = _filter_points(pnts, to_gp_pnt)
+        n = len(pnts)
+    else:
+        n = len(coords)
+    array = TColgp_Array1OfPnt(1, n)
+    return _fill_array1_pnt(array, pnts, gp_Pnt, coords)
+
+
 def to_tcolgp_array1_pnt2d(pnts):
     """
-    Convert the 1-D array of point_like entities to OCC data.
+    Convert the 1-D array of point_like entities to OCC data. If *pnts* is a
+    numeric array of shape (n, 2) the points are transferred in bulk without
+    per-item checks.
 
     :param array_like pnts: Array of points to convert.
 
     :return: OCC array of points.
     :rtype: TColgp_Array1OfPnt2d
     """
-    gp_pnts = []
-    for gp in pnts:
-        gp = to_gp_pnt2d(gp)
-        if not gp:
-            continue
-        gp_pnts.append(gp)
-
-    n = len(gp_pnts)
+    coords = _as_coords(pnts, 2)
+    if coords is None:
+        pnts = _filter_points(pnts, to_gp_pnt2d)
+        n = len(pnts)
+    else:
+        n = len(coords)
     array = TColgp_Array1OfPnt2d(1, n)
-    for i, gp in enumerate(gp_pnts, 1):
-        array.SetValue(i, gp)
-
-    return array
+    return _fill_array1_pnt(array, pnts, gp_Pnt2d, coords)
 
 
 def to_tcolgp_harray1_pnt(pnts):
     """
-    Convert the 1-D array of point_like entities to OCC data.
+    Convert the 1-D array of point_like entities to OCC data. If *pnts* is a
+    numeric array of shape (n, 3) the points are transferred in bulk without
+    per-item checks.
 
     :param array_like pnts: Array of points to convert.
 
     :return: OCC array of points.
     :rtype: TColgp_HArray1OfPnt
     """
-    gp_pnts = []
-    for gp in pnts:
-        gp = to_gp_pnt(gp)
-        if not gp:
-            continue
-        gp_pnts.append(gp)
-
-    n = len(gp_pnts)
+    coords = _as_coords(pnts, 3)
+    if coords is None:
+        pnts = _filter_points(pnts, to_gp_pnt)
+        n = len(pnts)
+    else:
+        n = len(coords)
     harray = TColgp_HArray1OfPnt(1, n)
-    for i, gp in enumerate(gp_pnts, 1):
-        harray.SetValue(i, gp)
-
-    return harray
+    return _fill_array1_pnt(harray, pnts, gp_Pnt, coords)
 
 
 def to_tcolgp_harray1_pnt2d(pnts):
     """
-    Convert the 1-D array of point2d_like entities to OCC data.
+    Convert the 1-D array of point2d_like entities to OCC data. If *pnts* is a
+    numeric array of shape (n, 2) the points are transferred in bulk without
+    per-item checks.
 
     :param point2d_like pnts: Array of 2-D points to convert.
 
     :return: OCC array of points.
     :rtype: TColgp_HArray1OfPnt2d
     """
-    gp_pnts = []
-    for gp in pnts:
-        gp = to_gp_pnt2d(gp)
-        if not gp:
-            continue
-        gp_pnts.append(gp)
-
-    n = len(gp_pnts)
+    coords = _as_coords(pnts, 2)
+    if coords is None:
+        pnts = _filter_points(pnts, to_gp_pnt2d)
+        n = len(pnts)
+    else:
+        n = len(coords)
     harray = TColgp_HArray1OfPnt2d(1, n)
-    for i, gp in enumerate(gp_pnts, 1):
-        harray.SetValue(i, gp)
-
-    return harray
+    return _fill_array1_pnt(harray, pnts, gp_Pnt2d, coords)
 
 
 def to_tcolstd_array1_real(array):
@@ -155,11 +189,12 @@ def to_tcolstd_array1_real(array):
     :return: OCC array of floats.
     :rtype: TColStd_Array1OfReal
     """
-    flts = [float(x) for x in array]
+    flts = asarray(array, dtype=float64).ravel().tolist()
     n = len(flts)
     array = TColStd_Array1OfReal(1, n)
+    set_value = array.SetValue
     for i, x in enumerate(flts, 1):
-        array.SetValue(i, x)
+        set_value(i, x)
 
     return array
 
@@ -176,8 +211,9 @@ def to_tcolstd_array1_integer(array):
     ints = [int(x) for x in array]
     n = len(ints)
     array = TColStd_Array1OfInteger(1, n)
+    set_value = array.SetValue
     for i, x in enumerate(ints, 1):
-        array.SetValue(i, x)
+        set_value(i, x)
 
     return array
 
@@ -191,20 +227,14 @@ def to_tcolgp_array2_pnt(pnts):
     :return: OCC array of points.
     :rtype: TColgp_Array2OfPnt
     """
-    pnts = np_array(pnts, dtype=float)
+    pnts = asarray(pnts, dtype=float64)
     n, m = pnts.shape[0:2]
-    gp_pnts = []
-    for i in range(0, n):
-        row = []
-        for j in range(0, m):
-            gp = to_gp_pnt(pnts[i, j])
-            row.append(gp)
-        gp_pnts.append(row)
 
     array = TColgp_Array2OfPnt(1, n, 1, m)
-    for i, row in enumerate(gp_pnts, 1):
-        for j, gp in enumerate(row, 1):
-            array.SetValue(i, j, gp)
+    set_value = array.SetValue
+    for i, row in enumerate(pnts.tolist(), 1):
+        for j, xyz in enumerate(row, 1):
+            set_value(i, j, gp_Pnt(*xyz))
 
     return array
 
@@ -233,13 +263,13 @@ def to_tcolstd_array2_real(array):
     :return: OCC array of floats.
     :rtype: TColStd_Array2OfReal
     """
-    flts = np_array(array, dtype=float)
+    flts = asarray(array, dtype=float64)
     n, m = flts.shape
     array = TColStd_Array2OfReal(1, n, 1, m)
-    for i in range(1, n + 1):
-        for j in range(1, m + 1):
-            x = float(flts[i - 1, j - 1])
-            array.SetValue(i, j, x)
+    set_value = array.SetValue
+    for i, row in enumerate(flts.tolist(), 1):
+        for j, x in enumerate(row, 1):
+            set_value(i, j, x)
 
     return array
 
@@ -254,12 +284,10 @@ def to_np_from_tcolstd_array1_real(tcol_array):
     :return: NumPy array of floats.
     :rtype: ndarray
     """
-    n = tcol_array.Length()
-    array = zeros(n, dtype=float)
-    for i in range(n):
-        x = tcol_array.Value(i + 1)
-        array[i] = x
-    return array
+    i1, i2 = tcol_array.Lower(), tcol_array.Upper()
+    value = tcol_array.Value
+    return fromiter((value(i) for i in range(i1, i2 + 1)), dtype=float64,
+                    count=i2 - i1 + 1)
 
 
 def to_np_from_tcolstd_array1_integer(tcol_array):
@@ -272,12 +300,10 @@ def to_np_from_tcolstd_array1_integer(tcol_array):
     :return: NumPy array of integers.
     :rtype: ndarray
     """
-    n = tcol_array.Length()
-    array = zeros(n, dtype=int)
-    for i in range(n):
-        x = tcol_array.Value(i + 1)
-        array[i] = x
-    return array
+    i1, i2 = tcol_array.Lower(), tcol_array.Upper()
+    value = tcol_array.Value
+    return fromiter((value(i) for i in range(i1, i2 + 1)), dtype=int,
+                    count=i2 - i1 + 1)
 
 
 def to_np_from_tcolgp_array1_pnt(tcol_array):
@@ -290,12 +316,11 @@ def to_np_from_tcolgp_array1_pnt(tcol_array):
     :return: NumPy array of points.
     :rtype: ndarray
     """
-    n = tcol_array.Length()
-    array = zeros((n, 3), dtype=float)
-    for i in range(n):
-        p = tcol_array.Value(i + 1)
-        array[i, :] = p.X(), p.Y(), p.Z()
-    return array
+    i1, i2 = tcol_array.Lower(), tcol_array.Upper()
+    n = i2 - i1 + 1
+    value = tcol_array.Value
+    xyz = chain.from_iterable(value(i).Coord() for i in range(i1, i2 + 1))
+    return fromiter(xyz, dtype=float64, count=3 * n).reshape(n, 3)
 
 
 def to_np_from_tcolgp_array2_pnt(tcol_array):
@@ -308,13 +333,14 @@ def to_np_from_tcolgp_array2_pnt(tcol_array):
     :return: NumPy array of points.
     :rtype: ndarray
     """
-    n, m = tcol_array.ColLength(), tcol_array.RowLength()
-    array = zeros((n, m, 3), dtype=float)
-    for i in range(n):
-        for j in range(m):
-            p = tcol_array.Value(i + 1, j + 1)
-            array[i, j, :] = p.X(), p.Y(), p.Z()
-    return array
+    i1, i2 = tcol_array.LowerRow(), tcol_array.UpperRow()
+    j1, j2 = tcol_array.LowerCol(), tcol_array.UpperCol()
+    n, m = i2 - i1 + 1, j2 - j1 + 1
+    value = tcol_array.Value
+    xyz = chain.from_iterable(value(i, j).Coord()
+                              for i in range(i1, i2 + 1)
+                              for j in range(j1, j2 + 1))
+    return fromiter(xyz, dtype=float64, count=3 * n * m).reshape(n, m, 3)
 
 
 def to_np_from_tcolstd_array2_real(tcol_array):
@@ -327,13 +353,12 @@ def to_np_from_tcolstd_array2_real(tcol_array):
     :return: NumPy array of floats.
     :rtype: ndarray
     """
-    n, m = tcol_array.ColLength(), tcol_array.RowLength()
-    array = zeros((n, m), dtype=float)
-    for i in range(n):
-        for j in range(m):
-            x = tcol_array.Value(i + 1, j + 1)
-            array[i, j] = x
-    return array
+    i1, i2 = tcol_array.LowerRow(), tcol_array.UpperRow()
+    j1, j2 = tcol_array.LowerCol(), tcol_array.UpperCol()
+    n, m = i2 - i1 + 1, j2 - j1 + 1
+    value = tcol_array.Value
+    flts = (value(i, j) for i in range(i1, i2 + 1) for j in range(j1, j2 + 1))
+    return fromiter(flts, dtype=float64, count=n * m).reshape(n, m)
 
 
 def to_topods_list(shapes):
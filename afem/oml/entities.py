@@ -37,17 +37,20 @@ class Body(ShapeHolder):
     def __init__(self, shape, name='Body'):
         super(Body, self).__init__(name, shape, expected_types=Solid)
 
-    def mirrored(self, pln, name=None):
+    def mirrored(self, pln, name=None, instance=False):
         """
         Mirror this Body using the plane.
 
         :param afem.geometry.entities.Plane pln: The plane.
         :param str name: The name of the new Body.
+        :param bool instance: If *True*, the new Body will share the shape of
+            this one through a location instead of a copy. It is saved as a
+            reference in :meth:`.save_bodies`.
 
         :return: Mirrored Body.
         :rtype: afem.oml.entities.Body
         """
-        solid = mirror_shape(self.shape, pln)
+        solid = mirror_shape(self.shape, pln, instance)
         body = Body(solid, name)
         if self.sref is not None:
             sref = self.sref.copy()
@@ -79,9 +82,11 @@ class Body(ShapeHolder):
         # Create document
         doc = XdeDocument(binary)
 
-        # Add the bodies
+        # Add the bodies. Instances are added last so that their shapes
+        # reference the non-located shapes.
+        bodies = sorted(bodies, key=lambda b: b.is_instance)
         for body in bodies:
-            label = doc.add_shape(body.shape, body.name, False)
+            label = doc.add_instance(body.shape, body.name)
             label.set_string('Body')
             label.set_color(body.color)
 
@@ -16,6 +16,8 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with this library; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+from numpy import array, asarray, float64, vstack
+
 from afem.geometry.check import CheckGeom
 from afem.geometry.create import (PlaneByAxes, NurbsCurve2DByApprox,
                                   NurbsCurve2DByInterp, NurbsCurve2DByPoints)
@@ -295,17 +297,16 @@ class Airfoil(CrossSection):
             points are organized as described above so they are sorted
             correctly for the approximation.
         """
-        upr = [CheckGeom.to_point2d(p) for p in upr]
-        lwr = [CheckGeom.to_point2d(p) for p in lwr]
+        upr = _to_xy(upr)
+        lwr = _to_xy(lwr)
 
         # Store 2-D LE and TE points
-        self._le2d = upr[0]
-        self._upr_te2d = upr[-1]
-        self._lwr_te2d = lwr[-1]
+        self._le2d = Point2D(*upr[0])
+        self._upr_te2d = Point2D(*upr[-1])
+        self._lwr_te2d = Point2D(*lwr[-1])
 
         # Combine points for approximation
-        upr.reverse()
-        pnts = upr + lwr[1:]
+        pnts = vstack((upr[::-1], lwr[1:]))
 
         self.clear()
         return self.add_approx(pnts, close)
@@ -341,7 +342,7 @@ class Airfoil(CrossSection):
                 break
             x = float(line[0])
             z = float(line[1])
-            upr.append(Point2D(x, z))
+            upr.append((x, z))
 
         while i < len(content):
             line = content[i].strip().split()
@@ -350,7 +351,7 @@ class Airfoil(CrossSection):
                 break
             x = float(line[0])
             z = float(line[1])
-            lwr.append(Point2D(x, z))
+            lwr.append((x, z))
 
         return self.approx_points(upr, lwr, close)
 
@@ -396,3 +397,16 @@ class Airfoil(CrossSection):
             c3d.rotate(axis, rotate)
 
         return c3d
+
+
+def _to_xy(pnts):
+    """
+    Convert the 2-D points to an (n, 2) array.
+    """
+    try:
+        xy = asarray(pnts, dtype=float64)
+        if xy.ndim == 2 and xy.shape[1] == 2:
+            return xy
+    except (TypeError, ValueError):
+        pass
+    return array([CheckGeom.to_point2d(p).xy for p in pnts], dtype=float64)
@@ -16,6 +16,8 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with this library; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
-from afem.smesh.entities import *
-from afem.smesh.hypotheses import *
-from afem.smesh.utils import *
+from afem.misc.lazy import lazy_package
+
+# Public names are imported from the submodules on first access
+__getattr__, __dir__, __all__ = lazy_package(
+    __name__, ['entities', 'hypotheses', 'utils'])
@@ -18,16 +18,18 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
 from __future__ import division
 
-from numpy import array, cross, linalg
+from numpy import (array, asarray, concatenate, cross, fromiter,
+                   int64, intersect1d, isin, linalg, setdiff1d, unique)
 
 from afem.geometry.entities import Point
+from afem.misc.trace import Tracer
 from afem.topology.entities import Shape
 
 __all__ = ["Node", "Element", "FaceSide",
            "MeshGen",
            "Mesh", "MeshDS",
            "SubMesh", "SubMeshDS",
-           "MeshGroup"
+           "MeshGroup", "MeshIdSet"
            ]
 
 
@@ -520,13 +522,15 @@ class FaceSide(object):
 
 class MeshGen(object):
     """
-    This class is the primary meshing database for a given instance.
+    This class is the primary meshing database for a given instance. It also
+    keeps a registry of shared hypotheses (see :meth:`.hypothesis`).
     """
 
     def __init__(self):
         from OCC.Core.SMDSAbs import SMDSAbs_ElementType
         from OCC.Core.SMESH import SMESH_Gen, SMESH_subMesh
         self._gen = SMESH_Gen()
+        self._hyps = {}
 
     @property
     def object(self):
@@ -548,8 +552,69 @@ class MeshGen(object):
         """
         new_gen = cls.__new__(cls)
         new_gen._gen = gen
+        new_gen._hyps = {}
         return new_gen
 
+    @property
+    def num_hypotheses(self):
+        """
+        :return: Number of distinct hypotheses and algorithms in the registry.
+        :rtype: int
+        """
+        return len(self._hyps)
+
+    def hypothesis(self, type_, *args, shared=True, **kwargs):
+        """
+        Get a hypothesis or algorithm from the registry. The first time a
+        type is requested with a given set of parameters it is created using
+        ``type_(self, *args, **kwargs)``. After that the same instance is
+        returned so identical controls are shared by all the shapes they are
+        applied to. Parameters that cannot be hashed always create a new
+        instance that is not registered.
+
+        Since a registered instance is shared, changing it (e.g., with
+        :meth:`.QuadrangleHypo2D.set_enforced_nodes`) changes the mesh
+        control of every shape it was applied to. Use *shared=False* to get
+        a new instance for a control that will be changed.
+
+        :param Type(afem.smesh.hypotheses.Hypothesis) type_: The hypothesis
+            type (e.g., :class:`.LocalLength1D`).
+        :param args: The positional parameters after the generator.
+        :param bool shared: Option to get the registered instance. If
+            *False* then a new instance is always created and it is not
+            registered.
+        :param kwargs: The keyword parameters.
+
+        :return: The hypothesis.
+        :rtype: afem.smesh.hypotheses.Hypothesis
+        """
+        if not shared:
+            return type_(self, *args, **kwargs)
+
+        key = (type_, args, tuple(sorted(kwargs.items())))
+        try:
+            return self._hyps[key]
+        except KeyError:
+            hyp = type_(self, *args, **kwargs)
+            self._hyps[key] = hyp
+            return hyp
+        except TypeError:
+            return type_(self, *args, **kwargs)
+
+    def hypothesis_counts(self):
+        """
+        Count the hypotheses and algorithms in the registry by type.
+
+        :return: Dictionary where the key is the type name and the value is
+            the number of distinct instances.
+        :rtype: dict(str, int)
+        """
+        counts = {}
+        for key in self._hyps:
+            name = key[0].__name__
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+
     def new_id(self):
         """
         Generate a new unique ID within this generator.
@@ -604,7 +669,16 @@ class MeshGen(object):
                 shape = mesh.shape
             else:
                 raise ValueError('No shape could be found.')
-        return self._gen.Compute(mesh.object, shape.object)
+
+        with Tracer.span('MeshGen.compute') as span:
+            if span:
+                span.set(shape_type=shape.shape_type,
+                         n_faces=shape.num_faces, n_edges=shape.num_edges)
+            status = self._gen.Compute(mesh.object, shape.object)
+            if span:
+                span.set(status=status, n_nodes=mesh.num_nodes,
+                         n_faces_mesh=mesh.num_faces)
+        return status
 
 
 class Mesh(object):
@@ -792,6 +866,34 @@ class Mesh(object):
             status_dict[hyp] = status
         return status_dict
 
+    def add_hypotheses_to_shapes(self, hypotheses, shapes):
+        """
+        Add the hypotheses to each of the shapes. This is meant to be used
+        with shared hypotheses from :meth:`.MeshGen.hypothesis`.
+
+        :param hypotheses: The hypotheses to add.
+        :type hypotheses:
+            collections.Sequence(afem.smesh.hypotheses.Hypothesis)
+        :param shapes: The shapes the hypotheses apply to. These should be
+            sub-shapes of the master shape.
+        :type shapes: collections.Sequence(afem.topology.entities.Shape)
+
+        :return: List of the shapes where a hypothesis could not be added
+            and its status.
+        :rtype: list(tuple(afem.topology.entities.Shape,
+            OCC.Core.SMESH.SMESH_Hypothesis.Hypothesis_Status))
+        """
+        from OCC.Core.SMESH import SMESH_Hypothesis
+
+        ids = [hyp.id for hyp in hypotheses]
+        failed = []
+        for shape in shapes:
+            for hyp_id in ids:
+                status = self._mesh.AddHypothesis(shape.object, hyp_id)
+                if status != SMESH_Hypothesis.HYP_OK:
+                    failed.append((shape, status))
+        return failed
+
     def clear(self):
         """
         Clear all nodes and elements.
@@ -1466,6 +1568,25 @@ class MeshGroup(object):
         """
         return self._ds.Extent()
 
+    @property
+    def ids(self):
+        """
+        :return: The sorted IDs of the nodes or elements in the group.
+        :rtype: numpy.ndarray
+        """
+        it = self._ds.GetElements()
+        ids = fromiter(_iter_ids(it), int64, self._ds.Extent())
+        ids.sort()
+        return ids
+
+    @property
+    def id_set(self):
+        """
+        :return: The IDs of the group for set algebra.
+        :rtype: afem.smesh.entities.MeshIdSet
+        """
+        return MeshIdSet(self._mesh, self.type, self.ids, True)
+
     @property
     def node_iter(self):
         """
@@ -1574,6 +1695,18 @@ class MeshGroup(object):
 
         return self._ds.Contains(elm.object)
 
+    def contains_ids(self, ids):
+        """
+        Check which of the node or element IDs are in the group.
+
+        :param ids: The IDs.
+        :type ids: collections.Sequence(int) or numpy.ndarray
+
+        :return: Array that is *True* where the ID is in the group.
+        :rtype: numpy.ndarray
+        """
+        return isin(asarray(ids, dtype=int64), self.ids)
+
     def union(self, other, name='union group'):
         """
         Union the entities of this group with another.
@@ -1592,16 +1725,7 @@ class MeshGroup(object):
         if self.mesh.id != other.mesh.id:
             raise TypeError('Groups do not share the same mesh.')
 
-        # Add elements of each group
-        new_group = MeshGroup(self.mesh, name, self.type)
-        it = self._ds.GetElements()
-        while it.more():
-            new_group._ds.Add(it.next())
-        it = other._ds.GetElements()
-        while it.more():
-            new_group._ds.Add(it.next())
-
-        return new_group
+        return self.id_set.union(other.id_set).to_group(name)
 
     def intersect(self, other, name='intersect group'):
         """
@@ -1621,15 +1745,7 @@ class MeshGroup(object):
         if self.mesh.id != other.mesh.id:
             raise TypeError('Groups do not share the same mesh.')
 
-        # Add elements of first group if they are in other
-        new_group = MeshGroup(self.mesh, name, self.type)
-        it = self._ds.GetElements()
-        while it.more():
-            e = it.next()
-            if other._ds.Contains(e):
-                new_group._ds.Add(e)
-
-        return new_group
+        return self.id_set.intersect(other.id_set).to_group(name)
 
     def subtract(self, other, name='Subtract group'):
         """
@@ -1649,12 +1765,222 @@ class MeshGroup(object):
         if self.mesh.id != other.mesh.id:
             raise TypeError('Groups do not share the same mesh.')
 
-        # Add elements of first group if they are not in other
-        new_group = MeshGroup(self.mesh, name, self.type)
-        it = self._ds.GetElements()
-        while it.more():
-            e = it.next()
-            if not other._ds.Contains(e):
-                new_group._ds.Add(e)
+        return self.id_set.subtract(other.id_set).to_group(name)
+
+
+class MeshIdSet(object):
+    """
+    Sorted unique node or element IDs of a mesh for set algebra. The
+    operations work on the ID arrays and can take any number of sets at
+    once. A mesh group is only created from the result when
+    :meth:`.to_group` is called, so building many intermediate sets (e.g.,
+    for loads and boundary conditions) is fast on large meshes. Use
+    :attr:`.MeshGroup.id_set` to get the IDs of a group.
+
+    :param afem.smesh.entities.Mesh mesh: The mesh.
+    :param OCC.Core.SMDSAbs.SMDSAbs_ElementType type_: The entity type.
+    :param ids: The IDs.
+    :type ids: collections.Sequence(int) or numpy.ndarray
+    :param bool is_sorted: Option to skip sorting and removing duplicates
+        if the IDs are known to be sorted and unique.
+    """
+
+    def __init__(self, mesh, type_, ids=(), is_sorted=False):
+        ids = asarray(ids, dtype=int64)
+        if not is_sorted:
+            ids = unique(ids)
+        self._mesh = mesh
+        self._type = type_
+        self._ids = ids
+
+    def __len__(self):
+        return self._ids.size
+
+    def __contains__(self, eid):
+        i = self._ids.searchsorted(eid)
+        return bool(i < self._ids.size and self._ids[i] == eid)
+
+    def __or__(self, other):
+        return self.union(other)
+
+    def __and__(self, other):
+        return self.intersect(other)
+
+    def __sub__(self, other):
+        return self.subtract(other)
+
+    @property
+    def mesh(self):
+        """
+        :return: The mesh.
+        :rtype: afem.smesh.entities.Mesh
+        """
+        return self._mesh
+
+    @property
+    def type(self):
+        """
+        :return: The entity type.
+        :rtype: OCC.Core.SMDSAbs.SMDSAbs_ElementType
+        """
+        return self._type
+
+    @property
+    def ids(self):
+        """
+        :return: The sorted IDs.
+        :rtype: numpy.ndarray
+        """
+        return self._ids
+
+    @property
+    def size(self):
+        """
+        :return: The number of IDs.
+        :rtype: int
+        """
+        return self._ids.size
+
+    @property
+    def is_empty(self):
+        """
+        :return: *True* if there are no IDs, *False* otherwise.
+        :rtype: bool
+        """
+        return self._ids.size == 0
+
+    def contains(self, ids):
+        """
+        Check which of the IDs are in the set.
+
+        :param ids: The IDs.
+        :type ids: collections.Sequence(int) or numpy.ndarray
+
+        :return: Array that is *True* where the ID is in the set.
+        :rtype: numpy.ndarray
+        """
+        return isin(asarray(ids, dtype=int64), self._ids)
+
+    def union(self, *others):
+        """
+        Union the IDs of this set with others.
+
+        :param afem.smesh.entities.MeshIdSet others: The other sets.
+
+        :return: New set.
+        :rtype: afem.smesh.entities.MeshIdSet
+
+        :raise TypeError: If the sets are of different type or they do not
+            share the same mesh.
+        """
+        self._check(others)
+        ids = unique(concatenate([self._ids] + [o._ids for o in others]))
+        return MeshIdSet(self._mesh, self._type, ids, True)
+
+    def intersect(self, *others):
+        """
+        Intersect the IDs of this set with others.
+
+        :param afem.smesh.entities.MeshIdSet others: The other sets.
 
-        return new_group
+        :return: New set.
+        :rtype: afem.smesh.entities.MeshIdSet
+
+        :raise TypeError: If the sets are of different type or they do not
+            share the same mesh.
+        """
+        self._check(others)
+        sets = sorted([self._ids] + [o._ids for o in others],
+                      key=lambda x: x.size)
+        ids = sets[0]
+        for other in sets[1:]:
+            ids = intersect1d(ids, other, assume_unique=True)
+        return MeshIdSet(self._mesh, self._type, ids, True)
+
+    def subtract(self, *others):
+        """
+        Subtract the IDs of others from this set.
+
+        :param afem.smesh.entities.MeshIdSet others: The other sets.
+
+        :return: New set.
+        :rtype: afem.smesh.entities.MeshIdSet
+
+        :raise TypeError: If the sets are of different type or they do not
+            share the same mesh.
+        """
+        self._check(others)
+        ids = self._ids
+        for other in others:
+            ids = setdiff1d(ids, other._ids, assume_unique=True)
+        return MeshIdSet(self._mesh, self._type, ids, True)
+
+    def to_group(self, name='group'):
+        """
+        Create a mesh group from the IDs.
+
+        :param str name: The name of the group.
+
+        :return: New group.
+        :rtype: afem.smesh.entities.MeshGroup
+        """
+        with Tracer.span('MeshIdSet.to_group', n_ids=self._ids.size):
+            group = MeshGroup(self._mesh, name, self._type)
+            add = group._ds.Add
+            for eid in self._ids.tolist():
+                add(eid)
+        return group
+
+    @staticmethod
+    def union_all(sets):
+        """
+        Union the IDs of many sets.
+
+        :param collections.Sequence(afem.smesh.entities.MeshIdSet) sets: The
+            sets.
+
+        :return: New set.
+        :rtype: afem.smesh.entities.MeshIdSet
+
+        :raise ValueError: If no sets are given.
+        """
+        sets = list(sets)
+        if not sets:
+            raise ValueError('No sets provided.')
+        return sets[0].union(*sets[1:])
+
+    @staticmethod
+    def intersect_all(sets):
+        """
+        Intersect the IDs of many sets.
+
+        :param collections.Sequence(afem.smesh.entities.MeshIdSet) sets: The
+            sets.
+
+        :return: New set.
+        :rtype: afem.smesh.entities.MeshIdSet
+
+        :raise ValueError: If no sets are given.
+        """
+        sets = list(sets)
+        if not sets:
+            raise ValueError('No sets provided.')
+        return sets[0].intersect(*sets[1:])
+
+    def _check(self, others):
+        """
+        Check that the other sets are the same type and on the same mesh.
+        """
+        for other in others:
+            if self._type != other._type:
+                raise TypeError('Sets are not the same type.')
+            if self._mesh.id != other._mesh.id:
+                raise TypeError('Sets do not share the same mesh.')
+
+
+def _iter_ids(it):
+    """
+    Yield the IDs of the nodes or elements of an SMDS iterator.
+    """
+    while it.more():
+        yield it.next().GetID()
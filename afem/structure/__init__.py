@@ -16,12 +16,10 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with this library; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
-from afem.structure.check import *
-from afem.structure.create import *
-from afem.structure.entities import *
-from afem.structure.explore import *
-from afem.structure.fix import *
-from afem.structure.group import *
-from afem.structure.join import *
-#from afem.structure.mesh import MeshVehicle
-from afem.structure.modify import *
+from afem.misc.lazy import lazy_package
+
+# Public names are imported from the submodules on first access
+# ('mesh' is intentionally not exported)
+__getattr__, __dir__, __all__ = lazy_package(
+    __name__, ['check', 'create', 'entities', 'explore', 'fix', 'group',
+               'join', 'modify', 'props', 'sweep'])
@@ -16,9 +16,17 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with this library; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from afem.config import logger
+from afem.misc.trace import Tracer
 from afem.structure.entities import Part, SurfacePart, WingPart, Spar, Rib
+from afem.structure.group import GroupAPI
+from afem.topology.check import CheckShape
+from afem.topology.fix import FixShape
 
-__all__ = ["CheckPart"]
+__all__ = ["CheckPart", "ValidateGroup"]
 
 
 class CheckPart(object):
@@ -99,3 +107,246 @@ class CheckPart(object):
         :rtype: bool
         """
         return isinstance(part, Rib)
+
+
+class ValidateGroup(object):
+    """
+    Check the shapes of the parts in a group. Each face of a part (or each
+    edge if the part has no faces) is checked on its own with
+    :class:`.CheckShape` and the result is cached against the sub-shape, so
+    after an operation only the faces that are new or were modified are
+    checked again. Faces shared by parts are only checked once. Faces that
+    are not cached are checked in parallel if *nthreads* is greater than
+    one.
+
+    Only the faces and their edges and vertices are checked, not the shells
+    or solids that contain them. Use :meth:`.Part.check` to check the whole
+    shape of a part.
+
+    :param bool geom: Option to check geometry in addition to topology.
+    :param int nthreads: Number of threads used to check the faces.
+    """
+
+    def __init__(self, geom=True, nthreads=1):
+        self._geom = geom
+        self._nthreads = nthreads
+        self._cache = {}
+        self._invalid = OrderedDict()
+
+    @property
+    def ncached(self):
+        """
+        :return: Number of sub-shapes with cached results.
+        :rtype: int
+        """
+        return len(self._cache)
+
+    @property
+    def is_valid(self):
+        """
+        :return: *True* if all the parts were valid in the last validation,
+            *False* if not.
+        :rtype: bool
+        """
+        return not any(self._invalid.values())
+
+    @property
+    def invalid_parts(self):
+        """
+        :return: The parts that were not valid in the last validation.
+        :rtype: list(afem.structure.entities.Part)
+        """
+        return [part for part, shapes in self._invalid.items() if shapes]
+
+    def clear(self):
+        """
+        Clear the cached results.
+
+        :return: None.
+        """
+        self._cache.clear()
+        self._invalid.clear()
+
+    def validate(self, group=None, include_subgroup=True):
+        """
+        Check the parts in the group.
+
+        :param group: The group. If *None* then the master group is used.
+        :type group: str or afem.structure.group.Group or None
+        :param bool include_subgroup: Option to recursively include parts
+            from any subgroups.
+
+        :return: *True* if all the parts are valid, *False* if not.
+        :rtype: bool
+        """
+        group = GroupAPI.get_group_or_master(group)
+        parts = group.get_parts(include_subgroup)
+        units = OrderedDict((part, _units(part)) for part in parts)
+
+        # Sub-shapes that are not cached, without duplicates
+        todo = OrderedDict()
+        for shapes in units.values():
+            for shape in shapes:
+                if shape not in self._cache:
+                    todo[shape] = None
+        todo = list(todo.keys())
+
+        if todo:
+            with Tracer.span('ValidateGroup.validate') as span:
+                if self._nthreads > 1 and len(todo) > 1:
+                    with ThreadPoolExecutor(self._nthreads) as executor:
+                        results = list(executor.map(self._check, todo))
+                else:
+                    results = [self._check(shape) for shape in todo]
+                if span:
+                    span.set(n_parts=len(parts), n_checked=len(todo))
+            for shape, errors in zip(todo, results):
+                self._cache[shape] = errors
+
+        self._invalid = OrderedDict()
+        for part, shapes in units.items():
+            self._invalid[part] = [s for s in shapes if self._cache[s]]
+
+        # Remove sub-shapes that are gone
+        current = [s for shapes in units.values() for s in shapes]
+        GroupAPI.prune_cache(self._cache, current, group, include_subgroup)
+
+        return self.is_valid
+
+    def invalid_shapes(self, part):
+        """
+        Get the invalid sub-shapes of a part from the last validation.
+
+        :param afem.structure.entities.Part part: The part.
+
+        :return: The invalid faces or edges.
+        :rtype: list(afem.topology.entities.Shape)
+        """
+        return list(self._invalid.get(part, []))
+
+    def errors(self, part):
+        """
+        Get the error messages of a part from the last validation.
+
+        :param afem.structure.entities.Part part: The part.
+
+        :return: The error messages.
+        :rtype: list(str)
+        """
+        errors = []
+        for shape in self._invalid.get(part, []):
+            errors += self._cache[shape]
+        return errors
+
+    def summary(self):
+        """
+        Summarize the errors of each invalid part from the last validation.
+
+        :return: The summary.
+        :rtype: str
+        """
+        lines = []
+        for part in self.invalid_parts:
+            shapes = self._invalid[part]
+            lines.append('{}: {} invalid sub-shape(s)'.format(part.name,
+                                                             len(shapes)))
+            counts = OrderedDict()
+            for msg in self.errors(part):
+                msg = msg.strip()
+                counts[msg] = counts.get(msg, 0) + 1
+            for msg, n in counts.items():
+                lines.append('\t{} (x{})'.format(msg, n))
+        return '\n'.join(lines)
+
+    def log_errors(self):
+        """
+        Log the summary at the "info" level.
+
+        :return: None.
+        """
+        for line in self.summary().splitlines():
+            logger.info(line)
+
+    def fix(self, precision=None, min_tol=None, max_tol=None):
+        """
+        Attempt to fix the invalid parts from the last validation using
+        :meth:`.FixShape.fix_sub_shapes` on only their invalid sub-shapes.
+        Each invalid sub-shape is fixed once and the substitutions are
+        applied to the shape of every part from the last validation, so
+        parts that share a fixed sub-shape (valid or not) keep sharing its
+        replacement. The parts are then checked again, which only checks the
+        new sub-shapes.
+
+        :param float precision: Basic precision value.
+        :param float min_tol: Minimum allowed tolerance.
+        :param float max_tol: Maximum allowed tolerance.
+
+        :return: *True* if all the parts are valid after the fix, *False* if
+            not.
+        :rtype: bool
+        """
+        parts = self.invalid_parts
+        if not parts:
+            return True
+
+        # Invalid sub-shapes without duplicates
+        todo = OrderedDict()
+        for part in parts:
+            for shape in self._invalid[part]:
+                todo[shape] = None
+
+        with Tracer.span('ValidateGroup.fix', n_parts=len(parts),
+                         n_fixed=len(todo)):
+            targets = [part for part in self._invalid
+                       if part.shape is not None and not part.shape.is_null]
+            shapes = [part.shape for part in targets]
+            new_shapes = FixShape.fix_sub_shapes(list(todo), shapes, precision,
+                                                 min_tol, max_tol)
+
+            modified = set()
+            for part, shape, new_shape in zip(targets, shapes, new_shapes):
+                if new_shape is not shape:
+                    part.set_shape(new_shape)
+                    modified.add(part)
+
+        # Tolerances may be fixed in place so check these again
+        for shape in todo:
+            self._cache.pop(shape, None)
+
+        valid = True
+        for part in self._invalid:
+            if part not in modified and not self._invalid[part]:
+                continue
+            units = _units(part)
+            for shape in units:
+                if shape not in self._cache:
+                    self._cache[shape] = self._check(shape)
+            self._invalid[part] = [s for s in units if self._cache[s]]
+            if self._invalid[part]:
+                valid = False
+        return valid
+
+    def _check(self, shape):
+        """
+        Check a sub-shape and return its error messages.
+        """
+        check = CheckShape(shape, self._geom)
+        if check.is_valid:
+            return []
+        errors = check.errors
+        if not errors:
+            errors = ['\t{}: Invalid'.format(shape.__class__.__name__)]
+        return errors
+
+
+def _units(part):
+    """
+    Get the sub-shapes of a part that are checked on their own.
+    """
+    shape = part.shape
+    if shape is None or shape.is_null:
+        return []
+    faces = shape.faces
+    if faces:
+        return faces
+    return shape.edges
@@ -29,6 +29,8 @@ from afem.geometry.create import (NurbsCurveByPoints,
                                   PlaneByOrientation,
                                   PlanesAlongCurveAndSurfaceByDistance)
 from afem.geometry.entities import Curve, Surface
+from afem.geometry.project import ProjectPointsToSurface
+from afem.misc.trace import TracedType
 from afem.structure.entities import (Part, CurvePart, Beam1D, SurfacePart,
                                      WingPart, Spar, Rib, FuselagePart,
                                      Bulkhead, Floor, Frame, Skin,
@@ -37,7 +39,7 @@ from afem.structure.entities import (Part, CurvePart, Beam1D, SurfacePart,
 from afem.structure.utils import shape_of_entity
 from afem.topology.bop import (IntersectShapes, CommonShapes, CutShapes,
                                TrimOpenWire)
-from afem.topology.create import (EdgeByCurve, WiresByConnectedEdges,
+from afem.topology.create import (EdgeByCurve, WiresByEdgeEndpoints,
                                   FaceBySurface, WireByPlanarOffset,
                                   FaceByPlanarWire, WireByConcat,
                                   EdgeByPoints, CompoundByShapes, WiresByShape)
@@ -94,7 +96,7 @@ _type_to_part = {
 
 
 # PART ------------------------------------------------------------------------
-class CreatePartByName(object):
+class CreatePartByName(object, metaclass=TracedType):
     """
     Create a part by its type name. This is a tool mostly for loading models
     and it not recommended for general use.
@@ -113,8 +115,14 @@ class CreatePartByName(object):
         """
         return self._part
 
+    def _trace_attrs(self):
+        """
+        Span attributes recorded when tracing the builder.
+        """
+        return _part_attrs(self._part)
+
 
-class PartBuilder(object):
+class PartBuilder(object, metaclass=TracedType):
     """
     Base class for creating a part.
 
@@ -142,8 +150,14 @@ class PartBuilder(object):
         """
         return self._part
 
+    def _trace_attrs(self):
+        """
+        Span attributes recorded when tracing the builder.
+        """
+        return _part_attrs(self._part)
 
-class PartsBuilder(object):
+
+class PartsBuilder(object, metaclass=TracedType):
     """
     Base class for creating multiple parts.
     """
@@ -185,6 +199,12 @@ class PartsBuilder(object):
         """
         return self._next_index
 
+    def _trace_attrs(self):
+        """
+        Span attributes recorded when tracing the builder.
+        """
+        return {'n_parts': self.nparts, 'spacing': self._ds}
+
 
 # CURVE PART ------------------------------------------------------------------
 
@@ -300,7 +320,7 @@ class SurfacePartByShape(PartBuilder):
         section = IntersectShapes(basis_shape, body.sref_shape,
                                   approximate=True)
         edges = section.shape.edges
-        wires = WiresByConnectedEdges(edges).wires
+        wires = WiresByEdgeEndpoints(edges).wires
         w = LengthOfShapes(wires).longest_shape
         cref = None
         if isinstance(w, (Edge, Wire)):
@@ -424,8 +444,8 @@ class SurfacePartByPoints(SurfacePartByParameters):
         p2 = CheckGeom.to_point(p2)
 
         # Invert points
-        u1, v1 = body.sref.invert(p1)
-        u2, v2 = body.sref.invert(p2)
+        uv = ProjectPointsToSurface([p1, p2], body.sref).parameters
+        (u1, v1), (u2, v2) = uv.tolist()
 
         # Use SparByParameters
         super(SurfacePartByPoints, self).__init__(name, u1, v1, u2, v2, body,
@@ -457,6 +477,8 @@ class SurfacePartByEnds(SurfacePartByParameters):
 
     :raise TypeError: If *e1* or *e2* are not *point_like* or a sequence of
         two surface parameters.
+    :raise RuntimeError: If a point cannot be inverted on the reference
+        surface of the body.
     """
 
     def __init__(self, name, e1, e2, body, basis_shape=None, group=None,
@@ -464,14 +486,14 @@ class SurfacePartByEnds(SurfacePartByParameters):
         if len(e1) == 2:
             u1, v1 = e1
         elif CheckGeom.is_point_like(e1):
-            u1, v1 = body.sref.invert(e1)
+            u1, v1 = _invert(e1, body.sref)
         else:
             raise TypeError('Invalid type for e1.')
 
         if len(e2) == 2:
             u2, v2 = e2
         elif CheckGeom.is_point_like(e2):
-            u2, v2 = body.sref.invert(e2)
+            u2, v2 = _invert(e2, body.sref)
         else:
             raise TypeError('Invalid type for e2.')
 
@@ -1902,3 +1924,23 @@ class Beam2DBySweep(PartBuilder):
 
         super(Beam2DBySweep, self).__init__(name, tool.shape, cref, None,
                                             group, Beam2D)
+
+
+def _part_attrs(part):
+    """
+    Span attributes of a part recorded when tracing its builder.
+    """
+    shape = part.shape
+    return {'part': part.name, 'n_faces': shape.num_faces,
+            'n_edges': shape.num_edges, 'tol_max': shape.tol_max}
+
+
+def _invert(p, srf):
+    """
+    Invert a point on a surface using the cached batch solver.
+    """
+    p = CheckGeom.to_point(p)
+    proj = ProjectPointsToSurface([p], srf)
+    if not proj.status[0]:
+        raise RuntimeError('Failed to invert point.')
+    return proj.parameters[0].tolist()
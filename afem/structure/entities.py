@@ -38,6 +38,7 @@ from afem.topology.modify import (RebuildShapeByTool,
                                   RebuildShapeWithShapes, RebuildShapesByTool,
                                   SewShape, UnifyShape)
 from afem.topology.props import LengthOfShapes, LinearProps, SurfaceProps
+from afem.topology.transform import instance_shape, mirror_shape
 
 __all__ = ["Part", "CurvePart", "Beam1D", "SurfacePart", "WingPart", "Spar",
            "Rib", "FuselagePart", "Bulkhead", "Floor", "Frame", "Skin",
@@ -81,10 +82,14 @@ class Part(ShapeHolder):
         logger.info(msg)
 
         # Groups for meshing
+        self._mesh = None
         self._node_group = None
         self._edge_group = None
         self._face_group = None
 
+        # Part this one is an instance of
+        self._prototype = None
+
     @property
     def id(self):
         """
@@ -93,40 +98,67 @@ class Part(ShapeHolder):
         """
         return self._id
 
+    @property
+    def prototype(self):
+        """
+        :return: The part that this part is an instance of. This is the
+            original part for instances of instances. If this part is not an
+            instance then it returns itself.
+        :rtype: afem.structure.entities.Part
+        """
+        if self._prototype is None:
+            return self
+        return self._prototype
+
     @property
     def node_group(self):
         """
-        :return: The mesh node group.
+        :return: The mesh node group. It is created the first time it is
+            accessed after the part is initialized for meshing.
         :rtype: afem.smesh.entities.MeshGroup
 
-        :raise AttributeError: If group doesn't exist.
+        :raise AttributeError: If the part is not initialized for meshing.
         """
         if self._node_group is None:
-            raise AttributeError('Node group does not exist.')
+            if self._mesh is None:
+                raise AttributeError('Node group does not exist.')
+            name = ' '.join([self.name, 'nodes'])
+            self._node_group = self._mesh.create_group(
+                name, self._mesh.NODE, self.shape)
         return self._node_group
 
     @property
     def edge_group(self):
         """
-        :return: The mesh edge group.
+        :return: The mesh edge group. It is created the first time it is
+            accessed after the part is initialized for meshing.
         :rtype: afem.smesh.entities.MeshGroup
 
-        :raise AttributeError: If group doesn't exist.
+        :raise AttributeError: If the part is not initialized for meshing.
         """
         if self._edge_group is None:
-            raise AttributeError('Edge group does not exist.')
+            if self._mesh is None:
+                raise AttributeError('Edge group does not exist.')
+            name = ' '.join([self.name, 'edges'])
+            self._edge_group = self._mesh.create_group(
+                name, self._mesh.EDGE, self.shape)
         return self._edge_group
 
     @property
     def face_group(self):
         """
-        :return: The mesh face group.
+        :return: The mesh face group. It is created the first time it is
+            accessed after the part is initialized for meshing.
         :rtype: afem.smesh.entities.MeshGroup
 
-        :raise AttributeError: If group doesn't exist.
+        :raise AttributeError: If the part is not initialized for meshing.
         """
         if self._face_group is None:
-            raise AttributeError('Face group does not exist.')
+            if self._mesh is None:
+                raise AttributeError('Face group does not exist.')
+            name = ' '.join([self.name, 'faces'])
+            self._face_group = self._mesh.create_group(
+                name, self._mesh.FACE, self.shape)
         return self._face_group
 
     def distance(self, other):
@@ -190,6 +222,63 @@ class Part(ShapeHolder):
                              context).shape
         self.set_shape(new_shape)
 
+    def transformed(self, trsf, name, group=None):
+        """
+        Create an instance of this part by transforming it. The new part
+        shares the shape of this part through a location rather than a copy
+        (see :func:`.instance_shape`) and data derived from the shape, like
+        tessellations, is reused. The reference geometry is copied and
+        transformed.
+
+        :param OCC.Core.gp.gp_Trsf trsf: The transformation.
+        :param str name: The name of the new part.
+        :param group: The group to add the new part to. If not provided the
+            part will be added to the active group.
+        :type group: str or afem.structure.group.Group or None
+
+        :return: The new part. It is the same type as this part.
+        :rtype: afem.structure.entities.Part
+
+        .. note::
+
+            Modifying the shape of the new part (e.g., splitting or cutting)
+            will replace its shape with a new one so it will no longer be an
+            instance.
+        """
+        shape = instance_shape(self._shape, trsf)
+        cref, sref = None, None
+        if self.has_cref:
+            cref = self._cref.copy()
+            cref.transform(trsf)
+        if self.has_sref:
+            sref = self._sref.copy()
+            sref.transform(trsf)
+        return self._new_instance(name, shape, cref, sref, group)
+
+    def mirrored(self, pln, name, group=None):
+        """
+        Create an instance of this part by mirroring it using the plane. See
+        :meth:`.transformed` for details.
+
+        :param afem.geometry.entities.Plane pln: The plane.
+        :param str name: The name of the new part.
+        :param group: The group to add the new part to. If not provided the
+            part will be added to the active group.
+        :type group: str or afem.structure.group.Group or None
+
+        :return: The new part. It is the same type as this part.
+        :rtype: afem.structure.entities.Part
+        """
+        shape = mirror_shape(self._shape, pln, True)
+        cref, sref = None, None
+        if self.has_cref:
+            cref = self._cref.copy()
+            cref.mirror(pln)
+        if self.has_sref:
+            sref = self._sref.copy()
+            sref.mirror(pln)
+        return self._new_instance(name, shape, cref, sref, group)
+
     def cut(self, cutter):
         """
         Cut the part shape and rebuild this part.
@@ -499,22 +588,19 @@ class Part(ShapeHolder):
 
     def init_meshing(self, mesh):
         """
-        Initialize the part for meshing. This includes creating node, edge, and
-        face groups.
+        Initialize the part for meshing. The node, edge, and face groups are
+        not created until they are accessed since each one is costly and
+        most are never used on models with many parts.
 
         :param afem.smesh.entities.Mesh mesh: The top-level mesh that will
             contain the groups.
 
         :return: None.
         """
-        name = ' '.join([self.name, 'nodes'])
-        self._node_group = mesh.create_group(name, mesh.NODE, self.shape)
-
-        name = ' '.join([self.name, 'edges'])
-        self._edge_group = mesh.create_group(name, mesh.EDGE, self.shape)
-
-        name = ' '.join([self.name, 'faces'])
-        self._face_group = mesh.create_group(name, mesh.FACE, self.shape)
+        self._mesh = mesh
+        self._node_group = None
+        self._edge_group = None
+        self._face_group = None
 
     @classmethod
     def reset(cls):
@@ -525,6 +611,14 @@ class Part(ShapeHolder):
         """
         cls._indx = 1
 
+    def _new_instance(self, name, shape, cref, sref, group):
+        """
+        Create a part of the same type that is an instance of this part.
+        """
+        part = self.__class__(name, shape, cref, sref, group)
+        part._prototype = self.prototype
+        return part
+
 
 class CurvePart(Part):
     """
@@ -559,10 +653,9 @@ class SurfacePart(Part):
             it returns the length of all edges of the part.
         :rtype: float
         """
-        try:
-            return self.cref.length
-        except AttributeError:
-            return LinearProps(self._shape).length
+        if self.has_cref:
+            return self.cref_length
+        return LinearProps(self._shape).length
 
     @property
     def area(self):
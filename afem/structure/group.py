@@ -16,7 +16,7 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with this library; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
-from afem.base.entities import NamedItem
+from afem.base.entities import NamedItem, VersionedItem
 from afem.exchange.xde import XdeDocument
 from afem.structure.utils import order_parts_by_id
 from afem.topology.create import CompoundByShapes, EdgeByCurve, FaceBySurface
@@ -24,9 +24,12 @@ from afem.topology.create import CompoundByShapes, EdgeByCurve, FaceBySurface
 __all__ = ["Group", "GroupAPI"]
 
 
-class Group(NamedItem):
+class Group(NamedItem, VersionedItem):
     """
-    Group of parts.
+    Group of parts. The version of a group is incremented when parts are
+    added or removed with an "add_parts" or "remove_part" event, and when
+    one of its parts or subgroups changes. Changes of parts and subgroups are
+    passed on to subscribers of this group with the changed item.
 
     :param str name: The name.
     :param parent: The parent group, if any.
@@ -35,11 +38,14 @@ class Group(NamedItem):
 
     def __init__(self, name, parent=None):
         super(Group, self).__init__(name)
+        VersionedItem.__init__(self)
         self._parent = parent
         self._children = set()
         self._parts = set()
+        self._shapes = {}
         if isinstance(self._parent, Group):
             self._parent._children.add(self)
+            self.subscribe(self._parent._on_change)
 
     @property
     def parent(self):
@@ -49,6 +55,14 @@ class Group(NamedItem):
         """
         return self._parent
 
+    @property
+    def children(self):
+        """
+        :return: List of the subgroups.
+        :rtype: list(afem.structure.group.Group)
+        """
+        return list(self._children)
+
     @property
     def parts(self):
         """
@@ -73,8 +87,13 @@ class Group(NamedItem):
 
         :return: None.
         """
-        part_set = set(parts)
-        self._parts.update(part_set)
+        new_parts = [part for part in set(parts) if part not in self._parts]
+        if not new_parts:
+            return
+        self._parts.update(new_parts)
+        for part in new_parts:
+            part.subscribe(self._on_change)
+        self.notify('add_parts', None, new_parts)
 
     def get_part(self, name):
         """
@@ -133,6 +152,8 @@ class Group(NamedItem):
         """
         part = self.get_part(name)
         self._parts.discard(part)
+        part.unsubscribe(self._on_change)
+        self.notify('remove_part', part, None)
 
     def get_shape(self, include_subgroup=True):
         """
@@ -143,12 +164,19 @@ class Group(NamedItem):
         :param bool include_subgroup: Option to recursively include parts
             from any subgroups.
 
-        :return: The part shapes as a compound.
+        :return: The part shapes as a compound. This is cached until the
+            version of the group changes.
         :rtype: afem.topology.entities.Compound
         """
+        version, shape = self._shapes.get(include_subgroup, (None, None))
+        if version == self._version:
+            return shape
+
         parts = self.get_parts(include_subgroup)
         shapes = [part.shape for part in parts]
-        return CompoundByShapes(shapes).compound
+        shape = CompoundByShapes(shapes).compound
+        self._shapes[include_subgroup] = (self._version, shape)
+        return shape
 
     def create_subgroup(self, name, active=True):
         """
@@ -162,6 +190,12 @@ class Group(NamedItem):
         """
         return GroupAPI.create_group(name, self, active)
 
+    def _on_change(self, item, event, old, new):
+        """
+        Pass on a change of a part or subgroup.
+        """
+        self._publish(item, event, old, new)
+
     @staticmethod
     def parts_to_compound(parts):
         """
@@ -206,6 +240,33 @@ class GroupAPI(object):
 
         Part.reset()
 
+    @classmethod
+    def save_state(cls):
+        """
+        Get the current groups and Part index so they can be restored with
+        :meth:`.restore_state` (e.g., after a temporary reset).
+
+        :return: The state.
+        :rtype: tuple
+        """
+        from afem.structure.entities import Part
+
+        return cls._master, dict(cls._all), cls._active, Part._indx
+
+    @classmethod
+    def restore_state(cls, state):
+        """
+        Restore the groups and Part index saved with :meth:`.save_state`.
+
+        :param tuple state: The state.
+
+        :return: None.
+        """
+        from afem.structure.entities import Part
+
+        cls._master, all_, cls._active, Part._indx = state
+        cls._all = dict(all_)
+
     @classmethod
     def get_master(cls):
         """
@@ -251,6 +312,47 @@ class GroupAPI(object):
         except KeyError:
             return cls.get_active()
 
+    @classmethod
+    def get_group_or_master(cls, group=None):
+        """
+        Get a group like :meth:`.get_group` except the master group is
+        returned if ``None`` is provided.
+
+        :param group: Group to get.
+        :type group: str or afem.structure.group.Group or None
+
+        :return: The group.
+        :rtype: afem.structure.group.Group
+        """
+        if group is None:
+            return cls._master
+        return cls.get_group(group)
+
+    @classmethod
+    def prune_cache(cls, cache, current, group, include_subgroup=True):
+        """
+        Remove the entries of a cache whose keys are not in *current*. The
+        cache is only pruned if *group* is the master group and subgroups
+        were included, since then *current* holds the keys for the entire
+        model and anything missing is gone.
+
+        :param dict cache: The cache.
+        :param current: The keys to keep.
+        :type current: collections.Iterable
+        :param afem.structure.group.Group group: The group the keys were
+            gathered from.
+        :param bool include_subgroup: Option used to gather the keys.
+
+        :return: *True* if the cache was pruned, *False* if not.
+        :rtype: bool
+        """
+        if group is not cls._master or not include_subgroup:
+            return False
+        current = set(current)
+        for key in [k for k in cache if k not in current]:
+            del cache[key]
+        return True
+
     @classmethod
     def make_active(cls, group):
         """
@@ -401,11 +503,12 @@ class GroupAPI(object):
         # Create document and application
         doc = XdeDocument(binary)
 
-        # Store parts as top-level shapes
+        # Store parts as top-level shapes. Instances are added last so that
+        # their shapes reference the non-located shapes.
         # TODO Support group hierarchy
-        parts = group.get_parts()
+        parts = sorted(group.get_parts(), key=lambda p: p.is_instance)
         for part in parts:
-            name = doc.add_shape(part.shape, part.name, False)
+            name = doc.add_instance(part.shape, part.name)
             name.set_string(part.type_name)
             name.set_color(part.color)
 
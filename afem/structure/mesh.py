@@ -16,15 +16,19 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with this library; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
-from afem.exchange import nastran
+from numpy import arange, array, cumsum, int32, int64, repeat, zeros
+
+from afem.exchange import binmesh, nastran
+from afem.misc.trace import Tracer
 #from afem.smesh.entities import MeshGen, MeshGroup, Mesh
 from afem.smesh.hypotheses import (Regular1D, NetgenAlgo2D,
                                    NetgenSimple2D, LocalLength1D,
                                    NumberOfSegments1D, MaxLength1D,
                                    QuadrangleAlgo2D, QuadrangleHypo2D)
 from afem.structure.group import GroupAPI
+from afem.topology.entities import Shape
 
-__all__ = ["MeshVehicle"]
+__all__ = ["MeshVehicle", "MeshPartMap"]
 
 
 class MeshVehicle(object):
@@ -33,7 +37,13 @@ class MeshVehicle(object):
     will be used to define the top-level shape for meshing, which should
     include all the parts and therefore shapes to be meshed. Default mesh
     controls are applied to the top-level shape based on the target element
-    size.
+    size. The controls created by the ``set_*`` methods are shared through
+    the registry of the mesh generator (see :meth:`.MeshGen.hypothesis`) so
+    applying the same control to many shapes only creates it once. Do not
+    change those controls after they are applied since the change would
+    apply to every shape sharing them. Create an unshared control with
+    ``gen.hypothesis(type_, ..., shared=False)`` and apply it with
+    :meth:`.add_controls` instead.
 
     :param float target_size: Default global element size.
     :param bool allow_quads: Option to generate quad-dominated mesh.
@@ -51,10 +61,11 @@ class MeshVehicle(object):
             part.init_meshing(self._mesh)
 
         # Define global mesh control based on target size
-        hyp1d = LocalLength1D(self._gen, target_size)
-        alg1d = Regular1D(self._gen)
-        hyp2d = NetgenSimple2D(self._gen, target_size, allow_quads=allow_quads)
-        alg2d = NetgenAlgo2D(self._gen)
+        hyp1d = self._gen.hypothesis(LocalLength1D, target_size)
+        alg1d = self._gen.hypothesis(Regular1D)
+        hyp2d = self._gen.hypothesis(NetgenSimple2D, target_size,
+                                     allow_quads=allow_quads)
+        alg2d = self._gen.hypothesis(NetgenAlgo2D)
         self.add_controls([hyp1d, alg1d, hyp2d, alg2d])
 
     @property
@@ -123,59 +134,97 @@ class MeshVehicle(object):
             status_dict[hyp] = status
         return status_dict
 
+    def add_controls_to_shapes(self, controls, shapes):
+        """
+        Add mesh controls to each of the shapes.
+
+        :param controls: The controls.
+        :type controls:
+            collections.Sequence(afem.smesh.hypotheses.Hypothesis)
+        :param shapes: The shapes. These should be sub-shapes of the master
+            shape.
+        :type shapes: collections.Sequence(afem.topology.entities.Shape)
+
+        :return: List of the shapes where a control could not be added and
+            its status.
+        :rtype: list(tuple(afem.topology.entities.Shape,
+            OCC.Core.SMESH.SMESH_Hypothesis.Hypothesis_Status))
+        """
+        return self._mesh.add_hypotheses_to_shapes(controls, shapes)
+
     def set_number_segments_1d(self, nseg, shape):
         """
         Set the number of edge segments for the shape.
 
         :param int nseg: The number of segments.
-        :param afem.topology.entities.Shape shape: The shape.
+        :param shape: The shape or shapes.
+        :type shape: afem.topology.entities.Shape or
+            collections.Sequence(afem.topology.entities.Shape)
 
         :return: None.
         """
-        alg = Regular1D(self.gen)
-        hyp = NumberOfSegments1D(self.gen, nseg)
-        self.add_controls([alg, hyp], shape)
+        alg = self.gen.hypothesis(Regular1D)
+        hyp = self.gen.hypothesis(NumberOfSegments1D, nseg)
+        self._set_controls([alg, hyp], shape)
 
     def set_local_length_1d(self, local_length, shape):
         """
         Set the local length of edge segments for the shape.
 
         :param float local_length: The local length.
-        :param afem.topology.entities.Shape shape: The shape.
+        :param shape: The shape or shapes.
+        :type shape: afem.topology.entities.Shape or
+            collections.Sequence(afem.topology.entities.Shape)
 
         :return: None.
         """
-        alg = Regular1D(self.gen)
-        hyp = LocalLength1D(self.gen, local_length)
-        self.add_controls([alg, hyp], shape)
+        alg = self.gen.hypothesis(Regular1D)
+        hyp = self.gen.hypothesis(LocalLength1D, local_length)
+        self._set_controls([alg, hyp], shape)
 
     def set_max_length_1d(self, max_length, shape):
         """
         Set the max length of edge segments for the shape.
 
         :param float max_length: The max length.
-        :param afem.topology.entities.Shape shape: The shape.
+        :param shape: The shape or shapes.
+        :type shape: afem.topology.entities.Shape or
+            collections.Sequence(afem.topology.entities.Shape)
 
         :return: None.
         """
-        alg = Regular1D(self.gen)
-        hyp = MaxLength1D(self.gen, max_length)
-        self.add_controls([alg, hyp], shape)
+        alg = self.gen.hypothesis(Regular1D)
+        hyp = self.gen.hypothesis(MaxLength1D, max_length)
+        self._set_controls([alg, hyp], shape)
 
     def set_quadrangle_2d(self, shape):
         """
         Set the mesh control to use structured quadrangle mesh for the shape.
 
-        :param afem.topology.entities.Shape shape: The shape. The algorithm is
-            applied to each face of the shape only if it is applicable.
+        :param shape: The shape or shapes. The algorithm is applied to each
+            face only if it is applicable.
+        :type shape: afem.topology.entities.Shape or
+            collections.Sequence(afem.topology.entities.Shape)
 
         :return: None.
         """
-        alg = QuadrangleAlgo2D(self.gen)
-        hyp = QuadrangleHypo2D(self.gen)
-        for face in shape.faces:
-            if alg.is_applicable(face):
-                self.add_controls([alg, hyp], face)
+        alg = self.gen.hypothesis(QuadrangleAlgo2D)
+        hyp = self.gen.hypothesis(QuadrangleHypo2D)
+        if isinstance(shape, Shape):
+            shape = [shape]
+        faces = []
+        for item in shape:
+            faces += [f for f in item.faces if alg.is_applicable(f)]
+        self.add_controls_to_shapes([alg, hyp], faces)
+
+    def _set_controls(self, controls, shape):
+        """
+        Add the controls to a shape or a sequence of shapes.
+        """
+        if isinstance(shape, Shape):
+            self.add_controls(controls, shape)
+        else:
+            self.add_controls_to_shapes(controls, shape)
 
     def compute(self):
         """
@@ -234,3 +283,247 @@ class MeshVehicle(object):
         :return: None.
         """
         nastran.export_bdf(self.mesh, fn)
+
+    def export_binmesh(self, fn):
+        """
+        Export the mesh and the node, edge, and face groups of the parts to a
+        binary mesh file.
+
+        :param str fn: The filename.
+
+        :return: None.
+        """
+        binmesh.write_binmesh(self.mesh, fn, self._part_groups())
+
+    def snapshot(self, include_groups=True):
+        """
+        Gather the mesh and the node, edge, and face groups of the parts into
+        arrays. The arrays do not change with the mesh so they can be written
+        in the background (e.g., using :func:`.write_bdf` in a
+        :class:`.Pipeline`).
+
+        :param bool include_groups: Option to include the groups of the
+            parts. This creates any groups that were not accessed yet.
+
+        :return: The mesh arrays.
+        :rtype: afem.exchange.binmesh.MeshArrays
+        """
+        groups = self._part_groups() if include_groups else ()
+        return binmesh.MeshArrays.from_mesh(self.mesh, groups)
+
+    def part_map(self, arrays=None):
+        """
+        Find the part of each element and the parts of each node from the
+        shape index that each one is on. This is a single pass over the mesh
+        rather than one per mesh group so it avoids creating the groups of
+        each part.
+
+        :param afem.exchange.binmesh.MeshArrays arrays: Arrays gathered from
+            this mesh after it was computed. If *None* then they are
+            gathered.
+
+        :return: The map.
+        :rtype: afem.structure.mesh.MeshPartMap
+        """
+        if arrays is None:
+            arrays = binmesh.MeshArrays.from_mesh(self.mesh)
+
+        with Tracer.span('MeshVehicle.part_map') as span:
+            ds = self.mesh.ds
+            parts = GroupAPI.get_master().get_parts()
+            shape_parts = {}
+            for part in parts:
+                shape = part.shape
+                for sub in (shape.vertices + shape.edges + shape.faces +
+                            shape.solids):
+                    indx = ds.shape_to_index(sub)
+                    if indx > 0:
+                        shape_parts.setdefault(indx, set()).add(part.id)
+            pmap = MeshPartMap.from_arrays(parts, arrays, shape_parts)
+            if span:
+                span.set(n_parts=len(parts), n_shapes=len(shape_parts))
+        return pmap
+
+    @staticmethod
+    def _part_groups():
+        """
+        Get the node, edge, and face groups of all the parts.
+        """
+        groups = []
+        for part in GroupAPI.get_master().get_parts():
+            for attr in ('node_group', 'edge_group', 'face_group'):
+                try:
+                    groups.append(getattr(part, attr))
+                except AttributeError:
+                    continue
+        return groups
+
+
+class MeshPartMap(object):
+    """
+    Element-to-part and node-to-parts arrays of a mesh. Each element has
+    one part, which is the part with the lowest ID if the shape of the
+    element is shared (e.g., beam elements on an edge between two parts).
+    Each node has all the parts that share its shape. Part ID 0 means the
+    element is not on a part. Use :meth:`.MeshVehicle.part_map` to build
+    one.
+
+    :param collections.Sequence(afem.structure.entities.Part) parts: The
+        parts.
+    :param numpy.ndarray elm_ids: The element IDs.
+    :param numpy.ndarray elm_parts: The part ID of each element.
+    :param numpy.ndarray node_ids: The node IDs.
+    :param numpy.ndarray node_offsets: Offsets into *node_parts* for each
+        node and the total size at the end.
+    :param numpy.ndarray node_parts: The part IDs of all the nodes.
+    """
+
+    def __init__(self, parts, elm_ids, elm_parts, node_ids, node_offsets,
+                 node_parts):
+        self._parts = dict((part.id, part) for part in parts)
+        self._elm_ids = elm_ids
+        self._elm_parts = elm_parts
+        self._node_ids = node_ids
+        self._node_offsets = node_offsets
+        self._node_parts = node_parts
+
+    @property
+    def elm_ids(self):
+        """
+        :return: The element IDs.
+        :rtype: numpy.ndarray
+        """
+        return self._elm_ids
+
+    @property
+    def elm_parts(self):
+        """
+        :return: The part ID of each element.
+        :rtype: numpy.ndarray
+        """
+        return self._elm_parts
+
+    @property
+    def node_ids(self):
+        """
+        :return: The node IDs.
+        :rtype: numpy.ndarray
+        """
+        return self._node_ids
+
+    @property
+    def node_offsets(self):
+        """
+        :return: Offsets into :attr:`.node_parts` for each node and the
+            total size at the end.
+        :rtype: numpy.ndarray
+        """
+        return self._node_offsets
+
+    @property
+    def node_parts(self):
+        """
+        :return: The part IDs of all the nodes.
+        :rtype: numpy.ndarray
+        """
+        return self._node_parts
+
+    def get_part(self, pid):
+        """
+        Get a part by its ID.
+
+        :param int pid: The part ID.
+
+        :return: The part or *None* if not found.
+        :rtype: afem.structure.entities.Part or None
+        """
+        return self._parts.get(pid)
+
+    def node_part_ids(self, i):
+        """
+        Get the part IDs of a node.
+
+        :param int i: The node index (not the node ID).
+
+        :return: The part IDs.
+        :rtype: numpy.ndarray
+        """
+        i1, i2 = self._node_offsets[i], self._node_offsets[i + 1]
+        return self._node_parts[i1:i2]
+
+    def part_elements(self, part):
+        """
+        Get the IDs of the elements of a part.
+
+        :param afem.structure.entities.Part part: The part.
+
+        :return: The element IDs.
+        :rtype: numpy.ndarray
+        """
+        return self._elm_ids[self._elm_parts == part.id]
+
+    def part_nodes(self, part):
+        """
+        Get the IDs of the nodes of a part.
+
+        :param afem.structure.entities.Part part: The part.
+
+        :return: The node IDs.
+        :rtype: numpy.ndarray
+        """
+        counts = self._node_offsets[1:] - self._node_offsets[:-1]
+        owners = repeat(arange(self._node_ids.size), counts)
+        return self._node_ids[owners[self._node_parts == part.id]]
+
+    @classmethod
+    def from_arrays(cls, parts, arrays, shape_parts):
+        """
+        Build the map from mesh arrays.
+
+        :param collections.Sequence(afem.structure.entities.Part) parts: The
+            parts.
+        :param afem.exchange.binmesh.MeshArrays arrays: The mesh arrays.
+        :param dict(int, set(int)) shape_parts: The part IDs of each shape
+            index.
+
+        :return: The map.
+        :rtype: afem.structure.mesh.MeshPartMap
+        """
+        node_shapes = arrays.node_shapes.astype(int64)
+        elm_shapes = arrays.elm_shapes.astype(int64)
+        nshapes = max([0] + list(shape_parts.keys()))
+        if node_shapes.size:
+            nshapes = max(nshapes, int(node_shapes.max()))
+        if elm_shapes.size:
+            nshapes = max(nshapes, int(elm_shapes.max()))
+        nshapes += 1
+
+        # Parts of each shape index
+        counts = zeros(nshapes, dtype=int64)
+        owner = zeros(nshapes, dtype=int32)
+        for indx, pids in shape_parts.items():
+            counts[indx] = len(pids)
+            owner[indx] = min(pids)
+        shape_offsets = zeros(nshapes + 1, dtype=int64)
+        cumsum(counts, out=shape_offsets[1:])
+        shape_members = zeros(shape_offsets[-1], dtype=int32)
+        for indx, pids in shape_parts.items():
+            i1, i2 = shape_offsets[indx], shape_offsets[indx + 1]
+            shape_members[i1:i2] = sorted(pids)
+
+        # Shape index is 0 (or negative) if not on a shape
+        node_shapes[node_shapes < 0] = 0
+        elm_shapes[elm_shapes < 0] = 0
+
+        elm_parts = owner[elm_shapes]
+
+        node_counts = counts[node_shapes]
+        node_offsets = zeros(node_shapes.size + 1, dtype=int64)
+        cumsum(node_counts, out=node_offsets[1:])
+        first = repeat(shape_offsets[node_shapes], node_counts)
+        local = arange(node_offsets[-1]) - repeat(node_offsets[:-1],
+                                                  node_counts)
+        node_parts = shape_members[first + local]
+
+        return cls(parts, array(arrays.elm_ids), elm_parts,
+                   array(arrays.node_ids), node_offsets, node_parts)
@@ -0,0 +1,342 @@
+# This file is part of AFEM which provides an engineering toolkit for airframe
+# finite element modeling during conceptual design.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC (info@laughlinresearch.com)
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+from concurrent.futures import ThreadPoolExecutor
+
+from numpy import array, eye, outer, zeros
+
+from afem.geometry.entities import Point
+from afem.misc.trace import Tracer
+from afem.structure.entities import CurvePart, SurfacePart
+from afem.structure.group import GroupAPI
+from afem.topology.props import LinearProps, SurfaceProps, VolumeProps
+
+__all__ = ["MassProps", "MassRollup"]
+
+
+class MassProps(object):
+    """
+    Mass, center of gravity, and matrix of inertia of a part or a collection
+    of parts.
+
+    :param float mass: The mass.
+    :param cg: The center of gravity.
+    :type cg: numpy.ndarray or point_like
+    :param numpy.ndarray inertia: The 3 x 3 matrix of inertia about the
+        center of gravity.
+    :param int nparts: The number of parts.
+    """
+
+    def __init__(self, mass=0., cg=(0., 0., 0.), inertia=None, nparts=0):
+        self._mass = float(mass)
+        self._cg = array(cg, dtype=float)
+        if inertia is None:
+            inertia = zeros((3, 3), dtype=float)
+        self._inertia = array(inertia, dtype=float)
+        self._nparts = nparts
+
+    @property
+    def mass(self):
+        """
+        :return: The mass.
+        :rtype: float
+        """
+        return self._mass
+
+    @property
+    def cg(self):
+        """
+        :return: The center of gravity.
+        :rtype: afem.geometry.entities.Point
+        """
+        return Point(*self._cg)
+
+    @property
+    def inertia(self):
+        """
+        :return: The 3 x 3 matrix of inertia about the center of gravity.
+        :rtype: numpy.ndarray
+        """
+        return self._inertia
+
+    @property
+    def nparts(self):
+        """
+        :return: The number of parts.
+        :rtype: int
+        """
+        return self._nparts
+
+    def scaled(self, factor):
+        """
+        Scale the mass and inertia, for example, to apply a thickness and
+        density to the properties of a unit density part.
+
+        :param float factor: The scale factor.
+
+        :return: The scaled properties.
+        :rtype: afem.structure.props.MassProps
+        """
+        return MassProps(factor * self._mass, self._cg,
+                         factor * self._inertia, self._nparts)
+
+    @staticmethod
+    def combine(props):
+        """
+        Combine properties using the parallel axis theorem.
+
+        :param collections.Sequence(afem.structure.props.MassProps) props:
+            The properties.
+
+        :return: The combined properties.
+        :rtype: afem.structure.props.MassProps
+        """
+        props = list(props)
+        mass = sum(p._mass for p in props)
+        nparts = sum(p._nparts for p in props)
+        if mass <= 0.:
+            return MassProps(nparts=nparts)
+
+        cg = sum(p._mass * p._cg for p in props) / mass
+        inertia = zeros((3, 3), dtype=float)
+        for p in props:
+            d = p._cg - cg
+            inertia += p._inertia + p._mass * (d.dot(d) * eye(3) -
+                                               outer(d, d))
+        return MassProps(mass, cg, inertia, nparts)
+
+
+class MassRollup(object):
+    """
+    Mass property rollup of the parts in a group. The length, center of
+    gravity, and inertia of curve parts and the area, center of gravity, and
+    inertia of surface parts are computed for a unit density and cached
+    against the shape of each part, so a rollup after a build step only
+    computes the parts whose shape changed. The mass of each part is then
+    found by scaling with its thickness and density.
+
+    Thickness and density can be given as a single value or as a
+    dictionary whose keys are part type names. The type name of the part
+    and then the names of its base classes are looked up so, for example,
+    a "WingPart" entry applies to both spars and ribs. Types that are not
+    found use 1. For curve parts the thickness is used as the cross-section
+    area. Other parts are treated as solids and only use the density.
+
+    :param thickness: The thickness.
+    :type thickness: float or dict(str, float)
+    :param density: The density.
+    :type density: float or dict(str, float)
+    :param int nthreads: Number of threads used to compute the properties
+        of new or modified parts.
+    """
+
+    def __init__(self, thickness=1., density=1., nthreads=1):
+        self._thickness = thickness
+        self._density = density
+        self._nthreads = nthreads
+        self._cache = {}
+
+    @property
+    def ncached(self):
+        """
+        :return: Number of parts with cached properties.
+        :rtype: int
+        """
+        return len(self._cache)
+
+    def set_thickness(self, thickness):
+        """
+        Set the thickness. This does not require the properties to be
+        computed again.
+
+        :param thickness: The thickness.
+        :type thickness: float or dict(str, float)
+
+        :return: None.
+        """
+        self._thickness = thickness
+
+    def set_density(self, density):
+        """
+        Set the density. This does not require the properties to be computed
+        again.
+
+        :param density: The density.
+        :type density: float or dict(str, float)
+
+        :return: None.
+        """
+        self._density = density
+
+    def clear(self):
+        """
+        Clear the cached properties.
+
+        :return: None.
+        """
+        self._cache.clear()
+
+    def update(self, group=None, include_subgroup=True):
+        """
+        Compute the properties of any parts in the group that are not cached
+        or whose shape has changed. Parts that are no longer in the group are
+        removed from the cache.
+
+        :param group: The group. If *None* then the master group is used.
+        :type group: str or afem.structure.group.Group or None
+        :param bool include_subgroup: Option to recursively include parts
+            from any subgroups.
+
+        :return: The parts.
+        :rtype: list(afem.structure.entities.Part)
+        """
+        group = GroupAPI.get_group_or_master(group)
+        parts = group.get_parts(include_subgroup)
+
+        todo = []
+        for part in parts:
+            cached = self._cache.get(part)
+            if cached is None or cached[0] is not part.shape:
+                todo.append(part)
+
+        if todo:
+            with Tracer.span('MassRollup.update') as span:
+                if self._nthreads > 1 and len(todo) > 1:
+                    with ThreadPoolExecutor(self._nthreads) as executor:
+                        results = list(executor.map(_unit_props, todo))
+                else:
+                    results = [_unit_props(part) for part in todo]
+                if span:
+                    span.set(n_parts=len(parts), n_computed=len(todo))
+
+            for part, props in zip(todo, results):
+                self._cache[part] = (part.shape, props)
+
+        # Remove parts that are gone
+        GroupAPI.prune_cache(self._cache, parts, group, include_subgroup)
+
+        return parts
+
+    def part_props(self, part):
+        """
+        Get the properties of a part.
+
+        :param afem.structure.entities.Part part: The part.
+
+        :return: The properties.
+        :rtype: afem.structure.props.MassProps
+        """
+        cached = self._cache.get(part)
+        if cached is None or cached[0] is not part.shape:
+            props = _unit_props(part)
+            self._cache[part] = (part.shape, props)
+        else:
+            props = cached[1]
+        return props.scaled(self._factor(part))
+
+    def total(self, group=None, include_subgroup=True):
+        """
+        Get the combined properties of the parts in the group.
+
+        :param group: The group. If *None* then the master group is used.
+        :type group: str or afem.structure.group.Group or None
+        :param bool include_subgroup: Option to recursively include parts
+            from any subgroups.
+
+        :return: The properties.
+        :rtype: afem.structure.props.MassProps
+        """
+        parts = self.update(group, include_subgroup)
+        return MassProps.combine([self.part_props(p) for p in parts])
+
+    def by_type(self, group=None, include_subgroup=True):
+        """
+        Get the combined properties of the parts in the group for each part
+        type.
+
+        :param group: The group. If *None* then the master group is used.
+        :type group: str or afem.structure.group.Group or None
+        :param bool include_subgroup: Option to recursively include parts
+            from any subgroups.
+
+        :return: Dictionary where the key is the part type name and the value
+            is the properties.
+        :rtype: dict(str, afem.structure.props.MassProps)
+        """
+        parts = self.update(group, include_subgroup)
+        type_to_props = {}
+        for part in parts:
+            props = self.part_props(part)
+            type_to_props.setdefault(part.type_name, []).append(props)
+        return {type_: MassProps.combine(props)
+                for type_, props in type_to_props.items()}
+
+    def by_subgroup(self, group=None):
+        """
+        Get the combined properties of each subgroup of the group including
+        its own subgroups.
+
+        :param group: The group. If *None* then the master group is used.
+        :type group: str or afem.structure.group.Group or None
+
+        :return: Dictionary where the key is the subgroup name and the value
+            is the properties.
+        :rtype: dict(str, afem.structure.props.MassProps)
+        """
+        group = GroupAPI.get_group_or_master(group)
+        self.update(group, True)
+        return {child.name: self.total(child, True)
+                for child in group.children}
+
+    def _factor(self, part):
+        """
+        Get the factor to scale the unit density properties of a part.
+        """
+        density = _lookup(self._density, part)
+        if isinstance(part, (CurvePart, SurfacePart)):
+            return _lookup(self._thickness, part) * density
+        return density
+
+
+def _lookup(table, part):
+    """
+    Look up a value for the part type or its base types.
+    """
+    if not isinstance(table, dict):
+        return table
+    for cls in type(part).__mro__:
+        if cls.__name__ in table:
+            return table[cls.__name__]
+    return 1.
+
+
+def _unit_props(part):
+    """
+    Compute the properties of a part for a unit density.
+    """
+    if part.shape is None or part.shape.is_null:
+        return MassProps(nparts=1)
+    if isinstance(part, CurvePart):
+        props = LinearProps(part.shape)
+    elif isinstance(part, SurfacePart):
+        props = SurfaceProps(part.shape)
+    else:
+        props = VolumeProps(part.shape)
+    cg = props.cg
+    return MassProps(props.mass, (cg.x, cg.y, cg.z),
+                     props.matrix_of_inertia, 1)
@@ -0,0 +1,341 @@
+# This file is part of AFEM which provides an engineering toolkit for airframe
+# finite element modeling during conceptual design.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC (info@laughlinresearch.com)
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import itertools
+import multiprocessing
+from collections import OrderedDict, deque
+from multiprocessing.connection import wait
+from timeit import default_timer
+
+from afem.config import logger
+from afem.misc.trace import Tracer
+from afem.structure.group import GroupAPI
+from afem.structure.props import MassRollup
+
+__all__ = ["DesignPoint", "DesignSweep", "sweep_stats"]
+
+
+class DesignPoint(object):
+    """
+    A design point of a :class:`.DesignSweep`.
+
+    :param str name: The name.
+    :param dict params: The parameters passed to the build function.
+
+    :var str name: The name.
+    :var collections.OrderedDict params: The parameters.
+    :var str status: The status ("pending", "done", or "failed").
+    :var dict result: The results returned by the build function.
+    :var str error: The error message if the build failed.
+    :var float time: The time to build the design point in seconds.
+    """
+
+    def __init__(self, name, params):
+        self.name = name
+        self.params = OrderedDict(params)
+        self.status = 'pending'
+        self.result = {}
+        self.error = None
+        self.time = None
+
+
+class DesignSweep(object):
+    """
+    Run a structure build over a set of design points. The shared data
+    (e.g., the OML bodies imported from an OpenVSP model) is prepared once
+    in this process and each design point is then built in a forked worker
+    process, which shares the prepared data copy-on-write rather than
+    importing it again. Each worker starts from an empty group structure,
+    calls the build function with the shared data and the parameters of the
+    design point, and sends back the results. Since each design point has
+    its own process, a crash or hang only affects that design point.
+
+    The build function is called as ``build(shared, **params)`` and should
+    return a dictionary of small, picklable results like counts, masses,
+    mesh statistics, and output filenames rather than shapes or meshes (see
+    :func:`.sweep_stats`).
+
+    If *nworkers* is 1 or the platform cannot fork processes, the design
+    points are built one after another in this process. The groups of the
+    caller are saved before and restored after the design points are built.
+    Since all the design points then get the same shared objects, the build
+    function must not modify them (e.g., by changing the shape or reference
+    geometry of a shared body).
+
+    :param collections.Callable prepare: Function with no arguments that
+        returns the shared data.
+    :param collections.Callable build: The build function.
+    :param int nworkers: Maximum number of worker processes. If *None* then
+        the number of CPUs is used.
+    :param float timeout: Time in seconds after which a design point is
+        stopped and marked as failed. Only used with worker processes.
+    """
+
+    def __init__(self, prepare, build, nworkers=None, timeout=None):
+        if nworkers is None:
+            nworkers = multiprocessing.cpu_count()
+        self._prepare = prepare
+        self._build = build
+        self._nworkers = max(1, int(nworkers))
+        self._timeout = timeout
+        self._shared = None
+        self._is_prepared = False
+        self._points = []
+
+    @property
+    def shared(self):
+        """
+        :return: The shared data. The prepare function is called the first
+            time this is accessed. It should be treated as read-only.
+        """
+        if not self._is_prepared:
+            with Tracer.span('DesignSweep.prepare'):
+                self._shared = self._prepare()
+            self._is_prepared = True
+        return self._shared
+
+    @property
+    def points(self):
+        """
+        :return: The design points.
+        :rtype: list(afem.structure.sweep.DesignPoint)
+        """
+        return list(self._points)
+
+    def add_point(self, name=None, **params):
+        """
+        Add a design point.
+
+        :param str name: The name. If *None* then a name is created from
+            the index of the design point.
+        :param params: The parameters passed to the build function.
+
+        :return: The design point.
+        :rtype: afem.structure.sweep.DesignPoint
+        """
+        if name is None:
+            name = 'point_{}'.format(len(self._points) + 1)
+        point = DesignPoint(name, params)
+        self._points.append(point)
+        return point
+
+    def add_grid(self, **values):
+        """
+        Add a design point for each combination of parameter values.
+
+        :param values: The parameter names and a sequence of values for each.
+
+        :return: The design points.
+        :rtype: list(afem.structure.sweep.DesignPoint)
+        """
+        names = list(values.keys())
+        points = []
+        for combo in itertools.product(*[values[k] for k in names]):
+            points.append(self.add_point(**dict(zip(names, combo))))
+        return points
+
+    def run(self):
+        """
+        Build the design points that have not been built yet.
+
+        :return: The design points.
+        :rtype: list(afem.structure.sweep.DesignPoint)
+        """
+        points = [p for p in self._points if p.status == 'pending']
+        if not points:
+            return self.points
+
+        shared = self.shared
+        use_fork = 'fork' in multiprocessing.get_all_start_methods()
+        if self._nworkers > 1 and not use_fork:
+            logger.warning('Forking processes is not supported so design '
+                           'points are built in this process.')
+
+        with Tracer.span('DesignSweep.run', n_points=len(points),
+                         n_workers=self._nworkers):
+            if self._nworkers > 1 and use_fork:
+                self._run_forked(points)
+            else:
+                state = GroupAPI.save_state()
+                try:
+                    for point in points:
+                        _set_point(point, _build_point(self._build, shared,
+                                                       point.params))
+                finally:
+                    GroupAPI.restore_state(state)
+
+        nfailed = len([p for p in points if p.status == 'failed'])
+        if nfailed:
+            logger.warning('{} of {} design points failed.'.format(
+                nfailed, len(points)))
+        return self.points
+
+    def table(self, keys=None):
+        """
+        Format the parameters and results of the design points as a table.
+
+        :param collections.Sequence(str) keys: The result keys to include.
+            If *None* then all the keys found in the results are included.
+
+        :return: The table.
+        :rtype: str
+        """
+        params, results = [], []
+        for point in self._points:
+            params += [k for k in point.params if k not in params]
+            results += [k for k in point.result if k not in results]
+        if keys is not None:
+            results = list(keys)
+
+        header = ['name'] + params + results + ['time', 'status']
+        rows = [header]
+        for point in self._points:
+            row = [point.name]
+            row += [_fmt(point.params.get(k, '')) for k in params]
+            row += [_fmt(point.result.get(k, '')) for k in results]
+            row.append('' if point.time is None else
+                       '{:.2f}'.format(point.time))
+            row.append(point.error or point.status)
+            rows.append(row)
+
+        widths = [max(len(r[i]) for r in rows) for i in range(len(header))]
+        lines = ['  '.join(v.ljust(w) for v, w in zip(r, widths)).rstrip()
+                 for r in rows]
+        return '\n'.join(lines)
+
+    def _run_forked(self, points):
+        """
+        Build each design point in its own forked process.
+        """
+        ctx = multiprocessing.get_context('fork')
+        pending = deque(points)
+        running = {}
+
+        while pending or running:
+            while pending and len(running) < self._nworkers:
+                point = pending.popleft()
+                recv, send = ctx.Pipe(False)
+                proc = ctx.Process(target=_worker,
+                                   args=(self._build, self._shared,
+                                         point.params, send))
+                proc.start()
+                send.close()
+                running[recv] = (proc, point, default_timer())
+
+            for conn in wait(list(running.keys()), 1.):
+                proc, point, _ = running.pop(conn)
+                try:
+                    status = conn.recv()
+                except EOFError:
+                    status = None
+                proc.join()
+                conn.close()
+                if status is None:
+                    msg = 'Worker exited with code {}'.format(proc.exitcode)
+                    status = ('failed', {}, msg, None)
+                _set_point(point, status)
+
+            if self._timeout is None:
+                continue
+            now = default_timer()
+            for conn, (proc, point, t0) in list(running.items()):
+                if now - t0 > self._timeout:
+                    proc.terminate()
+                    proc.join()
+                    conn.close()
+                    del running[conn]
+                    msg = 'Timed out after {} s'.format(self._timeout)
+                    _set_point(point, ('failed', {}, msg, now - t0))
+
+
+def sweep_stats(the_mesh=None, group=None, thickness=1., density=1.):
+    """
+    Gather compact results of a structure build for a :class:`.DesignSweep`.
+
+    :param the_mesh: The mesh. If provided then the number of nodes and
+        elements are included.
+    :type the_mesh: afem.smesh.entities.Mesh or None
+    :param group: The group. If *None* then the master group is used.
+    :type group: str or afem.structure.group.Group or None
+    :param thickness: The thickness passed to :class:`.MassRollup`.
+    :type thickness: float or dict(str, float)
+    :param density: The density passed to :class:`.MassRollup`.
+    :type density: float or dict(str, float)
+
+    :return: Dictionary with the number of parts, mass, center of gravity,
+        and mesh counts.
+    :rtype: collections.OrderedDict
+    """
+    props = MassRollup(thickness, density).total(group)
+    stats = OrderedDict()
+    stats['n_parts'] = props.nparts
+    stats['mass'] = props.mass
+    stats['cg'] = tuple(props.cg)
+    if the_mesh is not None:
+        stats['n_nodes'] = the_mesh.num_nodes
+        stats['n_tris'] = the_mesh.num_tris
+        stats['n_quads'] = the_mesh.num_quads
+    return stats
+
+
+def _build_point(build, shared, params):
+    """
+    Build a design point from an empty group structure.
+    """
+    GroupAPI.reset()
+    t0 = default_timer()
+    try:
+        result = build(shared, **params)
+        return 'done', dict(result or {}), None, default_timer() - t0
+    except Exception as e:
+        msg = '{}: {}'.format(e.__class__.__name__, e)
+        return 'failed', {}, msg, default_timer() - t0
+
+
+def _worker(build, shared, params, conn):
+    """
+    Build a design point in a worker process and send back the results.
+    """
+    status = _build_point(build, shared, params)
+    try:
+        conn.send(status)
+    except Exception as e:
+        msg = 'Results could not be sent: {}'.format(e)
+        conn.send(('failed', {}, msg, status[3]))
+    conn.close()
+
+
+def _set_point(point, status):
+    """
+    Set the status of a design point.
+    """
+    point.status, point.result, point.error, point.time = status
+    if point.error:
+        logger.error('Design point {} failed: {}'.format(point.name,
+                                                         point.error))
+
+
+def _fmt(value):
+    """
+    Format a table value.
+    """
+    if isinstance(value, float):
+        return '{:.6g}'.format(value)
+    if isinstance(value, (tuple, list)):
+        return '(' + ', '.join(_fmt(v) for v in value) + ')'
+    return str(value)
@@ -29,6 +29,7 @@ from OCC.Core.TopoDS import TopoDS_Face
 
 from afem.config import logger
 from afem.geometry.entities import Surface
+from afem.misc.trace import Tracer
 from afem.occ.utils import to_topods_list
 from afem.topology.entities import Shape, Face, Solid, Compound
 from afem.topology.explore import ExploreWire
@@ -63,10 +64,15 @@ class BopCore(object):
 
         :return: None.
         """
-        if isinstance(self._bop, BOPAlgo_MakerVolume):
-            self._bop.Perform()
-        else:
-            self._bop.Build()
+        with Tracer.span('BopCore.build') as span:
+            if span:
+                span.set(**self._trace_attrs())
+            if isinstance(self._bop, BOPAlgo_MakerVolume):
+                self._bop.Perform()
+            else:
+                self._bop.Build()
+            if span:
+                span.set(is_done=self.is_done)
 
     @property
     def is_done(self):
@@ -120,6 +126,12 @@ class BopCore(object):
         """
         return self._bop.IsDeleted(shape.object)
 
+    def _trace_attrs(self):
+        """
+        Span attributes recorded when tracing the build.
+        """
+        return {'op': self.__class__.__name__}
+
 
 class BopAlgo(BopCore):
     """
@@ -271,6 +283,20 @@ class BopAlgo(BopCore):
         tools = to_topods_list(shapes)
         self._bop.SetTools(tools)
 
+    def _trace_attrs(self):
+        """
+        Span attributes recorded when tracing the build.
+        """
+        attrs = super(BopAlgo, self)._trace_attrs()
+        attrs['fuzzy_val'] = self._bop.FuzzyValue()
+        attrs['parallel'] = self._bop.RunParallel()
+        if isinstance(self._bop, BRepFeat_MakeCylindricalHole):
+            return attrs
+        attrs['n_args'] = self._bop.Arguments().Size()
+        if not isinstance(self._bop, BOPAlgo_MakerVolume):
+            attrs['n_tools'] = self._bop.Tools().Size()
+        return attrs
+
     @property
     def vertices(self):
         """
@@ -468,7 +494,7 @@ class IntersectShapes(BopAlgo):
             build2 = True
 
         if build1 and build2:
-            self._bop.Build()
+            self.build()
 
     def has_ancestor_face1(self, edge):
         """
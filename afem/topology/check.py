@@ -80,6 +80,14 @@ class CheckShape(object):
         """
         return self._invalid
 
+    @property
+    def errors(self):
+        """
+        :return: The error messages of the invalid sub-shapes.
+        :rtype: list(str)
+        """
+        return list(self._errors)
+
     def print_errors(self):
         """
         Print the errors.
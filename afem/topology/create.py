@@ -16,6 +16,8 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with this library; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+from collections import OrderedDict
+
 from OCC.Core.BRep import BRep_Builder, BRep_Tool
 from OCC.Core.BRepAlgo import brepalgo
 from OCC.Core.BRepBuilderAPI import (BRepBuilderAPI_FindPlane,
@@ -31,6 +33,8 @@ from OCC.Core.BRepPrimAPI import (BRepPrimAPI_MakeCylinder,
                               BRepPrimAPI_MakeHalfSpace, BRepPrimAPI_MakePrism,
                               BRepPrimAPI_MakeSphere, BRepPrimAPI_MakeBox)
 from OCC.Core.ShapeAnalysis import ShapeAnalysis_FreeBounds
+from OCC.Core.ShapeExtend import ShapeExtend_WireData
+from OCC.Core.ShapeFix import ShapeFix_Wire
 from OCC.Core.TopLoc import TopLoc_Location
 from OCC.Core.TopTools import TopTools_HSequenceOfShape
 from OCC.Core.TopoDS import TopoDS_Compound, TopoDS_Shell
@@ -51,7 +55,8 @@ from afem.topology.entities import (Shape, Vertex, Edge, Wire, Face, Shell,
 __all__ = ["VertexByPoint",
            "EdgeByPoints", "EdgeByVertices", "EdgeByCurve", "EdgeByDrag",
            "EdgeByWireConcat",
-           "WireByEdges", "WiresByConnectedEdges", "WireByPlanarOffset",
+           "WireByEdges", "WiresByConnectedEdges", "WiresByEdgeEndpoints",
+           "WireByPlanarOffset",
            "WiresByShape", "WireByPoints", "WireByConcat",
            "FaceBySurface", "FaceByPlane", "FaceByPlanarWire", "FaceByDrag",
            "ShellBySurface", "ShellByFaces", "ShellBySewing", "ShellByDrag",
@@ -347,6 +352,162 @@ class WiresByConnectedEdges(object):
         return self._wires
 
 
+class WiresByEdgeEndpoints(object):
+    """
+    Create ordered wires from a list of unsorted edges by connecting their
+    end points. The end points are hashed into a spatial grid so only nearby
+    end points are compared, which scales to the thousands of small edges a
+    section of a large shape can have. Two end points are connected if
+    their tolerance spheres overlap, where the tolerance of an end point is
+    the tolerance of its vertex unless *tol* is given. Connected end points
+    form nodes and the edges are traced from node to node, stopping where
+    more or less than two edges meet.
+
+    The wires are created in the order of the edges that start them so the
+    results do not depend on hashing. The order and orientation of the
+    original edges in each wire are also available.
+
+    :param collections.Sequence(afem.topology.entities.Edge) edges: The edges.
+    :param float tol: Connection tolerance. If *None* then the tolerance of
+        each vertex is used.
+    :param bool shared: Option to use only shared vertices to connect edges.
+        If *False* then geometric coincidence will be also checked.
+    """
+
+    def __init__(self, edges, tol=None, shared=False):
+        edges = [e for e in edges if e is not None and not e.is_null]
+        nedges = len(edges)
+
+        # End points and their tolerances
+        verts, pnts, radii = [], [], []
+        for e in edges:
+            for v in (e.first_vertex, e.last_vertex):
+                verts.append(v)
+                pnts.append(v.point)
+                if tol is None:
+                    radii.append(BRep_Tool.Tolerance_(v.object))
+                else:
+                    radii.append(0.5 * tol)
+
+        # Group the end points into nodes
+        parent = list(range(2 * nedges))
+        if shared:
+            first = {}
+            for i, v in enumerate(verts):
+                _union(parent, i, first.setdefault(v, i))
+        else:
+            size = max(2. * max(radii + [0.]), 1.0e-7)
+            grid = {}
+            for i, p in enumerate(pnts):
+                key = (int(p.x // size), int(p.y // size), int(p.z // size))
+                for dx in (-1, 0, 1):
+                    for dy in (-1, 0, 1):
+                        for dz in (-1, 0, 1):
+                            cell = (key[0] + dx, key[1] + dy, key[2] + dz)
+                            for j in grid.get(cell, ()):
+                                if p.distance(pnts[j]) <= radii[i] + radii[j]:
+                                    _union(parent, i, j)
+                grid.setdefault(key, []).append(i)
+        nodes = [_find(parent, i) for i in range(2 * nedges)]
+
+        # Edges at each node in the order of the end points
+        adjacent = OrderedDict()
+        for i, n in enumerate(nodes):
+            adjacent.setdefault(n, []).append(i)
+
+        # Trace open chains from nodes that are not in the middle of a wire
+        # and then the closed loops that remain
+        visited = [False] * nedges
+        chains = []
+        for n, ends in adjacent.items():
+            if len(ends) == 2:
+                continue
+            for i in ends:
+                if not visited[i // 2]:
+                    chains.append(_trace(i, nodes, adjacent, visited))
+        for i in range(nedges):
+            if not visited[i]:
+                chains.append(_trace(2 * i, nodes, adjacent, visited))
+
+        # Build the wires
+        wires, orders, reversed_, closed = [], [], [], []
+        for chain in chains:
+            wd = ShapeExtend_WireData()
+            prec = 0.
+            for i in chain:
+                e = edges[i // 2]
+                if i % 2:
+                    e = e.reversed()
+                wd.Add(e.object)
+                prec = max(prec, 2. * radii[i], 2. * radii[i ^ 1])
+            fix = ShapeFix_Wire()
+            fix.Load(wd)
+            fix.FixConnected(prec)
+            w = fix.Wire()
+            w.Closed(BRep_Tool.IsClosed_(w))
+            wires.append(Wire(w))
+            orders.append([i // 2 for i in chain])
+            reversed_.append([i % 2 == 1 for i in chain])
+            closed.append(nodes[chain[0]] == nodes[chain[-1] ^ 1])
+
+        self._wires = wires
+        self._orders = orders
+        self._reversed = reversed_
+        self._closed = closed
+
+    @property
+    def nwires(self):
+        """
+        :return: Number of wires.
+        :rtype: int
+        """
+        return len(self._wires)
+
+    @property
+    def wires(self):
+        """
+        :return: The wires.
+        :rtype: list(afem.topology.entities.Wire)
+        """
+        return self._wires
+
+    def edge_order(self, i):
+        """
+        Get the order of the original edges in a wire.
+
+        :param int i: The wire index.
+
+        :return: The indices of the original edges in the order they are
+            in the wire. Null edges are not counted.
+        :rtype: list(int)
+        """
+        return self._orders[i]
+
+    def is_reversed(self, i):
+        """
+        Get the orientation of the original edges in a wire.
+
+        :param int i: The wire index.
+
+        :return: For each edge in the order of the wire, *True* if the
+            original edge was reversed and *False* if not.
+        :rtype: list(bool)
+        """
+        return self._reversed[i]
+
+    def is_closed(self, i):
+        """
+        Check if a wire is closed.
+
+        :param int i: The wire index.
+
+        :return: *True* if the last edge of the wire connects to the first,
+            *False* if not.
+        :rtype: bool
+        """
+        return self._closed[i]
+
+
 class WireByPlanarOffset(object):
     """
     Create a wire by offsetting a planar wire or face.
@@ -1560,3 +1721,44 @@ def _param_on_adp_crv(adp_crv, shape, other_shape):
         umin = proj.nearest_param
         prms.append(umin)
     return min(prms)
+
+
+def _find(parent, i):
+    """
+    Find the root of an item in a union-find structure.
+    """
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _union(parent, i, j):
+    """
+    Join the sets of two items using the smaller root so the roots do not
+    depend on the order of joining.
+    """
+    ri, rj = _find(parent, i), _find(parent, j)
+    if ri != rj:
+        parent[max(ri, rj)] = min(ri, rj)
+
+
+def _trace(i, nodes, adjacent, visited):
+    """
+    Trace a chain of edges from the end point *i* (edge ``i // 2``). Each
+    item of the chain is the end point an edge is entered from, so an odd
+    value means the edge is reversed. The chain stops at nodes that do not
+    have exactly two edges or when it returns to a visited edge.
+    """
+    chain = []
+    while True:
+        visited[i // 2] = True
+        chain.append(i)
+        ends = adjacent[nodes[i ^ 1]]
+        if len(ends) != 2:
+            break
+        following = [j for j in ends if j != i ^ 1 and not visited[j // 2]]
+        if not following:
+            break
+        i = following[0]
+    return chain
@@ -23,8 +23,9 @@ from OCC.Core.Extrema import Extrema_ExtFlag_MIN
 from afem.adaptor.entities import FaceAdaptorSurface
 from afem.config import logger
 from afem.geometry.check import CheckGeom
+from afem.geometry.distance import CurveIndex
 from afem.geometry.entities import Point, Direction
-from afem.topology.entities import Shape, Vertex
+from afem.topology.entities import Edge, Shape, Vertex, Wire
 
 __all__ = ["DistanceShapeToShape", "DistanceShapeToShapes",
            "DistancePointToShapes"]
@@ -318,18 +319,7 @@ class DistanceShapeToShapes(object):
     """
 
     def __init__(self, shape, other_shapes):
-        results = []
-        for shape2 in other_shapes:
-            dist = DistanceShapeToShape(shape, shape2)
-            if dist.nsol == 0:
-                logger.warning("Could not calculate distance to a shape in "
-                               "DistanceShapeToShapes tool. Continuing...")
-                continue
-            results.append((dist.dmin, shape2))
-
-        results.sort(key=lambda tup: tup[0])
-        self._distances = [data[0] for data in results]
-        self._shapes = [data[1] for data in results]
+        self._distances, self._shapes = _sort_by_distance(shape, other_shapes)
 
     @property
     def dmin(self):
@@ -337,7 +327,7 @@ class DistanceShapeToShapes(object):
         :return: The minimum distance of all shapes.
         :rtype: float
         """
-        return self._distances[0]
+        return self._sorted()[0][0]
 
     @property
     def dmax(self):
@@ -345,7 +335,7 @@ class DistanceShapeToShapes(object):
         :return: The maximum distance of all shapes.
         :rtype: float
         """
-        return self._distances[-1]
+        return self._sorted()[0][-1]
 
     @property
     def sorted_distances(self):
@@ -353,7 +343,7 @@ class DistanceShapeToShapes(object):
         :return: List of sorted distances.
         :rtype: list(float)
         """
-        return self._distances
+        return self._sorted()[0]
 
     @property
     def nearest_shape(self):
@@ -361,7 +351,7 @@ class DistanceShapeToShapes(object):
         :return: The nearest shape.
         :rtype: afem.topology.entities.Shape
         """
-        return self._shapes[0]
+        return self._sorted()[1][0]
 
     @property
     def farthest_shape(self):
@@ -369,7 +359,7 @@ class DistanceShapeToShapes(object):
         :return: The farthest shape.
         :rtype: afem.topology.entities.Shape
         """
-        return self._shapes[-1]
+        return self._sorted()[1][-1]
 
     @property
     def sorted_shapes(self):
@@ -377,7 +367,13 @@ class DistanceShapeToShapes(object):
         :return: List of shapes sorted by distance.
         :rtype: list(afem.topology.entities.Shape)
         """
-        return self._shapes
+        return self._sorted()[1]
+
+    def _sorted(self):
+        """
+        Get the sorted distances and shapes.
+        """
+        return self._distances, self._shapes
 
 
 class DistancePointToShapes(DistanceShapeToShapes):
@@ -386,10 +382,19 @@ class DistancePointToShapes(DistanceShapeToShapes):
     results by distance. This method converts the point to a vertex and then
     uses :class:`.DistanceShapeToShapes`.
 
+    If all the other shapes are edges or wires, or a
+    :class:`.CurveIndex` of them is provided, the nearest shape is found
+    using the index and the sorted results of all the shapes are only
+    calculated when requested. Provide a :class:`.CurveIndex` to reuse it
+    for multiple points.
+
     :param point_like pnt: The point.
-    :param list(afem.topology.entities.Shape) other_shapes: The other shapes.
+    :param other_shapes: The other shapes.
+    :type other_shapes: list(afem.topology.entities.Shape) or
+        afem.geometry.distance.CurveIndex
 
-    :raise TypeError: If *pnt* cannot be converted to a point.
+    :raise TypeError: If *pnt* cannot be converted to a point or if the
+        :class:`.CurveIndex` contains something other than edges or wires.
     """
 
     def __init__(self, pnt, other_shapes):
@@ -397,5 +402,75 @@ class DistancePointToShapes(DistanceShapeToShapes):
         if not pnt:
             raise TypeError('Invalid point type provided.')
 
-        v = Vertex.by_point(pnt)
-        super(DistancePointToShapes, self).__init__(v, other_shapes)
+        if isinstance(other_shapes, CurveIndex):
+            index = other_shapes
+            if not all(isinstance(shape, (Edge, Wire))
+                       for shape in index.curves):
+                msg = 'The curve index must only contain edges or wires.'
+                raise TypeError(msg)
+        else:
+            other_shapes = list(other_shapes)
+            index = None
+            if other_shapes and all(isinstance(shape, (Edge, Wire))
+                                    for shape in other_shapes):
+                index = CurveIndex(other_shapes)
+
+        if index is None:
+            v = Vertex.by_point(pnt)
+            super(DistancePointToShapes, self).__init__(v, other_shapes)
+            return
+
+        self._pnt = pnt
+        self._others = index.curves
+        self._distances, self._shapes = None, None
+        i, d = index.nearest(pnt)
+        self._nearest = (d, self._others[i]) if i >= 0 else None
+
+    @property
+    def dmin(self):
+        """
+        :return: The minimum distance of all shapes.
+        :rtype: float
+        """
+        if self._distances is None and self._nearest is not None:
+            return self._nearest[0]
+        return super(DistancePointToShapes, self).dmin
+
+    @property
+    def nearest_shape(self):
+        """
+        :return: The nearest shape.
+        :rtype: afem.topology.entities.Shape
+        """
+        if self._distances is None and self._nearest is not None:
+            return self._nearest[1]
+        return super(DistancePointToShapes, self).nearest_shape
+
+    def _sorted(self):
+        """
+        Get the sorted distances and shapes.
+        """
+        if self._distances is None:
+            v = Vertex.by_point(self._pnt)
+            self._distances, self._shapes = _sort_by_distance(v, self._others)
+        return self._distances, self._shapes
+
+
+def _sort_by_distance(shape, other_shapes):
+    """
+    Calculate the distance between the shape and each of the other shapes and
+    return the distances and shapes sorted by distance.
+    """
+    results = []
+    for shape2 in other_shapes:
+        dist = DistanceShapeToShape(shape, shape2)
+        if dist.nsol == 0:
+            logger.warning("Could not calculate distance to a shape in "
+                           "DistanceShapeToShapes tool. Continuing...")
+            continue
+        results.append((dist.dmin, shape2))
+
+    results.sort(key=lambda tup: tup[0])
+    distances = [data[0] for data in results]
+    shapes = [data[1] for data in results]
+    return distances, shapes
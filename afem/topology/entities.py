@@ -39,7 +39,8 @@ from OCC.Core.TopAbs import TopAbs_SHAPE, TopAbs_VERTEX, TopAbs_EDGE
 from OCC.Core.TopAbs import TopAbs_WIRE, TopAbs_FACE, TopAbs_SHELL, TopAbs_SOLID
 from OCC.Core.TopAbs import TopAbs_COMPSOLID, TopAbs_COMPOUND
 from OCC.Core.TopExp import topexp
-from OCC.Core.TopTools import TopTools_IndexedMapOfShape
+from OCC.Core.TopTools import (TopTools_IndexedMapOfShape,
+                               TopTools_IndexedDataMapOfShapeListOfShape)
 from OCC.Core.TopoDS import (topods, TopoDS_Vertex, TopoDS_Edge, TopoDS_Wire,
                          TopoDS_Face, TopoDS_Shell, TopoDS_Solid,
                          TopoDS_Compound, TopoDS_CompSolid, TopoDS_Shape,
@@ -58,6 +59,13 @@ class Shape(ViewableItem):
     """
     Shape.
 
+    Sub-shape maps and ancestor maps are built on first access and cached
+    since the topology of the underlying shape is not expected to change
+    once wrapped. Methods of this class that modify the shape clear the
+    cache, but :meth:`.clear_cache` should be called if the underlying shape
+    is modified some other way. Tolerances are not cached since they are
+    stored on the shared sub-shapes and may be changed by other tools.
+
     :param OCC.Core.TopoDS.TopoDS_Shape shape: The underlying shape.
 
     :cvar OCC.Core.TopAbs.TopAbs_ShapeEnum.TopAbs_SHAPE SHAPE: Shape type.
@@ -92,6 +100,9 @@ class Shape(ViewableItem):
         # The underlying OCCT shape
         self._shape = shape
 
+        # Cache for sub-shape maps and other derived data
+        self._cache = {}
+
     def __hash__(self):
         """
         Use the hash code of the shape.
@@ -297,9 +308,7 @@ class Shape(ViewableItem):
         :return: The number of vertices in the shape.
         :rtype: int
         """
-        map_ = TopTools_IndexedMapOfShape()
-        topexp.MapShapes(self.object, Shape.VERTEX, map_)
-        return map_.Extent()
+        return self._map(Shape.VERTEX).Extent()
 
     @property
     def num_edges(self):
@@ -307,9 +316,7 @@ class Shape(ViewableItem):
         :return: The number of edges in the shape.
         :rtype: int
         """
-        map_ = TopTools_IndexedMapOfShape()
-        topexp.MapShapes(self.object, Shape.EDGE, map_)
-        return map_.Extent()
+        return self._map(Shape.EDGE).Extent()
 
     @property
     def num_faces(self):
@@ -317,9 +324,7 @@ class Shape(ViewableItem):
         :return: The number of faces in the shape.
         :rtype: int
         """
-        map_ = TopTools_IndexedMapOfShape()
-        topexp.MapShapes(self.object, Shape.FACE, map_)
-        return map_.Extent()
+        return self._map(Shape.FACE).Extent()
 
     @property
     def tol_avg(self):
@@ -344,7 +349,7 @@ class Shape(ViewableItem):
     @property
     def tol_max(self):
         """
-        :return: The minimum global tolerance.
+        :return: The maximum global tolerance.
         :rtype: float
         """
         tol = ShapeAnalysis_ShapeTolerance()
@@ -416,17 +421,138 @@ class Shape(ViewableItem):
         """
         return None
 
+    def _cached(self, key, func):
+        """
+        Get a cached value or compute it with *func* and cache it.
+        """
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = func()
+            self._cache[key] = value
+            return value
+
+    def _map(self, type_):
+        """
+        Get the indexed map of sub-shapes of a specified type.
+        """
+        def build():
+            map_ = TopTools_IndexedMapOfShape()
+            topexp.MapShapes(self.object, type_, map_)
+            return map_
+
+        return self._cached(('map', type_), build)
+
+    def _ancestor_map(self, type_, ancestor_type):
+        """
+        Get the map of sub-shapes of a specified type to their ancestors.
+        """
+        def build():
+            map_ = TopTools_IndexedDataMapOfShapeListOfShape()
+            topexp.MapShapesAndAncestors(self.object, type_, ancestor_type,
+                                         map_)
+            return map_
+
+        return self._cached(('ancestors', type_, ancestor_type), build)
+
     def _get_shapes(self, type_):
         """
-        Get sub-shapes of a specified type from the shape.
+        Get sub-shapes of a specified type from the shape. Only the map is
+        cached and new wrappers are returned each time, since methods like
+        :meth:`.reverse` modify the wrapper in place.
+        """
+        map_ = self._map(type_)
+        return [Shape.wrap(map_.FindKey(i)) for i in range(1, map_.Size() + 1)]
+
+    def _shared(self, other, type_, as_compound):
+        """
+        Get shared sub-shapes of a specified type using the cached maps.
         """
-        map_ = TopTools_IndexedMapOfShape()
-        topexp.MapShapes(self.object, type_, map_)
+        this_map = self._map(type_)
+        other_map = other._map(type_)
+        if this_map.Extent() == 0 or other_map.Extent() == 0:
+            return []
+
         shapes = []
-        for i in range(1, map_.Size() + 1):
-            shapes.append(Shape.wrap(map_.FindKey(i)))
+        for i in range(1, this_map.Size() + 1):
+            s1 = this_map.FindKey(i)
+            if other_map.Contains(s1):
+                shapes.append(Shape.wrap(s1))
+
+        if as_compound:
+            return Compound.by_shapes(shapes)
         return shapes
 
+    def clear_cache(self):
+        """
+        Clear the cached sub-shape maps and ancestor maps. This should be
+        called if the underlying shape is modified directly.
+
+        :return: None.
+        """
+        self._cache.clear()
+
+    def contains(self, shape):
+        """
+        Check if the shape is a sub-shape of this one using the cached map of
+        sub-shapes of its type (see :meth:`.is_same`).
+
+        :param afem.topology.entities.Shape shape: The sub-shape.
+
+        :return: *True* if a sub-shape, *False* if not.
+        :rtype: bool
+        """
+        return self._map(shape.shape_type).Contains(shape.object)
+
+    def index_of(self, shape):
+        """
+        Get the index of the sub-shape in the list of sub-shapes of its type
+        (e.g., in :attr:`.edges` for an edge).
+
+        :param afem.topology.entities.Shape shape: The sub-shape.
+
+        :return: The index or -1 if not a sub-shape.
+        :rtype: int
+        """
+        return self._map(shape.shape_type).FindIndex(shape.object) - 1
+
+    def ancestors(self, shape, type_):
+        """
+        Get the ancestors of a sub-shape of this shape.
+
+        :param afem.topology.entities.Shape shape: The sub-shape.
+        :param OCC.Core.TopAbs.TopAbs_ShapeEnum type_: The type of ancestors.
+
+        :return: The ancestors. This is empty if *shape* is not a sub-shape.
+        :rtype: list(afem.topology.entities.Shape)
+        """
+        map_ = self._ancestor_map(shape.shape_type, type_)
+        if not map_.Contains(shape.object):
+            return []
+        return Shape.from_topods_list(map_.FindFromKey(shape.object))
+
+    def edge_faces(self, edge):
+        """
+        Get the faces of this shape that contain the edge.
+
+        :param afem.topology.entities.Edge edge: The edge.
+
+        :return: The faces.
+        :rtype: list(afem.topology.entities.Face)
+        """
+        return self.ancestors(edge, Shape.FACE)
+
+    def vertex_edges(self, vertex):
+        """
+        Get the edges of this shape that contain the vertex.
+
+        :param afem.topology.entities.Vertex vertex: The vertex.
+
+        :return: The edges.
+        :rtype: list(afem.topology.entities.Edge)
+        """
+        return self.ancestors(vertex, Shape.EDGE)
+
     def nullify(self):
         """
         Destroy reference to underlying shape and make it null.
@@ -434,6 +560,7 @@ class Shape(ViewableItem):
         :return: None.
         """
         self.object.Nullify()
+        self.clear_cache()
 
     def reverse(self):
         """
@@ -442,6 +569,7 @@ class Shape(ViewableItem):
         :return: None.
         """
         self.object.Reverse()
+        self.clear_cache()
 
     def reversed(self):
         """
@@ -511,25 +639,7 @@ class Shape(ViewableItem):
         :rtype: list(afem.topology.entities.Vertex) or
             afem.topology.entities.Compound
         """
-        this_map = TopTools_IndexedMapOfShape()
-        topexp.MapShapes(self.object, Shape.VERTEX, this_map)
-        if this_map.Extent() == 0:
-            return []
-
-        other_map = TopTools_IndexedMapOfShape()
-        topexp.MapShapes(other.object, Shape.VERTEX, other_map)
-        if other_map.Extent() == 0:
-            return []
-
-        verts = []
-        for i in range(1, this_map.Size() + 1):
-            v1 = this_map.FindKey(i)
-            if other_map.Contains(v1):
-                verts.append(Shape.wrap(v1))
-
-        if as_compound:
-            return Compound.by_shapes(verts)
-        return verts
+        return self._shared(other, Shape.VERTEX, as_compound)
 
     def shared_edges(self, other, as_compound=False):
         """
@@ -543,25 +653,7 @@ class Shape(ViewableItem):
         :rtype: list(afem.topology.entities.Edge) or
             afem.topology.entities.Compound
         """
-        this_map = TopTools_IndexedMapOfShape()
-        topexp.MapShapes(self.object, Shape.EDGE, this_map)
-        if this_map.Extent() == 0:
-            return []
-
-        other_map = TopTools_IndexedMapOfShape()
-        topexp.MapShapes(other.object, Shape.EDGE, other_map)
-        if other_map.Extent() == 0:
-            return []
-
-        edges = []
-        for i in range(1, this_map.Size() + 1):
-            e1 = this_map.FindKey(i)
-            if other_map.Contains(e1):
-                edges.append(Shape.wrap(e1))
-
-        if as_compound:
-            return Compound.by_shapes(edges)
-        return edges
+        return self._shared(other, Shape.EDGE, as_compound)
 
     def shared_faces(self, other, as_compound=False):
         """
@@ -575,25 +667,7 @@ class Shape(ViewableItem):
         :rtype: list(afem.topology.entities.Face) or
             afem.topology.entities.Compound
         """
-        this_map = TopTools_IndexedMapOfShape()
-        topexp.MapShapes(self.object, Shape.FACE, this_map)
-        if this_map.Extent() == 0:
-            return []
-
-        other_map = TopTools_IndexedMapOfShape()
-        topexp.MapShapes(other.object, Shape.FACE, other_map)
-        if other_map.Extent() == 0:
-            return []
-
-        faces = []
-        for i in range(1, this_map.Size() + 1):
-            f1 = this_map.FindKey(i)
-            if other_map.Contains(f1):
-                faces.append(Shape.wrap(f1))
-
-        if as_compound:
-            return Compound.by_shapes(faces)
-        return faces
+        return self._shared(other, Shape.FACE, as_compound)
 
     @staticmethod
     def wrap(shape):
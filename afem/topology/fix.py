@@ -35,7 +35,10 @@ class FixShape(object):
     :param float precision: Basic precision value.
     :param float min_tol: Minimum allowed tolerance.
     :param float max_tol: Maximum allowed tolerance.
-    :param afem.topology.entities.Shape context: The context shape.
+    :param context: The context shape, or an existing context to record
+        the substitutions in so several fixes can share it.
+    :type context: afem.topology.entities.Shape or
+        OCC.Core.ShapeBuild.ShapeBuild_ReShape
 
     .. note::
 
@@ -55,7 +58,9 @@ class FixShape(object):
         if max_tol is not None:
             self._tool.SetMaxTolerance(max_tol)
 
-        if context is not None:
+        if isinstance(context, ShapeBuild_ReShape):
+            self._tool.SetContext(context)
+        elif context is not None:
             reshape = ShapeBuild_ReShape()
             reshape.Apply(context.object)
             self._tool.SetContext(reshape)
@@ -90,6 +95,41 @@ class FixShape(object):
         """
         return Shape.wrap(self.context.Apply(shape.object))
 
+    @staticmethod
+    def fix_sub_shapes(sub_shapes, shapes, precision=None, min_tol=None,
+                       max_tol=None):
+        """
+        Fix several sub-shapes and apply the substitutions to the shapes that
+        contain them. All the substitutions are recorded in one context, so
+        a sub-shape shared by more than one shape is fixed once and every
+        shape gets the same replacement.
+
+        :param sub_shapes: The sub-shapes to fix.
+        :type sub_shapes: collections.Sequence(afem.topology.entities.Shape)
+        :param shapes: The shapes to apply the substitutions to.
+        :type shapes: collections.Sequence(afem.topology.entities.Shape)
+        :param float precision: Basic precision value.
+        :param float min_tol: Minimum allowed tolerance.
+        :param float max_tol: Maximum allowed tolerance.
+
+        :return: The new shapes in the same order. A shape is returned as is
+            if none of its sub-shapes were modified.
+        :rtype: list(afem.topology.entities.Shape)
+        """
+        context = ShapeBuild_ReShape()
+        for sub_shape in sub_shapes:
+            fix = FixShape(sub_shape, precision, min_tol, max_tol, context)
+            context.Replace(sub_shape.object, fix.shape.object)
+
+        new_shapes = []
+        for shape in shapes:
+            new_shape = context.Apply(shape.object)
+            if new_shape.IsEqual(shape.object):
+                new_shapes.append(shape)
+            else:
+                new_shapes.append(Shape.wrap(new_shape))
+        return new_shapes
+
     @staticmethod
     def limit_tolerance(shape, tol=1.0e-7, styp=Shape.SHAPE):
         """
@@ -107,6 +147,7 @@ class FixShape(object):
         # Limit tolerance then fix in case of invalid tolerances
         _fix_tol.LimitTolerance(shape.object, tol, tol, styp)
         ShapeFix_Shape(shape.object).Perform()
+        shape.clear_cache()
         return BRepCheck_Analyzer(shape.object, False).IsValid()
 
     @staticmethod
@@ -121,4 +162,5 @@ class FixShape(object):
 
         :return: None.
         """
-        return _fix_tol.SetTolerance(shape.object, tol, styp)
+        _fix_tol.SetTolerance(shape.object, tol, styp)
+        shape.clear_cache()
@@ -28,6 +28,7 @@ from OCC.Core.TopTools import (TopTools_DataMapOfShapeShape,
                            TopTools_IndexedMapOfShape)
 
 from afem.geometry.entities import Geometry
+from afem.misc.trace import Tracer
 from afem.topology.entities import Shape, Edge, Compound
 
 __all__ = ["DivideClosedShape", "DivideContinuityShape", "DivideC0Shape",
@@ -194,7 +195,7 @@ class SewShape(object):
 
         if shape is not None:
             self._tool.Load(shape.object)
-            self._tool.Perform()
+            self.perform()
 
     def load(self, shape):
         """
@@ -222,7 +223,15 @@ class SewShape(object):
 
         :return: None.
         """
-        self._tool.Perform()
+        with Tracer.span('SewShape.perform') as span:
+            if span:
+                span.set(tol=self._tool.Tolerance(),
+                         min_tol=self._tool.MinTolerance(),
+                         max_tol=self._tool.MaxTolerance())
+            self._tool.Perform()
+            if span:
+                span.set(n_free_edges=self.n_free_edges,
+                         n_multiple_edges=self.n_multiple_edges)
 
     @property
     def sewed_shape(self):
@@ -0,0 +1,359 @@
+# This file is part of AFEM which provides an engineering toolkit for airframe
+# finite element modeling during conceptual design.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC (info@laughlinresearch.com)
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+from collections import OrderedDict
+
+from OCC.Core.BRep import BRep_Tool
+from OCC.Core.BRepMesh import BRepMesh_IncrementalMesh
+from OCC.Core.TopAbs import TopAbs_REVERSED
+from OCC.Core.TopLoc import TopLoc_Location
+from numpy import array, cross, float64, int32, zeros
+from numpy.linalg import norm
+from scipy.spatial import cKDTree
+
+from afem.base.entities import VersionedItem
+from afem.misc.trace import Tracer
+from afem.topology.entities import Shape
+from afem.topology.transform import relative_transformation
+
+__all__ = ["Tessellation", "TessellationCache"]
+
+
+class Tessellation(object):
+    """
+    Triangulation of the faces of a shape gathered into arrays.
+
+    :param afem.topology.entities.Shape shape: The shape. It should already
+        be meshed using ``BRepMesh_IncrementalMesh``.
+    :param float deflection: The deflection used to mesh the shape.
+    :param bool relative: Option indicating that *deflection* was relative to
+        the size of the edges.
+    """
+
+    def __init__(self, shape, deflection, relative=False):
+        self._shape = shape
+        self._deflection = deflection
+        self._relative = relative
+        self._kdt = None
+
+        verts, tris, faces = [], [], []
+        nverts = 0
+        for i, face in enumerate(shape.faces):
+            loc = TopLoc_Location()
+            poly = BRep_Tool.Triangulation_(face.object, loc)
+            if poly is None or poly.IsNull():
+                continue
+            trsf = loc.Transformation()
+            for j in range(1, poly.NbNodes() + 1):
+                p = poly.Node(j).Transformed(trsf)
+                verts.append((p.X(), p.Y(), p.Z()))
+            reverse = face.object.Orientation() == TopAbs_REVERSED
+            for j in range(1, poly.NbTriangles() + 1):
+                n1, n2, n3 = poly.Triangle(j).Get()
+                if reverse:
+                    n2, n3 = n3, n2
+                tris.append((nverts + n1 - 1, nverts + n2 - 1,
+                             nverts + n3 - 1))
+                faces.append(i)
+            nverts += poly.NbNodes()
+
+        self._verts = array(verts, dtype=float64).reshape(-1, 3)
+        self._tris = array(tris, dtype=int32).reshape(-1, 3)
+        self._faces = array(faces, dtype=int32)
+
+    @property
+    def shape(self):
+        """
+        :return: The shape.
+        :rtype: afem.topology.entities.Shape
+        """
+        return self._shape
+
+    @property
+    def deflection(self):
+        """
+        :return: The deflection used to mesh the shape.
+        :rtype: float
+        """
+        return self._deflection
+
+    @property
+    def vertices(self):
+        """
+        :return: The vertices as an (n, 3) array. Vertices shared by faces
+            are repeated for each face.
+        :rtype: numpy.ndarray
+        """
+        return self._verts
+
+    @property
+    def triangles(self):
+        """
+        :return: The vertex indices of each triangle as an (m, 3) array.
+        :rtype: numpy.ndarray
+        """
+        return self._tris
+
+    @property
+    def face_indices(self):
+        """
+        :return: The index of the face in ``shape.faces`` that each triangle
+            belongs to.
+        :rtype: numpy.ndarray
+        """
+        return self._faces
+
+    @property
+    def nverts(self):
+        """
+        :return: Number of vertices.
+        :rtype: int
+        """
+        return self._verts.shape[0]
+
+    @property
+    def ntris(self):
+        """
+        :return: Number of triangles.
+        :rtype: int
+        """
+        return self._tris.shape[0]
+
+    @property
+    def normals(self):
+        """
+        :return: The unit normal of each triangle as an (m, 3) array.
+        :rtype: numpy.ndarray
+        """
+        v = self._verts[self._tris]
+        n = cross(v[:, 1] - v[:, 0], v[:, 2] - v[:, 0])
+        d = norm(n, axis=1)
+        d[d == 0.] = 1.
+        return n / d[:, None]
+
+    def located(self, shape):
+        """
+        Create the tessellation of a shape sharing the same TShape as this
+        one but with a different location or orientation by transforming the
+        vertices rather than meshing again.
+
+        :param afem.topology.entities.Shape shape: The located shape.
+
+        :return: The tessellation.
+        :rtype: afem.topology.tessellate.Tessellation
+
+        :raise ValueError: If the shapes do not share the same TShape.
+        """
+        trsf = relative_transformation(self._shape, shape)
+        m = array([[trsf.Value(i, j) for j in range(1, 5)]
+                   for i in range(1, 4)], dtype=float64)
+
+        tess = Tessellation.__new__(Tessellation)
+        tess._shape = shape
+        tess._deflection = self._deflection
+        tess._relative = self._relative
+        tess._kdt = None
+        tess._verts = self._verts.dot(m[:, :3].T) + m[:, 3]
+        tess._tris = self._tris
+        if shape.object.Orientation() != self._shape.object.Orientation():
+            tess._tris = self._tris[:, [0, 2, 1]]
+        tess._faces = self._faces
+        return tess
+
+    def bounds(self, pad=None):
+        """
+        Get the bounding box of the vertices.
+
+        :param float pad: The amount to enlarge the box by. If not provided
+            then the deflection is used so the box encloses the shape. A
+            relative deflection is scaled by the largest box dimension.
+
+        :return: The minimum and maximum corners of the box.
+        :rtype: tuple(numpy.ndarray, numpy.ndarray)
+
+        :raise ValueError: If there are no vertices.
+        """
+        if self.nverts == 0:
+            raise ValueError('The tessellation has no vertices.')
+        vmin, vmax = self._verts.min(axis=0), self._verts.max(axis=0)
+        if pad is None:
+            pad = self._deflection
+            if self._relative:
+                pad *= (vmax - vmin).max()
+        return vmin - pad, vmax + pad
+
+    def nearest_distance(self, pnts):
+        """
+        Distance from each point to the nearest vertex. Since the vertices
+        are on the shape, this is an upper bound of the distance to the
+        shape and can be used as a coarse estimate before exact methods.
+
+        :param pnts: The points.
+        :type pnts: collections.Sequence(point_like) or
+            afem.geometry.entities.PointArray
+
+        :return: The distances.
+        :rtype: numpy.ndarray
+
+        :raise ValueError: If there are no vertices.
+        """
+        if self.nverts == 0:
+            raise ValueError('The tessellation has no vertices.')
+        if self._kdt is None:
+            self._kdt = cKDTree(self._verts)
+        xyz = getattr(pnts, 'xyz', None)
+        if xyz is None:
+            xyz = array([tuple(p) for p in pnts], dtype=float64)
+        d, _ = self._kdt.query(xyz.reshape(-1, 3))
+        return d
+
+    def write_stl(self, fn):
+        """
+        Write the triangles to a binary STL file.
+
+        :param str fn: The filename.
+
+        :return: None.
+        """
+        records = zeros(self.ntris, dtype=[('normal', '<f4', (3,)),
+                                           ('verts', '<f4', (3, 3)),
+                                           ('attr', '<u2')])
+        records['normal'] = self.normals
+        records['verts'] = self._verts[self._tris]
+        with open(fn, 'wb') as fout:
+            fout.write(b'AFEM binary STL'.ljust(80, b' '))
+            array([self.ntris], dtype='<u4').tofile(fout)
+            records.tofile(fout)
+
+
+class TessellationCache(object):
+    """
+    Cache of shape tessellations shared by the viewer, STL export, and
+    coarse distance checks. Each shape is meshed at most once for a given
+    set of parameters using ``BRepMesh_IncrementalMesh`` in parallel over
+    its faces. Entries are keyed by the shape (see :meth:`.Shape.is_same`),
+    its version if a part or body is given, and the meshing parameters. A
+    shape that only differs from a cached one by orientation or location
+    (see :func:`.instance_shape`) reuses its tessellation. The least
+    recently used entries are dropped once there are more than *max_size*.
+
+    :cvar int max_size: Maximum number of cached tessellations.
+    """
+    max_size = 64
+    _cache = OrderedDict()
+
+    @classmethod
+    def get(cls, shape, deflection=0.001, angle=0.5, relative=True,
+            parallel=True):
+        """
+        Get the tessellation of a shape, meshing it if needed.
+
+        :param shape: The shape. If a part or body is given, its shape is
+            used and the shape is meshed again once its version changes.
+        :type shape: afem.topology.entities.Shape or
+            OCC.Core.TopoDS.TopoDS_Shape or afem.core.entities.ShapeHolder
+        :param float deflection: The linear deflection.
+        :param float angle: The angular deflection in radians.
+        :param bool relative: Option to treat *deflection* as relative to
+            the size of each edge.
+        :param bool parallel: Option to mesh the faces in parallel.
+
+        :return: The tessellation.
+        :rtype: afem.topology.tessellate.Tessellation
+        """
+        version = None
+        if isinstance(shape, VersionedItem):
+            version = shape.version
+            shape = shape.shape
+        if not isinstance(shape, Shape):
+            shape = Shape.wrap(shape)
+
+        key = (shape, version, float(deflection), float(angle),
+               bool(relative))
+        tess = cls._cache.pop(key, None)
+        if tess is not None and not tess.shape.object.IsEqual(shape.object):
+            tess = tess.located(shape)
+        if tess is None and version is not None:
+            cls._discard_versions(shape, version)
+        if tess is None:
+            tess = cls._find_partner(key)
+        if tess is None:
+            with Tracer.span('TessellationCache.get') as span:
+                BRepMesh_IncrementalMesh(shape.object, deflection, relative,
+                                         angle, parallel)
+                tess = Tessellation(shape, deflection, relative)
+                if span:
+                    span.set(deflection=deflection, n_faces=shape.num_faces,
+                             n_tris=tess.ntris)
+        cls._cache[key] = tess
+
+        while len(cls._cache) > cls.max_size:
+            cls._cache.popitem(last=False)
+        return tess
+
+    @classmethod
+    def discard(cls, shape):
+        """
+        Remove all tessellations of a shape and its instances. This should be
+        used if a shape is modified in place without the version of a part
+        or body changing.
+
+        :param afem.topology.entities.Shape shape: The shape.
+
+        :return: None.
+        """
+        for key in [k for k in cls._cache if k[0].is_partner(shape)]:
+            del cls._cache[key]
+
+    @classmethod
+    def clear(cls):
+        """
+        Remove all tessellations.
+
+        :return: None.
+        """
+        cls._cache.clear()
+
+    @classmethod
+    def size(cls):
+        """
+        :return: Number of cached tessellations.
+        :rtype: int
+        """
+        return len(cls._cache)
+
+    @classmethod
+    def _find_partner(cls, key):
+        """
+        Find a tessellation of an instance of the shape with the same
+        parameters and relocate it.
+        """
+        shape = key[0]
+        for other, tess in cls._cache.items():
+            if other[1:] == key[1:] and other[0].is_partner(shape):
+                return tess.located(shape)
+        return None
+
+    @classmethod
+    def _discard_versions(cls, shape, version):
+        """
+        Remove the tessellations of other versions of a shape.
+        """
+        for key in [k for k in cls._cache if k[1] is not None and
+                    k[1] != version and k[0].is_same(shape)]:
+            del cls._cache[key]
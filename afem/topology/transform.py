@@ -17,17 +17,22 @@
 # License along with this library; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
 from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_Transform
+from OCC.Core.TopLoc import TopLoc_Location
 from OCC.Core.gce import gce_MakeMirror
 
 from afem.topology.entities import Shape
 
 
-def mirror_shape(shape, pln):
+def mirror_shape(shape, pln, instance=False):
     """
     Mirror a shape about a plane.
 
     :param afem.topology.entities.Shape shape: The shape.
     :param afem.geometry.entities.Plane pln: The plane.
+    :param bool instance: If *True*, the mirrored shape will share the
+        underlying topology and geometry of *shape* and only differ in its
+        location (see :func:`.instance_shape`). If *False*, the shape is
+        copied.
 
     :return: The mirrored shape.
     :rtype: afem.topology.entities.Shape
@@ -35,7 +40,70 @@ def mirror_shape(shape, pln):
     :raise RuntimeError: If the transformation fails or is not done.
     """
     trsf = gce_MakeMirror(pln.gp_pln).Value()
+    if instance:
+        return instance_shape(shape, trsf)
+    return transform_shape(shape, trsf)
+
+
+def transform_shape(shape, trsf):
+    """
+    Transform a copy of the shape.
+
+    :param afem.topology.entities.Shape shape: The shape.
+    :param OCC.Core.gp.gp_Trsf trsf: The transformation.
+
+    :return: The transformed shape.
+    :rtype: afem.topology.entities.Shape
+
+    :raise RuntimeError: If the transformation fails or is not done.
+    """
     builder = BRepBuilderAPI_Transform(shape.object, trsf, True)
     if not builder.IsDone():
-        raise RuntimeError('Failed to mirror the shape.')
+        raise RuntimeError('Failed to transform the shape.')
     return Shape.wrap(builder.Shape())
+
+
+def instance_shape(shape, trsf):
+    """
+    Create an instance of the shape by applying the transformation to its
+    location. The instance shares the same TShape with the original shape
+    (see :meth:`.Shape.is_partner`) so nothing is copied and data attached
+    to the underlying topology, like face triangulations, is shared. If the
+    transformation is a reflection, the orientation of the instance is
+    reversed so that solids are not turned inside out.
+
+    :param afem.topology.entities.Shape shape: The shape.
+    :param OCC.Core.gp.gp_Trsf trsf: The transformation. It should not
+        contain a scale factor.
+
+    :return: The instanced shape.
+    :rtype: afem.topology.entities.Shape
+
+    .. note::
+
+        Not all OpenCASCADE algorithms handle mirrored locations so
+        :func:`.transform_shape` may be needed before modifying the shape.
+    """
+    instance = shape.object.Moved(TopLoc_Location(trsf))
+    if trsf.IsNegative():
+        instance.Reverse()
+    return Shape.wrap(instance)
+
+
+def relative_transformation(shape, instance):
+    """
+    Get the transformation that moves *shape* to *instance*.
+
+    :param afem.topology.entities.Shape shape: The shape.
+    :param afem.topology.entities.Shape instance: A shape sharing the same
+        TShape.
+
+    :return: The transformation.
+    :rtype: OCC.Core.gp.gp_Trsf
+
+    :raise ValueError: If the shapes do not share the same TShape.
+    """
+    if not shape.is_partner(instance):
+        raise ValueError('The shapes do not share the same TShape.')
+    trsf = instance.object.Location().Transformation()
+    return trsf.Multiplied(shape.object.Location().Transformation().Inverted())
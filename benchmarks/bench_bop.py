@@ -0,0 +1,237 @@
+# This file is part of AFEM which provides an engineering toolkit for airframe
+# finite element modeling during conceptual design.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC (info@laughlinresearch.com)
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+"""
+Speed and robustness of Boolean operations over captured BREP pairs.
+
+Every pair of ``*_shape1.brep``/``*_shape2.brep`` files in ``test/test_io``
+and every pair of ``<Op>.shape1.<timestamp>.brep``/``<Op>.shape2.<...>``
+files written by ``BopAlgo.debug`` in the given debug directories is run
+through each Boolean operation for each fuzzy value with parallel mode off
+and on. The wall time, whether the operation is done, whether the result
+is valid, and the sub-shape counts of the result are recorded. Each pair
+runs in a fresh process so a crash or hang only affects that pair.
+
+Usage::
+
+    python bench_bop.py run [--debug-dirs dumps] [--ops fuse cut]
+                            [--fuzzy 0 1e-7 1e-5] [--repeat 1]
+                            [--timeout 300] [--output results.json]
+    python bench_bop.py summary results.json
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import platform
+import time
+from collections import OrderedDict
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_TEST_IO = os.path.join(_ROOT, 'test', 'test_io')
+
+OPS = ['fuse', 'cut', 'common', 'intersect', 'split']
+
+
+def find_pairs(debug_dirs=()):
+    """
+    Find the BREP pairs in ``test/test_io`` and the debug directories.
+
+    :return: Dictionary where the key is the pair name and the value is the
+        two filenames.
+    :rtype: collections.OrderedDict
+    """
+    pairs = OrderedDict()
+    for fn1 in sorted(glob.glob(os.path.join(_TEST_IO, '*_shape1.brep'))):
+        fn2 = fn1.replace('_shape1.brep', '_shape2.brep')
+        if os.path.isfile(fn2):
+            name = os.path.basename(fn1).replace('_shape1.brep', '')
+            pairs[name] = (fn1, fn2)
+
+    for path in debug_dirs:
+        for fn1 in sorted(glob.glob(os.path.join(path, '*.shape1.*.brep'))):
+            fn2 = fn1.replace('.shape1.', '.shape2.')
+            if os.path.isfile(fn2):
+                name = os.path.basename(fn1).replace('.shape1.', '.')
+                pairs[name[:-len('.brep')]] = (fn1, fn2)
+    return pairs
+
+
+def _build(op, shape1, shape2, fuzzy_val):
+    from afem.topology.bop import (FuseShapes, CutShapes, CommonShapes,
+                                   IntersectShapes, SplitShapes)
+
+    if op == 'fuse':
+        return FuseShapes(shape1, shape2, fuzzy_val)
+    if op == 'cut':
+        return CutShapes(shape1, shape2, fuzzy_val)
+    if op == 'common':
+        return CommonShapes(shape1, shape2, fuzzy_val)
+    if op == 'intersect':
+        return IntersectShapes(shape1, shape2, fuzzy_val=fuzzy_val)
+    return SplitShapes(shape1, shape2, fuzzy_val)
+
+
+def run_pair(fn1, fn2, ops, fuzzy_vals, repeat):
+    """
+    Run the operations for one pair. Intended to be called in a fresh
+    process.
+
+    :return: List of records.
+    :rtype: list(dict)
+    """
+    from afem.config import Settings
+    from afem.exchange.brep import read_brep
+    from afem.topology.bop import BopAlgo
+    from afem.topology.check import CheckShape
+
+    Settings.set_log_file(None)
+    records = []
+    for op in ops:
+        for fuzzy_val in fuzzy_vals:
+            for parallel in (False, True):
+                BopAlgo.set_parallel_mode(parallel)
+                record = OrderedDict([('op', op), ('fuzzy', fuzzy_val),
+                                      ('parallel', parallel),
+                                      ('time_s', None), ('done', False),
+                                      ('valid', False), ('counts', None),
+                                      ('error', None)])
+                try:
+                    times = []
+                    for _ in range(repeat):
+                        # Read every time since the inputs may be modified
+                        shape1, shape2 = read_brep(fn1), read_brep(fn2)
+                        t0 = time.perf_counter()
+                        bop = _build(op, shape1, shape2, fuzzy_val or None)
+                        times.append(time.perf_counter() - t0)
+                    record['time_s'] = min(times)
+                    record['done'] = bool(bop.is_done)
+                    if bop.is_done:
+                        shape = bop.shape
+                        record['valid'] = (not shape.is_null and
+                                           CheckShape(shape).is_valid)
+                        record['counts'] = OrderedDict([
+                            ('vertices', shape.num_vertices),
+                            ('edges', shape.num_edges),
+                            ('faces', shape.num_faces),
+                            ('solids', len(shape.solids))])
+                except Exception as e:
+                    record['error'] = '{}: {}'.format(e.__class__.__name__, e)
+                records.append(record)
+    BopAlgo.set_parallel_mode(False)
+    return records
+
+
+def run(pairs, ops, fuzzy_vals, repeat, timeout, fn):
+    results = {'meta': {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                        'python': platform.python_version(),
+                        'platform': platform.platform(),
+                        'cpus': multiprocessing.cpu_count(),
+                        'repeat': repeat},
+               'pairs': OrderedDict()}
+    for name, (fn1, fn2) in pairs.items():
+        print(name)
+        pool = multiprocessing.Pool(1, maxtasksperchild=1)
+        try:
+            job = pool.apply_async(run_pair, (fn1, fn2, ops, fuzzy_vals,
+                                              repeat))
+            records = job.get(timeout)
+            pool.close()
+        except multiprocessing.TimeoutError:
+            records = {'error': 'Timed out after {} s'.format(timeout)}
+            pool.terminate()
+        except Exception as e:
+            records = {'error': '{}: {}'.format(e.__class__.__name__, e)}
+            pool.terminate()
+        finally:
+            pool.join()
+
+        if isinstance(records, dict):
+            print('  FAILED: {}'.format(records['error']))
+        else:
+            for r in records:
+                status = 'valid' if r['valid'] else (
+                    'invalid' if r['done'] else 'failed')
+                print('  {:<10}{:>8}{:>6}{:>10}  {}'.format(
+                    r['op'], r['fuzzy'], 'par' if r['parallel'] else 'seq',
+                    _sec(r['time_s']), r['error'] or status))
+        results['pairs'][name] = records
+
+    with open(fn, 'w') as fout:
+        json.dump(results, fout, indent=1)
+    print('Results written to {}'.format(fn))
+    return results
+
+
+def summary(fn):
+    """
+    Print the number of valid results and the total time for each
+    operation, fuzzy value, and parallel mode.
+    """
+    with open(fn) as fin:
+        results = json.load(fin)
+
+    rows = OrderedDict()
+    for records in results['pairs'].values():
+        if isinstance(records, dict):
+            continue
+        for r in records:
+            key = (r['op'], r['fuzzy'], r['parallel'])
+            row = rows.setdefault(key, [0, 0, 0, 0.])
+            row[0] += 1
+            row[1] += r['done']
+            row[2] += r['valid']
+            row[3] += r['time_s'] or 0.
+
+    fmt = '{:<10}{:>8}{:>6}{:>7}{:>7}{:>7}{:>10}'
+    print(fmt.format('op', 'fuzzy', 'mode', 'runs', 'done', 'valid',
+                     'time (s)'))
+    for (op, fuzzy, parallel), (n, done, valid, t) in rows.items():
+        print(fmt.format(op, fuzzy, 'par' if parallel else 'seq', n, done,
+                         valid, '{:.3f}'.format(t)))
+
+
+def _sec(value):
+    return '-' if value is None else '{:.3f}'.format(value)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    sub = parser.add_subparsers(dest='command')
+
+    p_run = sub.add_parser('run', help='Run the Boolean operations.')
+    p_run.add_argument('--debug-dirs', nargs='+', default=[])
+    p_run.add_argument('--ops', nargs='+', default=OPS, choices=OPS)
+    p_run.add_argument('--fuzzy', nargs='+', type=float,
+                       default=[0., 1.e-7, 1.e-5, 1.e-3])
+    p_run.add_argument('--repeat', type=int, default=1)
+    p_run.add_argument('--timeout', type=float, default=300.)
+    p_run.add_argument('--output', default='bench_bop.json')
+
+    p_sum = sub.add_parser('summary', help='Summarize a result file.')
+    p_sum.add_argument('results')
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        run(find_pairs(args.debug_dirs), args.ops, args.fuzzy, args.repeat,
+            args.timeout, args.output)
+    elif args.command == 'summary':
+        summary(args.results)
+    else:
+        parser.print_help()
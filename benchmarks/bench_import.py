@@ -0,0 +1,110 @@
+# This file is part of AFEM which provides an engineering toolkit for airframe
+# finite element modeling during conceptual design.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC (info@laughlinresearch.com)
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+"""
+Benchmark the time to import AFEM packages in fresh interpreters, as paid by
+each worker process in a process pool.
+
+Usage::
+
+    python bench_import.py [--modules afem.structure afem.exchange]
+                           [--repeat 5]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+_SCRIPT = """
+import sys, time
+t0 = time.perf_counter()
+import {module}
+t = time.perf_counter() - t0
+n = sum(1 for m in list(sys.modules) if m.startswith('OCC.'))
+print(t, n)
+"""
+
+_DEFAULT_MODULES = ['afem', 'afem.config', 'afem.structure', 'afem.smesh',
+                    'afem.exchange', 'afem.geometry', 'afem.topology']
+
+
+def time_import(module, repeat):
+    """
+    Import *module* in *repeat* fresh interpreters started in an empty
+    directory.
+
+    :return: Import times in milliseconds, the number of OCC modules loaded,
+        and whether any file (e.g., a log file) was created.
+    :rtype: tuple(list(float), int, bool)
+    """
+    env = os.environ.copy()
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = os.pathsep.join([root, env.get('PYTHONPATH', '')])
+
+    times = []
+    nocc = 0
+    created = False
+    for _ in range(repeat):
+        cwd = tempfile.mkdtemp()
+        out = subprocess.check_output(
+            [sys.executable, '-c', _SCRIPT.format(module=module)], cwd=cwd,
+            env=env, universal_newlines=True)
+        t, nocc = out.split()[-2:]
+        times.append(1000. * float(t))
+        nocc = int(nocc)
+        created = created or bool(os.listdir(cwd))
+        for fn in os.listdir(cwd):
+            os.remove(os.path.join(cwd, fn))
+        os.rmdir(cwd)
+    return times, nocc, created
+
+
+def run(modules, repeat, fn=None):
+    rows = []
+    for module in modules:
+        times, nocc, created = time_import(module, repeat)
+        times.sort()
+        rows.append({'module': module,
+                     'min_ms': times[0],
+                     'median_ms': times[len(times) // 2],
+                     'occ_modules': nocc,
+                     'creates_files': created})
+
+    print('{:<18}{:>12}{:>14}{:>8}{:>8}'.format('module', 'min (ms)',
+                                                'median (ms)', 'OCC', 'files'))
+    for r in rows:
+        print('{:<18}{:>12.1f}{:>14.1f}{:>8d}{:>8}'.format(
+            r['module'], r['min_ms'], r['median_ms'], r['occ_modules'],
+            'yes' if r['creates_files'] else 'no'))
+
+    if fn is not None:
+        with open(fn, 'w') as fout:
+            json.dump(rows, fout, indent=1)
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--modules', nargs='+', default=_DEFAULT_MODULES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default=None,
+                        help='Optional JSON file to write the results to.')
+    args = parser.parse_args()
+    run(args.modules, args.repeat, args.output)
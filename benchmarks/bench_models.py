@@ -0,0 +1,380 @@
+# This file is part of AFEM which provides an engineering toolkit for airframe
+# finite element modeling during conceptual design.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC (info@laughlinresearch.com)
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+"""
+End-to-end benchmarks over the bundled models.
+
+Each case runs headless stages (import, part building, fusing, discarding,
+meshing, and BDF export) in a fresh process and records the wall time, the
+peak resident set size, and entity counts of each stage.
+
+Usage::
+
+    python bench_models.py run [--cases simple_wing wingbox_777]
+                               [--output results.json]
+    python bench_models.py compare base.json new.json [--time-tol 0.1]
+                                                      [--rss-tol 0.1]
+
+The *compare* command exits with a non-zero status if a regression is found.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_MODELS = os.path.join(_ROOT, 'models')
+
+
+def peak_rss_mb():
+    """
+    :return: Peak resident set size of this process in MB or *None* if not
+        available on this platform.
+    :rtype: float or None
+    """
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kB, macOS reports bytes
+    if sys.platform == 'darwin':
+        return rss / 1024. ** 2
+    return rss / 1024.
+
+
+class StageRecorder(object):
+    """
+    Record wall time, peak RSS, and entity counts for named stages.
+    """
+
+    def __init__(self):
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Time a stage. The yielded dictionary can be filled with entity counts.
+        """
+        counts = OrderedDict()
+        t0 = time.perf_counter()
+        yield counts
+        dt = time.perf_counter() - t0
+        self.stages.append({'name': name,
+                            'time_s': dt,
+                            'peak_rss_mb': peak_rss_mb(),
+                            'counts': counts})
+        print('  {:<12}{:>10.3f} s  {}'.format(name, dt, dict(counts)))
+
+
+def _part_counts(counts, parts):
+    counts['parts'] = len(parts)
+    counts['faces'] = sum(p.shape.num_faces for p in parts)
+    counts['edges'] = sum(p.shape.num_edges for p in parts)
+
+
+def _mesh_and_export(rec, target_size, tmp):
+    from afem.structure.mesh import MeshVehicle
+
+    with rec.stage('mesh') as counts:
+        the_mesh = MeshVehicle(target_size)
+        counts['status'] = bool(the_mesh.compute())
+        counts['nodes'] = the_mesh.mesh.num_nodes
+        counts['elements'] = the_mesh.mesh.num_faces
+
+    with rec.stage('export_bdf') as counts:
+        fn = os.path.join(tmp, 'model.bdf')
+        the_mesh.export_nastran(fn)
+        counts['bytes'] = os.path.getsize(fn)
+
+
+def case_simple_wing(rec, tmp):
+    """
+    Import the simple OpenVSP wing and build, join, mesh, and export a wing
+    box.
+    """
+    from afem.exchange import ImportVSP
+    from afem.structure import (GroupAPI, SparByParameters, RibByPoints,
+                                RibsAlongCurveByDistance, SkinByBody,
+                                FuseSurfaceParts)
+
+    with rec.stage('import') as counts:
+        vsp = ImportVSP(os.path.join(_MODELS, 'simple_wing.stp'))
+        wing = vsp['WingGeom']
+        counts['bodies'] = len(vsp.bodies)
+        counts['faces'] = wing.shape.num_faces
+
+    with rec.stage('build') as counts:
+        wingbox = GroupAPI.create_group('wing box')
+        fspar = SparByParameters('front spar', 0.15, 0., 0.15, 1., wing).part
+        rspar = SparByParameters('rear spar', 0.70, 0., 0.70, 1., wing).part
+        RibByPoints('root rib', fspar.cref.p1, rspar.cref.p1, wing)
+        RibByPoints('tip rib', fspar.cref.p2, rspar.cref.p2, wing)
+        RibsAlongCurveByDistance('rib', rspar.cref, 30, fspar.shape,
+                                 rspar.shape, wing, d1=30, d2=-30)
+        internal_parts = wingbox.get_parts()
+        skin = SkinByBody('skin', wing).part
+        _part_counts(counts, wingbox.get_parts())
+
+    with rec.stage('discard') as counts:
+        cref = wing.sref.u_iso(0.5)
+        skin.discard_by_dmin(cref, 1.0)
+        counts['skin_faces'] = skin.shape.num_faces
+
+    with rec.stage('fuse') as counts:
+        FuseSurfaceParts([skin], internal_parts)
+        _part_counts(counts, wingbox.get_parts())
+
+    _mesh_and_export(rec, 4., tmp)
+
+
+def case_wingbox_777(rec, tmp):
+    """
+    Load the 777-200LR bodies and build, join, mesh, and export a main wing
+    box.
+    """
+    from afem.oml import Body
+    from afem.structure import (GroupAPI, SparByParameters, RibByPoints,
+                                RibsAlongCurveByDistance, SkinByBody,
+                                FuseSurfacePartsByCref, DiscardByCref)
+
+    with rec.stage('import') as counts:
+        bodies = Body.load_bodies(os.path.join(_MODELS, '777-200LR.xbf'))
+        wing = bodies['Wing']
+        counts['bodies'] = len(bodies)
+        counts['faces'] = wing.shape.num_faces
+
+    with rec.stage('build') as counts:
+        GroupAPI.create_group('RH main wingbox')
+        fspar = SparByParameters('front spar', 0.15, 0.05, 0.15, 0.925,
+                                 wing).part
+        rspar = SparByParameters('rear spar', 0.65, 0.05, 0.65, 0.925,
+                                 wing).part
+        RibByPoints('root rib', fspar.cref.p1, rspar.cref.p1, wing)
+        RibByPoints('tip rib', fspar.cref.p2, rspar.cref.p2, wing)
+        RibsAlongCurveByDistance('rib', rspar.cref, 30., fspar.shape,
+                                 rspar.shape, wing, d1=30., d2=-30.)
+        internal_parts = GroupAPI.get_parts(order=True)
+        _part_counts(counts, internal_parts)
+
+    with rec.stage('fuse') as counts:
+        FuseSurfacePartsByCref(internal_parts)
+        skin = SkinByBody('wing skin', wing, False).part
+        skin.fuse(*internal_parts)
+        _part_counts(counts, GroupAPI.get_parts())
+
+    with rec.stage('discard') as counts:
+        DiscardByCref(internal_parts)
+        skin.discard_by_dmin(wing.sref_shape, 0.1)
+        skin.fix()
+        _part_counts(counts, GroupAPI.get_parts())
+
+    _mesh_and_export(rec, 4., tmp)
+
+
+def case_supersonic_import(rec, tmp):
+    """
+    Import the supersonic OpenVSP model.
+    """
+    from afem.exchange import ImportVSP
+
+    with rec.stage('import') as counts:
+        vsp = ImportVSP(os.path.join(_MODELS, 'supersonic.stp'))
+        counts['bodies'] = len(vsp.bodies)
+        counts['faces'] = sum(b.shape.num_faces for b in vsp.all_bodies)
+
+
+def case_tbw_load(rec, tmp):
+    """
+    Load the truss-braced wing bodies.
+    """
+    from afem.oml import Body
+
+    with rec.stage('import') as counts:
+        bodies = Body.load_bodies(os.path.join(_MODELS, 'tbw.xbf'))
+        counts['bodies'] = len(bodies)
+        counts['faces'] = sum(b.shape.num_faces for b in bodies.values())
+
+
+def case_ucrm_brep(rec, tmp):
+    """
+    Read the uCRM wing BREP files.
+    """
+    from afem.exchange.brep import read_brep
+
+    with rec.stage('import') as counts:
+        shapes = [read_brep(os.path.join(_MODELS, 'uCRM', fn))
+                  for fn in ('lhs_wing.brep', 'rhs_wing.brep')]
+        counts['faces'] = sum(s.num_faces for s in shapes)
+
+
+CASES = OrderedDict([('simple_wing', case_simple_wing),
+                     ('wingbox_777', case_wingbox_777),
+                     ('supersonic_import', case_supersonic_import),
+                     ('tbw_load', case_tbw_load),
+                     ('ucrm_brep', case_ucrm_brep)])
+
+
+def run_case(name):
+    """
+    Run a case and return its record. Intended to be called in a fresh
+    process so peak RSS and global state are isolated.
+    """
+    rec = StageRecorder()
+    tmp = tempfile.mkdtemp()
+    record = {'stages': rec.stages, 'error': None}
+    t0 = time.perf_counter()
+    try:
+        from afem.config import Settings
+        Settings.set_log_file(None)
+        CASES[name](rec, tmp)
+    except Exception as e:
+        record['error'] = '{}: {}'.format(e.__class__.__name__, e)
+    record['total_s'] = time.perf_counter() - t0
+    for fn in os.listdir(tmp):
+        os.remove(os.path.join(tmp, fn))
+    os.rmdir(tmp)
+    return record
+
+
+def _git_commit():
+    try:
+        out = subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=_ROOT,
+                                      stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.decode().strip()
+
+
+def run(cases, fn):
+    results = {'meta': {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                        'commit': _git_commit(),
+                        'python': platform.python_version(),
+                        'platform': platform.platform(),
+                        'cpus': multiprocessing.cpu_count()},
+               'cases': OrderedDict()}
+    for name in cases:
+        print(name)
+        pool = multiprocessing.Pool(1, maxtasksperchild=1)
+        try:
+            record = pool.apply(run_case, (name,))
+        finally:
+            pool.close()
+            pool.join()
+        if record['error']:
+            print('  FAILED: {}'.format(record['error']))
+        results['cases'][name] = record
+
+    with open(fn, 'w') as fout:
+        json.dump(results, fout, indent=1)
+    print('Results written to {}'.format(fn))
+    return results
+
+
+def compare(base_fn, new_fn, time_tol=0.1, rss_tol=0.1, min_time=0.05):
+    """
+    Compare two result files and report regressions.
+
+    A stage regresses if its time grows by more than *time_tol* (relative)
+    and *min_time* seconds (absolute), or its peak RSS grows by more than
+    *rss_tol*. Changed entity counts and new failures are also flagged.
+
+    :return: Number of regressions.
+    :rtype: int
+    """
+    with open(base_fn) as fin:
+        base = json.load(fin)
+    with open(new_fn) as fin:
+        new = json.load(fin)
+
+    fmt = '{:<18}{:<12}{:>10}{:>10}{:>9}{:>10}{:>10}  {}'
+    print(fmt.format('case', 'stage', 'base (s)', 'new (s)', 'ratio',
+                     'base MB', 'new MB', 'flags'))
+    nreg = 0
+    for case, new_rec in new['cases'].items():
+        base_rec = base['cases'].get(case)
+        if base_rec is None:
+            continue
+        if new_rec['error'] and not base_rec['error']:
+            print(fmt.format(case, '-', '-', '-', '-', '-', '-',
+                             'FAILED: ' + new_rec['error']))
+            nreg += 1
+            continue
+        base_stages = dict((s['name'], s) for s in base_rec['stages'])
+        for s in new_rec['stages']:
+            b = base_stages.get(s['name'])
+            if b is None:
+                continue
+            flags = []
+            ratio = s['time_s'] / b['time_s'] if b['time_s'] > 0. else 1.
+            if (ratio > 1. + time_tol and
+                    s['time_s'] - b['time_s'] > min_time):
+                flags.append('TIME')
+            rss_b, rss_n = b['peak_rss_mb'], s['peak_rss_mb']
+            if rss_b and rss_n and rss_n > rss_b * (1. + rss_tol):
+                flags.append('RSS')
+            if s['counts'] != b['counts']:
+                flags.append('COUNTS')
+            nreg += len(flags) > 0
+            print(fmt.format(case, s['name'], '{:.3f}'.format(b['time_s']),
+                             '{:.3f}'.format(s['time_s']),
+                             '{:.2f}'.format(ratio), _mb(rss_b), _mb(rss_n),
+                             ' '.join(flags)))
+    print('{} regression(s) found.'.format(nreg))
+    return nreg
+
+
+def _mb(value):
+    return '-' if value is None else '{:.0f}'.format(value)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    sub = parser.add_subparsers(dest='command')
+
+    p_run = sub.add_parser('run', help='Run the benchmark cases.')
+    p_run.add_argument('--cases', nargs='+', default=list(CASES),
+                       choices=list(CASES))
+    p_run.add_argument('--output', default='bench_models.json')
+
+    p_cmp = sub.add_parser('compare', help='Compare two result files.')
+    p_cmp.add_argument('base')
+    p_cmp.add_argument('new')
+    p_cmp.add_argument('--time-tol', type=float, default=0.1)
+    p_cmp.add_argument('--rss-tol', type=float, default=0.1)
+    p_cmp.add_argument('--min-time', type=float, default=0.05)
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        run(args.cases, args.output)
+    elif args.command == 'compare':
+        n = compare(args.base, args.new, args.time_tol, args.rss_tol,
+                    args.min_time)
+        sys.exit(1 if n else 0)
+    else:
+        parser.print_help()
@@ -0,0 +1,105 @@
+# This file is part of AFEM which provides an engineering toolkit for airframe
+# finite element modeling during conceptual design.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC (info@laughlinresearch.com)
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+"""
+Micro-benchmarks for transferring NURBS data between OpenCASCADE and NumPy.
+
+Usage::
+
+    python bench_nurbs_data.py [--sizes 25 100 250] [--repeat 5]
+"""
+import argparse
+import timeit
+
+from numpy import linspace, meshgrid, ones, stack, sin
+
+from afem.geometry import NurbsCurve, NurbsSurface
+from afem.occ import utils as occ_utils
+
+
+def dense_net(n):
+    """
+    Generate an n x n bicubic control net and its knot data.
+    """
+    x, y = meshgrid(linspace(0., 100., n), linspace(0., 50., n),
+                    indexing='ij')
+    z = 5. * sin(x / 10.) * sin(y / 10.)
+    cp = stack((x, y, z), axis=2)
+    nk = n - 2
+    knots = linspace(0., 1., nk)
+    mult = ones(nk, dtype=int)
+    mult[0] = mult[-1] = 4
+    return cp, knots, mult
+
+
+def bench(stmt, repeat, number=1):
+    """
+    Return the best time of *repeat* runs in milliseconds.
+    """
+    t = timeit.repeat(stmt, repeat=repeat, number=number)
+    return 1000. * min(t) / number
+
+
+def run(sizes, repeat):
+    rows = []
+    for n in sizes:
+        cp, knots, mult = dense_net(n)
+        srf = NurbsSurface.by_data(cp, knots, knots, mult, mult, 3, 3)
+        crv = NurbsCurve.by_data(cp[:, 0], knots, mult, 3)
+        tcol_cp = occ_utils.to_tcolgp_array2_pnt(cp)
+
+        def cold_cp():
+            srf.clear_cache()
+            return srf.cp
+
+        def cold_cpw():
+            srf.clear_cache()
+            return srf.cpw
+
+        results = [
+            ('to_tcolgp_array2_pnt', bench(
+                lambda: occ_utils.to_tcolgp_array2_pnt(cp), repeat)),
+            ('to_np_from_tcolgp_array2_pnt', bench(
+                lambda: occ_utils.to_np_from_tcolgp_array2_pnt(tcol_cp),
+                repeat)),
+            ('NurbsSurface.by_data', bench(
+                lambda: NurbsSurface.by_data(cp, knots, knots, mult, mult,
+                                             3, 3), repeat)),
+            ('NurbsSurface.cp (cold)', bench(cold_cp, repeat)),
+            ('NurbsSurface.cp (cached)', bench(lambda: srf.cp, repeat, 100)),
+            ('NurbsSurface.cpw (cold)', bench(cold_cpw, repeat)),
+            ('NurbsCurve.by_data', bench(
+                lambda: NurbsCurve.by_data(cp[:, 0], knots, mult, 3),
+                repeat)),
+        ]
+        for name, t in results:
+            rows.append((n, name, t))
+
+    print('{:>6}  {:<32}{:>12}'.format('n', 'case', 'time (ms)'))
+    for n, name, t in rows:
+        print('{:>6}  {:<32}{:>12.3f}'.format(n, name, t))
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[25, 100, 250])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
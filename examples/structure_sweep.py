@@ -0,0 +1,47 @@
+from afem.config import Settings
+from afem.exchange import ImportVSP
+from afem.structure import *
+from afem.structure.mesh import MeshVehicle
+
+Settings.log_to_console()
+
+# Set units to inch.
+Settings.set_units('in')
+
+
+def prepare():
+    # Import the model once. The workers share it.
+    fn = r'../models/simple_wing.stp'
+    vsp_import = ImportVSP(fn)
+    return {'wing': vsp_import['WingGeom']}
+
+
+def build(shared, fspar_u, rib_spacing, target_size):
+    wing = shared['wing']
+
+    fspar = SparByParameters('front spar', fspar_u, 0., fspar_u, 1.,
+                             wing).part
+    rspar = SparByParameters('rear spar', 0.70, 0., 0.70, 1., wing).part
+    RibByPoints('root rib', fspar.cref.p1, rspar.cref.p1, wing)
+    RibByPoints('tip rib', fspar.cref.p2, rspar.cref.p2, wing)
+    RibsAlongCurveByDistance('rib', rspar.cref, rib_spacing, fspar.shape,
+                             rspar.shape, wing, d1=rib_spacing,
+                             d2=-rib_spacing)
+    internal_parts = GroupAPI.get_master().get_parts()
+    skin = SkinByBody('skin', wing).part
+    cref = wing.sref.u_iso(0.5)
+    skin.discard_by_dmin(cref, 1.0)
+
+    FuseSurfaceParts([skin], internal_parts)
+
+    mesh = MeshVehicle(target_size)
+    mesh.compute()
+    return sweep_stats(mesh.mesh, thickness=0.1, density=0.1)
+
+
+if __name__ == '__main__':
+    sweep = DesignSweep(prepare, build, nworkers=4, timeout=600.)
+    sweep.add_grid(fspar_u=[0.15, 0.20], rib_spacing=[20., 30.],
+                   target_size=[4.])
+    sweep.run()
+    print(sweep.table())
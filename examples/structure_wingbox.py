@@ -74,7 +74,7 @@ def build_wingbox(wing, params):
     # Generate points along rear spar and project to front spar to define ribs.
     prear = rspar.points_by_distance(rib_spacing, d1=rib_spacing,
                                      d2=-rib_spacing)
-    pfront = [p.copy() for p in prear]
+    pfront = prear.copy()
     rspar_norm = rspar.sref.norm(0, 0)
     fspar.points_to_cref(pfront, rspar_norm)
     i = 1
@@ -120,7 +120,7 @@ def build_wingbox(wing, params):
         u2 = root.cref.invert(mspar.cref.p1)
         builder = PointsAlongCurveByNumber(root.cref, 3, u2=u2)
         prib = builder.interior_points
-        pfront = [p.copy() for p in prib]
+        pfront = prib.copy()
         fspar.points_to_cref(pfront, rspar_norm)
         for pf, pr in zip(pfront, prib):
             if pf.is_equal(pr):
@@ -138,7 +138,7 @@ def build_wingbox(wing, params):
         u2 = root.cref.invert(rspar.cref.p1)
         builder = PointsAlongCurveByNumber(root.cref, 3, u1=u1, u2=u2)
         prib = builder.interior_points
-        pfront = [p.copy() for p in prib]
+        pfront = prib.copy()
         fspar.points_to_cref(pfront, rspar_norm)
         for pf, pr in zip(pfront, prib):
             if pf.is_equal(pr):
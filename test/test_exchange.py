@@ -0,0 +1,201 @@
+# This file is part of AFEM which provides an engineering toolkit for airframe
+# finite element modeling during conceptual design.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC (info@laughlinresearch.com)
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import json
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+from numpy import array, memmap
+
+from afem.exchange.binmesh import MeshArrays
+from afem.exchange.nastran import read_bdf, write_bdf
+
+
+def _mesh_arrays(groups=True):
+    """
+    Mesh arrays of two faces and an edge made by hand.
+    """
+    data = {'node_ids': array([1, 2, 3, 4]),
+            'node_xyz': array([(0., 0., 0.), (1., 0., 0.), (1., 1., 0.),
+                               (0., 1., 0.)]),
+            'node_shapes': array([1, 1, 2, 0]),
+            'elm_ids': array([5, 6, 7]),
+            'elm_types': array([2, 3, 3]),
+            'elm_shapes': array([1, 2, 2]),
+            'elm_offsets': array([0, 2, 5, 8]),
+            'elm_nodes': array([1, 2, 1, 2, 3, 1, 3, 4])}
+    if groups:
+        data['group_offsets'] = array([0, 2, 2])
+        data['group_members'] = array([6, 7])
+        return MeshArrays(data, [('faces', 3), ('empty', 3)])
+    data['group_offsets'] = array([0])
+    data['group_members'] = array([], dtype=int)
+    return MeshArrays(data)
+
+
+def _bdf_lines():
+    """
+    Lines of a bulk data file mixing small, large, and free field cards.
+    """
+    return ['$ Nodes and elements',
+            'BEGIN BULK',
+            '%-8s%8s%8s%8s%8s%8s' % ('GRID', '1', '', '2.5+1', '1.5-3', '0.'),
+            '%-8s%16s%16s%16s%16s' % ('GRID*', '2', '', '-2.0-1', '0.'),
+            '%-8s%16s' % ('*', '2.0'),
+            'GRID,3,,1.0,1.0,0.0',
+            'GRID,4,,0.0,1.0,0.0',
+            '%-8s%8s%8s%8s%8s%8s%8s' % ('CQUAD4', '11', '7', '1', '2', '3',
+                                        '4'),
+            'CTRIA3,10,7,1,2,3',
+            '%-8s%8s%8s%8s%8s' % ('CBAR', '12', '8', '1', '2'),
+            'PSHELL         7       1      1.',
+            'ENDDATA']
+
+
+class TestExchangeBinmesh(unittest.TestCase):
+    """
+    Test cases for afem.exchange.binmesh.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.fn = os.path.join(self.tmpdir, 'mesh.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_header(self):
+        _mesh_arrays().save(self.fn)
+        self.assertEqual(os.path.getsize(self.fn) % 64, 0)
+        with open(self.fn, 'rb') as fin:
+            self.assertEqual(fin.read(8), b'AFEMMESH')
+            version, nbytes = struct.unpack('<II', fin.read(8))
+            header = json.loads(fin.read(nbytes).decode('utf-8'))
+        self.assertEqual(header['version'], version)
+        self.assertEqual(header['groups'], [['faces', 3], ['empty', 3]])
+        self.assertEqual(header['arrays']['node_xyz'][:2], ['<f8', [4, 3]])
+        # The file holds every array after the aligned header
+        start = -(-(16 + nbytes) // 64) * 64
+        end = 0
+        for dt, shape, offset in header['arrays'].values():
+            self.assertEqual(offset % 64, 0)
+            nbytes = int(dt[2:])
+            for n in shape:
+                nbytes *= n
+            end = max(end, offset + nbytes)
+        self.assertGreaterEqual(os.path.getsize(self.fn), start + end)
+
+    def test_round_trip(self):
+        arrays = _mesh_arrays()
+        arrays.save(self.fn)
+        for mmap in (True, False):
+            loaded = MeshArrays.load(self.fn, mmap)
+            self.assertEqual(isinstance(loaded.node_xyz, memmap), mmap)
+            self.assertEqual(loaded.num_nodes, 4)
+            self.assertEqual(loaded.num_elms, 3)
+            self.assertListEqual(loaded.node_xyz.tolist(),
+                                 arrays.node_xyz.tolist())
+            self.assertListEqual(loaded.node_shapes.tolist(), [1, 1, 2, 0])
+            self.assertListEqual(loaded.elm_types.tolist(), [2, 3, 3])
+            self.assertListEqual(loaded.elm_nids(1).tolist(), [1, 2, 3])
+            self.assertListEqual(loaded.elm_nids(2).tolist(), [1, 3, 4])
+            self.assertListEqual(loaded.group_names, ['faces', 'empty'])
+            self.assertEqual(loaded.group_type(0), 3)
+            self.assertListEqual(loaded.group_ids(0).tolist(), [6, 7])
+            self.assertEqual(loaded.group_ids(1).size, 0)
+            del loaded
+
+    def test_empty_arrays(self):
+        _mesh_arrays(False).save(self.fn)
+        for mmap in (True, False):
+            loaded = MeshArrays.load(self.fn, mmap)
+            self.assertEqual(loaded.num_groups, 0)
+            self.assertListEqual(loaded.group_names, [])
+            self.assertListEqual(loaded.elm_ids.tolist(), [5, 6, 7])
+            del loaded
+
+    def test_not_binmesh(self):
+        with open(self.fn, 'wb') as fout:
+            fout.write(b'NOTAMESH' + b'\0' * 56)
+        self.assertRaises(ValueError, MeshArrays.load, self.fn)
+
+
+class TestExchangeNastran(unittest.TestCase):
+    """
+    Test cases for afem.exchange.nastran.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.fn = os.path.join(self.tmpdir, 'mesh.bdf')
+        with open(self.fn, 'w') as fout:
+            fout.write('\n'.join(_bdf_lines()) + '\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_read_bdf(self):
+        # Small chunks split the large field card from its continuation
+        nlines = len(_bdf_lines())
+        for chunk_size in list(range(1, nlines + 1)) + [1000000]:
+            arrays = read_bdf(self.fn, chunk_size)
+            self.assertEqual(arrays.num_nodes, 4)
+            self.assertEqual(arrays.num_elms, 3)
+
+            nodes = dict(zip(arrays.node_ids.tolist(),
+                             arrays.node_xyz.tolist()))
+            self.assertListEqual(sorted(nodes), [1, 2, 3, 4])
+            for nid, xyz in [(1, (25., 1.5e-3, 0.)), (2, (-0.2, 0., 2.)),
+                             (3, (1., 1., 0.)), (4, (0., 1., 0.))]:
+                for x1, x2 in zip(nodes[nid], xyz):
+                    self.assertAlmostEqual(x1, x2)
+
+            elms = {}
+            for i, eid in enumerate(arrays.elm_ids.tolist()):
+                elms[eid] = arrays.elm_nids(i).tolist()
+            self.assertDictEqual(elms, {10: [1, 2, 3], 11: [1, 2, 3, 4],
+                                        12: [1, 2]})
+
+            groups = {}
+            for i, name in enumerate(arrays.group_names):
+                groups[name] = sorted(arrays.group_ids(i).tolist())
+            self.assertDictEqual(groups, {'PID 8 edges': [12],
+                                          'PID 7 faces': [10, 11]})
+
+    def test_write_bdf(self):
+        fn = os.path.join(self.tmpdir, 'written.bdf')
+        arrays = _mesh_arrays()
+        # Only the face elements are written so the edge may have no part
+        self.assertTrue(write_bdf(arrays, fn, [0, 4, 5]))
+        arrays = read_bdf(fn)
+        self.assertListEqual(sorted(arrays.elm_ids.tolist()), [6, 7])
+        groups = {}
+        for i, name in enumerate(arrays.group_names):
+            groups[name] = arrays.group_ids(i).tolist()
+        self.assertDictEqual(groups, {'PID 4 faces': [6], 'PID 5 faces': [7]})
+
+        self.assertRaises(ValueError, write_bdf, _mesh_arrays(), fn,
+                          [1, 0, 5])
+        self.assertRaises(ValueError, write_bdf, _mesh_arrays(), fn, [4, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()
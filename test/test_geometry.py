@@ -66,6 +66,22 @@ class TestGeometryCreate(unittest.TestCase):
         self.assertAlmostEqual(u2, 5.)
         self.assertAlmostEqual(u3, 10.)
 
+    def test_point_array(self):
+        pnts = PointArray([(0., 0., 0.), Point(1., 2., 3.), (4., 5., 6.)])
+        self.assertEqual(len(pnts), 3)
+        xyz = pnts.__array__()
+        self.assertIs(xyz, pnts.xyz)
+        p = pnts[1]
+        self.assertIsInstance(p, Point)
+        self.assertAlmostEqual(p.y, 2.)
+        p.translate((1., 1., 1.))
+        self.assertAlmostEqual(pnts.xyz[1, 0], 2.)
+        self.assertEqual(pnts.index((4., 5., 6.)), 2)
+        self.assertAlmostEqual(pnts.nearest((4., 5., 7.)).z, 6.)
+        sub = pnts[1:]
+        self.assertIsInstance(sub, PointArray)
+        self.assertEqual(len(sub), 2)
+
     def test_points_along_curve_by_distance(self):
         p1 = Point()
         p2 = Point(10., 0., 0.)
@@ -168,6 +184,18 @@ class TestGeometryCreate(unittest.TestCase):
         self.assertIsInstance(c, NurbsCurve)
         self.assertAlmostEqual(p.x, 5.)
 
+    def test_nurbs_curve_cached_data(self):
+        cp = [(0, 0, 0), (10, 0, 0)]
+        c = NurbsCurve.by_data(cp, [0, 1], [2, 2], 1)
+        cp1 = c.cp
+        self.assertIs(c.cp, cp1)
+        self.assertEqual(cp1.shape, (2, 3))
+        self.assertAlmostEqual(cp1[1, 0], 10.)
+        c.set_cp(2, Point(20., 0., 0.))
+        self.assertAlmostEqual(c.cp[1, 0], 20.)
+        c.set_domain(0., 2.)
+        self.assertAlmostEqual(c.knots[-1], 2.)
+
     def test_nurbs_curve_by_interp(self):
         qp = [(0, 0, 0), (5, 5, 0), (10, 0, 0)]
         c = NurbsCurveByInterp(qp).curve
@@ -315,6 +343,24 @@ class TestGeometryCreate(unittest.TestCase):
         self.assertAlmostEqual(u2, 5.)
         self.assertAlmostEqual(u3, 10.)
 
+    def test_plane_family_rotate(self):
+        line = LineByPoints((0., 0., 0.), (10., 0., 0.)).line
+        builder1 = PlanesAlongCurveByNumber(line, 3)
+        builder2 = PlanesAlongCurveByNumber(line, 3)
+        self.assertFalse(builder1.family.is_built)
+        builder1.family.rotate_x(30.)
+        builder1.family.rotate_y(15.)
+        self.assertFalse(builder1.family.is_built)
+        self.assertEqual(len(builder2.planes), 3)
+        builder2.family.rotate_x(30.)
+        builder2.family.rotate_y(15.)
+        for pln1, pln2 in zip(builder1.planes, builder2.planes):
+            n1 = pln1.gp_pln.Axis().Direction()
+            n2 = pln2.gp_pln.Axis().Direction()
+            self.assertAlmostEqual(n1.X(), n2.X())
+            self.assertAlmostEqual(n1.Y(), n2.Y())
+            self.assertAlmostEqual(n1.Z(), n2.Z())
+
     def test_planes_between_planes_by_number(self):
         pln1 = PlaneByNormal((0., 0., 0.), (1., 0., 0.)).plane
         pln2 = PlaneByNormal((10., 0., 0.), (1., 0., 0.)).plane
@@ -349,6 +395,18 @@ class TestGeometryCreate(unittest.TestCase):
         self.assertAlmostEqual(p.y, 5.)
         self.assertAlmostEqual(p.z, 5.)
 
+    def test_nurbs_surface_by_data(self):
+        cp = [[(0., 0., 0.), (0., 10., 0.)],
+              [(10., 0., 0.), (10., 10., 0.)]]
+        s = NurbsSurface.by_data(cp, [0, 1], [0, 1], [2, 2], [2, 2], 1, 1)
+        self.assertIsInstance(s, NurbsSurface)
+        self.assertEqual(s.cp.shape, (2, 2, 3))
+        self.assertEqual(s.w.shape, (2, 2))
+        self.assertAlmostEqual(s.cp[1, 1, 1], 10.)
+        self.assertAlmostEqual(s.cpw[1, 1, 3], 1.)
+        s.translate((0., 0., 5.))
+        self.assertAlmostEqual(s.cp[1, 1, 2], 5.)
+
     def test_nurbs_surface_by_approx(self):
         c1 = NurbsCurveByPoints([(0., 0., 0.), (10., 0., 0.)]).curve
         c2 = NurbsCurveByPoints([(0., 5., 5.), (10., 5., 5.)]).curve
@@ -373,6 +431,29 @@ class TestGeometryDistance(unittest.TestCase):
         dist = DistancePointToCurve(p, c)
         self.assertEqual(dist.nsol, 3)
 
+    def test_curve_index(self):
+        c1 = NurbsCurveByPoints([(0., 0., 0.), (10., 0., 0.)]).curve
+        c2 = NurbsCurveByPoints([(0., 5., 0.), (10., 5., 0.)]).curve
+        c3 = NurbsCurveByPoints([(20., 0., 0.), (20., 10., 0.)]).curve
+        index = CurveIndex([c1, c2, c3])
+        i, d = index.nearest((5., 4., 0.))
+        self.assertEqual(i, 1)
+        self.assertAlmostEqual(d, 1.)
+        indices, distances = index.nearest_many([(5., 1., 0.),
+                                                 (30., 5., 0.)])
+        self.assertListEqual(indices.tolist(), [0, 2])
+        self.assertAlmostEqual(distances[0], 1.)
+        self.assertAlmostEqual(distances[1], 10.)
+
+        # The arc deviates from its only segment by more than half the chord
+        c4 = NurbsCurveByInterp([(0., 0., 0.), (5., 8., 0.),
+                                 (10., 0., 0.)]).curve
+        c5 = NurbsCurveByPoints([(0., 17., 0.), (10., 17., 0.)]).curve
+        index = CurveIndex([c4, c5], nsample=2)
+        i, d = index.nearest((5., 12., 0.))
+        self.assertEqual(i, 0)
+        self.assertAlmostEqual(d, 4.)
+
 
 class TestGeometryIntersect(unittest.TestCase):
     """
@@ -390,6 +471,31 @@ class TestGeometryIntersect(unittest.TestCase):
         self.assertAlmostEqual(p.y, 0.)
         self.assertAlmostEqual(p.z, 0.)
 
+    def test_intersect_curves_curves(self):
+        c1 = NurbsCurveByPoints([(0., 0., 0.), (10., 0., 0.)]).curve
+        c2 = NurbsCurveByPoints([(5., -5., 0.), (5., 5., 0.)]).curve
+        c3 = NurbsCurveByPoints([(20., -5., 0.), (20., 5., 0.)]).curve
+        c4 = LineByPoints((0., 2., 0.), (1., 2., 0.)).line
+        c4 = TrimmedCurve.by_parameters(c4, 0., 30.)
+        cci = IntersectCurvesCurves([c1, c4], [c2, c3])
+        self.assertEqual(cci.ncandidates, 3)
+        self.assertEqual(cci.npts, 3)
+        self.assertListEqual(cci.indices.tolist(), [[0, 0], [1, 0], [1, 1]])
+        p = cci.points[1]
+        self.assertAlmostEqual(p.x, 5.)
+        self.assertAlmostEqual(p.y, 2.)
+        self.assertAlmostEqual(p.z, 0.)
+        self.assertEqual(cci.table.shape, (3, 7))
+
+    def test_intersect_curves_curves_sampled(self):
+        # Both samples of the circle are at the same point so the box must
+        # account for the arc between them
+        c1 = CircleByNormal((0., 0., 0.), (0., 0., 1.), 1.).circle
+        c2 = NurbsCurveByPoints([(-2., 0.5, 0.), (2., 0.5, 0.)]).curve
+        cci = IntersectCurvesCurves([c1], [c2], nsample=2)
+        self.assertEqual(cci.ncandidates, 1)
+        self.assertEqual(cci.npts, 2)
+
     def test_intersect_curve_surface(self):
         c = NurbsCurveByPoints([(5., 5., 10.), (5., 5., -10.)]).curve
         c1 = NurbsCurveByPoints([(0., 0., 0.), (10., 0., 0.)]).curve
@@ -457,6 +563,38 @@ class TestGeometryProject(unittest.TestCase):
         self.assertAlmostEqual(proj.nearest_param[1], 1.)
         self.assertAlmostEqual(proj.dmin, 1.)
 
+    def test_project_points_to_surface(self):
+        cp = [[(i, j, 0.25 * i * (3 - j)) for j in range(4)]
+              for i in range(4)]
+        srf = NurbsSurface.by_data(cp, [0., 1.], [0., 1.], [4, 4], [4, 4],
+                                   3, 3)
+        pnts = PointArray([(x, y, 1.) for x in (0.5, 1., 1.5, 2.5)
+                           for y in (0.5, 1.5, 2.5)])
+        proj = ProjectPointsToSurface(pnts, srf)
+        self.assertEqual(proj.npts, len(pnts))
+        for i, p in enumerate(pnts):
+            proj1 = ProjectPointToSurface(p, srf)
+            self.assertAlmostEqual(proj.distances[i], proj1.dmin, places=5)
+            self.assertTrue(proj.points[i].is_equal(proj1.nearest_point,
+                                                    1.0e-5))
+        self.assertTrue(proj.status.all())
+        ProjectPointsToSurface(pnts, srf, update=True)
+        self.assertTrue(pnts[0].is_equal(proj.points[0]))
+
+        # Nearest point is on the boundary
+        p = Point(10., 1.5, 0.)
+        proj = ProjectPointsToSurface([p], srf)
+        self.assertFalse(proj.status[0])
+        self.assertFalse(ProjectPointToSurface(p, srf).success)
+
+    def test_project_points_to_rotated_plane(self):
+        pln = PlaneByNormal((0., 0., 0.), (0., 0., 1.)).plane
+        d = pln.project_points([(0., 0., 1.)])[2]
+        self.assertAlmostEqual(d[0], 1.)
+        pln.rotate_x(90.)
+        d = pln.project_points([(0., 0., 1.)])[2]
+        self.assertAlmostEqual(d[0], 0.)
+
     def test_project_curve_to_plane(self):
         qp = [Point(), Point(5., 5., 1.), Point(10., 5., 1.)]
         c = NurbsCurveByInterp(qp).curve
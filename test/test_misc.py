@@ -0,0 +1,52 @@
+# This file is part of AFEM which provides an engineering toolkit for airframe
+# finite element modeling during conceptual design.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC (info@laughlinresearch.com)
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import unittest
+
+from afem.misc.pipeline import Pipeline
+
+
+class TestMiscPipeline(unittest.TestCase):
+    """
+    Test cases for afem.misc.pipeline.
+    """
+
+    def test_pipeline(self):
+        pipe = Pipeline(nworkers=2)
+        pipe.add_stage('volume', lambda: 10. ** 3, background=True)
+        pipe.add_stage('area', lambda: 6. * 10. ** 2)
+        pipe.add_stage('ratio', lambda: pipe.result('volume') /
+                       pipe.result('area'), deps=('volume', 'area'))
+        results = pipe.run()
+        self.assertAlmostEqual(results['volume'], 1000.)
+        self.assertAlmostEqual(results['ratio'], 1000. / 600.)
+        self.assertEqual(list(pipe.timings.keys()), ['volume', 'area',
+                                                     'ratio'])
+
+    def test_pipeline_skip(self):
+        pipe = Pipeline()
+        pipe.add_stage('fail', lambda: 1. / 0., background=True)
+        pipe.add_stage('next', lambda: 1., deps=('fail',))
+        self.assertRaises(ValueError, pipe.add_stage, 'next', lambda: 1.)
+        self.assertRaises(RuntimeError, pipe.run)
+        self.assertEqual(pipe.stages[0].status, 'failed')
+        self.assertEqual(pipe.stages[1].status, 'skipped')
+
+
+if __name__ == '__main__':
+    unittest.main()
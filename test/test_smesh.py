@@ -0,0 +1,124 @@
+# This file is part of AFEM which provides an engineering toolkit for airframe
+# finite element modeling during conceptual design.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC (info@laughlinresearch.com)
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import unittest
+from types import SimpleNamespace
+
+from afem.smesh.entities import Mesh, MeshGen, MeshIdSet
+from afem.smesh.hypotheses import LocalLength1D, QuadrangleAlgo2D, Regular1D
+from afem.topology.create import BoxBySize
+
+
+class TestSmeshIdSet(unittest.TestCase):
+    """
+    Test cases for afem.smesh.entities.MeshIdSet.
+    """
+
+    def setUp(self):
+        # Only the mesh ID is used by the set operations
+        self.mesh = SimpleNamespace(id=1)
+        self.s1 = MeshIdSet(self.mesh, Mesh.FACE, [5, 1, 3, 3, 7])
+        self.s2 = MeshIdSet(self.mesh, Mesh.FACE, [3, 4, 5])
+        self.s3 = MeshIdSet(self.mesh, Mesh.FACE, [5, 6, 3, 9])
+
+    def test_init(self):
+        self.assertListEqual(self.s1.ids.tolist(), [1, 3, 5, 7])
+        self.assertEqual(len(self.s1), 4)
+        self.assertEqual(self.s1.size, 4)
+        self.assertFalse(self.s1.is_empty)
+        self.assertTrue(MeshIdSet(self.mesh, Mesh.FACE).is_empty)
+
+    def test_union(self):
+        s = self.s1.union(self.s2, self.s3)
+        self.assertListEqual(s.ids.tolist(), [1, 3, 4, 5, 6, 7, 9])
+        s = self.s1 | self.s2
+        self.assertListEqual(s.ids.tolist(), [1, 3, 4, 5, 7])
+        s = MeshIdSet.union_all([self.s1, self.s2, self.s3])
+        self.assertListEqual(s.ids.tolist(), [1, 3, 4, 5, 6, 7, 9])
+        self.assertRaises(ValueError, MeshIdSet.union_all, [])
+
+    def test_intersect(self):
+        s = self.s1.intersect(self.s2, self.s3)
+        self.assertListEqual(s.ids.tolist(), [3, 5])
+        s = self.s1 & self.s3
+        self.assertListEqual(s.ids.tolist(), [3, 5])
+        s = MeshIdSet.intersect_all([self.s2, self.s3])
+        self.assertListEqual(s.ids.tolist(), [3, 5])
+        empty = MeshIdSet(self.mesh, Mesh.FACE)
+        self.assertTrue(self.s1.intersect(empty).is_empty)
+
+    def test_subtract(self):
+        s = self.s1.subtract(self.s2, self.s3)
+        self.assertListEqual(s.ids.tolist(), [1, 7])
+        s = self.s3 - self.s1
+        self.assertListEqual(s.ids.tolist(), [6, 9])
+        self.assertListEqual(self.s1.subtract().ids.tolist(), [1, 3, 5, 7])
+
+    def test_contains(self):
+        mask = self.s1.contains([0, 1, 2, 7, 8])
+        self.assertListEqual(mask.tolist(), [False, True, False, True,
+                                             False])
+        self.assertIn(5, self.s1)
+        self.assertNotIn(4, self.s1)
+        self.assertNotIn(8, self.s1)
+        self.assertNotIn(1, MeshIdSet(self.mesh, Mesh.FACE))
+
+    def test_check(self):
+        edges = MeshIdSet(self.mesh, Mesh.EDGE, [1, 2])
+        self.assertRaises(TypeError, self.s1.union, edges)
+        other = MeshIdSet(SimpleNamespace(id=2), Mesh.FACE, [1, 2])
+        self.assertRaises(TypeError, self.s1.intersect, other)
+        self.assertRaises(TypeError, self.s1.subtract, self.s2, other)
+
+
+class TestSmeshMeshGen(unittest.TestCase):
+    """
+    Test cases for afem.smesh.entities.MeshGen.
+    """
+
+    def test_hypothesis(self):
+        gen = MeshGen()
+        hyp = gen.hypothesis(LocalLength1D, 2.)
+        self.assertIs(gen.hypothesis(LocalLength1D, 2.), hyp)
+        self.assertIsNot(gen.hypothesis(LocalLength1D, 3.), hyp)
+        self.assertIs(gen.hypothesis(Regular1D), gen.hypothesis(Regular1D))
+
+        unshared = gen.hypothesis(LocalLength1D, 2., shared=False)
+        self.assertIsNot(unshared, hyp)
+        self.assertAlmostEqual(unshared.local_length, 2.)
+        self.assertIs(gen.hypothesis(LocalLength1D, 2.), hyp)
+
+        self.assertEqual(gen.num_hypotheses, 3)
+        self.assertDictEqual(gen.hypothesis_counts(),
+                             {'LocalLength1D': 2, 'Regular1D': 1})
+
+    def test_add_hypotheses_to_shapes(self):
+        box = BoxBySize(10., 10., 10.).solid
+        gen = MeshGen()
+        mesh = gen.create_mesh(box)
+        alg = gen.hypothesis(QuadrangleAlgo2D)
+
+        # A 2-D algorithm can be added to the faces but not the edges
+        failed = mesh.add_hypotheses_to_shapes([alg], box.faces + box.edges)
+        self.assertEqual(len(failed), box.num_edges)
+        for shape, _ in failed:
+            self.assertTrue(shape.is_edge)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,11 +17,16 @@
 # License along with this library; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
 import unittest
+from types import SimpleNamespace
+
+from numpy import array, zeros
 
 from afem.exchange import brep
+from afem.exchange.binmesh import MeshArrays
 from afem.geometry import *
 from afem.oml import *
 from afem.structure import *
+from afem.structure.mesh import MeshPartMap
 from afem.topology import *
 
 
@@ -86,6 +91,63 @@ class TestStructureEntities(unittest.TestCase):
     def test_part_cref(self):
         self.assertIsInstance(self.fspar.cref, TrimmedCurve)
 
+    def test_part_point_from_parameter(self):
+        p = self.fspar.point_from_parameter(0.5, is_rel=True)
+        cref = self.fspar.cref
+        p2 = PointFromParameter(cref, cref.u1, 0.5 * cref.length).point
+        self.assertAlmostEqual(p.distance(p2), 0., places=5)
+        self.assertAlmostEqual(self.fspar.length, cref.length, places=5)
+
+    def test_part_version_events(self):
+        events = []
+
+        def callback(item, event, old, new):
+            events.append((item, event))
+
+        master = GroupAPI.get_master()
+        master.subscribe(callback)
+        compound = master.get_shape()
+        self.assertIs(master.get_shape(), compound)
+        version, group_version = self.part1.version, master.version
+        self.part1.set_u1(self.part1.cref.u1)
+        master.unsubscribe(callback)
+        self.assertEqual(self.part1.version, version + 1)
+        self.assertEqual(master.version, group_version + 1)
+        self.assertListEqual(events, [(self.part1, 'cref')])
+        self.assertIsNot(master.get_shape(), compound)
+
+    def test_mass_rollup(self):
+        rollup = MassRollup({'Spar': 2.}, 0.5)
+        by_type = rollup.by_type()
+        self.assertEqual(by_type['Spar'].nparts, 2)
+        area = SurfaceProps(self.fspar.shape).area
+        self.assertAlmostEqual(rollup.part_props(self.fspar).mass, area)
+        ncached = rollup.ncached
+        total = rollup.total()
+        self.assertEqual(rollup.ncached, ncached)
+        self.assertEqual(total.nparts, ncached)
+        mass = sum(props.mass for props in by_type.values())
+        self.assertAlmostEqual(total.mass, mass)
+
+    def test_validate_group(self):
+        validator = ValidateGroup(nthreads=2)
+        self.assertTrue(validator.validate())
+        ncached = validator.ncached
+        self.assertGreater(ncached, 0)
+        self.assertTrue(validator.validate())
+        self.assertEqual(validator.ncached, ncached)
+        self.assertEqual(validator.invalid_parts, [])
+        self.assertEqual(validator.summary(), '')
+
+    def test_group_prune_cache(self):
+        master = GroupAPI.get_master()
+        self.assertIs(GroupAPI.get_group_or_master(None), master)
+        cache = {'a': 1, 'b': 2}
+        self.assertFalse(GroupAPI.prune_cache(cache, ['a'], master, False))
+        self.assertEqual(cache, {'a': 1, 'b': 2})
+        self.assertTrue(GroupAPI.prune_cache(cache, ['a'], master))
+        self.assertEqual(cache, {'a': 1})
+
     def test_part_sref(self):
         self.assertIsInstance(self.fspar.sref, Plane)
 
@@ -177,6 +239,13 @@ class TestStructureCreate(unittest.TestCase):
         spar = builder.part
         self.assertIsInstance(spar, Spar)
 
+    def test_spar_by_ends_off_surface(self):
+        p1 = (0.5, 0.)
+        p2 = self.wing.sref.eval(0.5, 1.)
+        p2.y += 1000.
+        with self.assertRaises(RuntimeError):
+            SparByEnds('spar', p1, p2, self.wing)
+
     def test_spar_by_surface(self):
         p0 = self.wing.sref.eval(0.5, 0.)
         pln = PlaneByAxes(p0, 'yz').plane
@@ -446,5 +515,145 @@ class TestStructureCreate(unittest.TestCase):
         self.assertIsInstance(skin, Skin)
 
 
+class TestStructureCheck(unittest.TestCase):
+    """
+    Test cases for afem.structure.check.
+    """
+
+    def tearDown(self):
+        GroupAPI.reset()
+
+    def test_validate_group_fix(self):
+        # The second edge starts 1.0e-4 from the end of the first edge so the
+        # wire joins them at a vertex with a large tolerance
+        e1 = EdgeByPoints((0., 0., 0.), (10., 0., 0.)).edge
+        e2 = EdgeByPoints((10., 1.0e-4, 0.), (10., 10., 0.)).edge
+        e3 = EdgeByPoints((10., 10., 0.), (0., 0., 0.)).edge
+        for e in (e1, e2, e3):
+            FixShape.set_tolerance(e, 1.0e-3)
+        wire = WireByEdges(e1, e2, e3).wire
+        face = FaceByPlanarWire(wire).face
+
+        # Shrink the tolerances so the shared vertex is off the second edge
+        FixShape.set_tolerance(face, 1.0e-7)
+        self.assertFalse(CheckShape(face).is_valid)
+
+        skin = SurfacePartByShape('skin', face).part
+        edge = [e for e in face.edges if CheckShape(e).is_valid][0]
+        beam = CurvePartByShape('beam', edge).part
+
+        validator = ValidateGroup()
+        self.assertFalse(validator.validate())
+        self.assertEqual(validator.invalid_parts, [skin])
+        self.assertGreater(len(validator.errors(skin)), 0)
+        self.assertNotEqual(validator.summary(), '')
+
+        self.assertTrue(validator.fix())
+        self.assertTrue(validator.is_valid)
+        self.assertTrue(skin.check())
+        self.assertTrue(validator.validate())
+
+        # The beam still shares its edge with the skin
+        edge = beam.shape.edges[0]
+        self.assertTrue(any(e.is_same(edge) for e in skin.shape.edges))
+
+
+class TestStructureMesh(unittest.TestCase):
+    """
+    Test cases for afem.structure.mesh.
+    """
+
+    def test_part_map_from_arrays(self):
+        data = {'node_ids': array([10, 11, 12, 13, 14, 15]),
+                'node_xyz': zeros((6, 3)),
+                'node_shapes': array([1, 2, 3, 4, 0, -1]),
+                'elm_ids': array([100, 101, 102, 103, 104]),
+                'elm_types': array([3, 3, 2, 2, 2]),
+                'elm_shapes': array([1, 2, 3, 0, 5]),
+                'elm_offsets': zeros(6, dtype=int),
+                'elm_nodes': zeros(0, dtype=int),
+                'group_offsets': zeros(1, dtype=int),
+                'group_members': zeros(0, dtype=int)}
+        arrays = MeshArrays(data)
+        part1, part2 = SimpleNamespace(id=1), SimpleNamespace(id=2)
+
+        # Shapes 1 and 2 are faces, 3 is a shared edge, and 4 is a shared
+        # vertex. Shape 5 and indices of 0 or less are not on a part.
+        shape_parts = {1: {1}, 2: {2}, 3: {2, 1}, 4: {1, 2}}
+        pmap = MeshPartMap.from_arrays([part1, part2], arrays, shape_parts)
+
+        self.assertListEqual(pmap.elm_parts.tolist(), [1, 2, 1, 0, 0])
+        self.assertListEqual(pmap.node_offsets.tolist(),
+                             [0, 1, 2, 4, 6, 6, 6])
+        self.assertListEqual(pmap.node_parts.tolist(), [1, 2, 1, 2, 1, 2])
+        self.assertListEqual(pmap.node_part_ids(2).tolist(), [1, 2])
+        self.assertEqual(pmap.node_part_ids(5).size, 0)
+        self.assertListEqual(pmap.part_elements(part1).tolist(), [100, 102])
+        self.assertListEqual(pmap.part_elements(part2).tolist(), [101])
+        self.assertListEqual(pmap.part_nodes(part1).tolist(), [10, 12, 13])
+        self.assertListEqual(pmap.part_nodes(part2).tolist(), [11, 12, 13])
+        self.assertIs(pmap.get_part(2), part2)
+        self.assertIsNone(pmap.get_part(0))
+
+
+class TestStructureSweep(unittest.TestCase):
+    """
+    Test cases for afem.structure.sweep.
+    """
+
+    def tearDown(self):
+        GroupAPI.reset()
+
+    @staticmethod
+    def _build(shared, a, b):
+        GroupAPI.create_group('sweep group')
+        return {'total': shared + a * b}
+
+    def test_add_grid(self):
+        sweep = DesignSweep(lambda: 1., self._build, nworkers=1)
+        points = sweep.add_grid(a=[1., 2.], b=[10., 20.])
+        self.assertEqual(len(points), 4)
+        self.assertEqual(points[0].name, 'point_1')
+        self.assertDictEqual(dict(points[1].params), {'a': 1., 'b': 20.})
+        self.assertDictEqual(dict(points[3].params), {'a': 2., 'b': 20.})
+        self.assertTrue(all(p.status == 'pending' for p in sweep.points))
+
+    def test_run_serial(self):
+        group = GroupAPI.create_group('caller group')
+        master = GroupAPI.get_master()
+        sweep = DesignSweep(lambda: 1., self._build, nworkers=1)
+        sweep.add_grid(a=[1., 2.], b=[10.])
+        sweep.add_point('bad', a=None, b=10.)
+        points = sweep.run()
+        self.assertEqual(points[0].status, 'done')
+        self.assertAlmostEqual(points[0].result['total'], 11.)
+        self.assertAlmostEqual(points[1].result['total'], 21.)
+        self.assertEqual(points[2].status, 'failed')
+        self.assertIn('TypeError', points[2].error)
+
+        # The groups of the caller are restored
+        self.assertIs(GroupAPI.get_master(), master)
+        self.assertIs(GroupAPI.get_active(), group)
+        self.assertIs(GroupAPI.get_group('caller group'), group)
+        self.assertListEqual([g.name for g in master.children],
+                             ['caller group'])
+
+    def test_table(self):
+        sweep = DesignSweep(lambda: 1., self._build, nworkers=1)
+        sweep.add_point('p1', a=1., b=10.)
+        sweep.add_point('p2', a=2., b=10.)
+        sweep.run()
+        lines = sweep.table().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertListEqual(lines[0].split(),
+                             ['name', 'a', 'b', 'total', 'time', 'status'])
+        row = lines[2].split()
+        self.assertListEqual(row[:4], ['p2', '2', '10', '21'])
+        self.assertEqual(row[-1], 'done')
+        lines = sweep.table(keys=[]).splitlines()
+        self.assertListEqual(lines[0].split(),
+                             ['name', 'a', 'b', 'time', 'status'])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -18,10 +18,13 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
 import unittest
 
+from afem.core.entities import ShapeHolder
 from afem.exchange import brep
 from afem.geometry import *
 from afem.graphics import Viewer
+from afem.misc.trace import Tracer
 from afem.topology import *
+from afem.topology.transform import mirror_shape
 
 
 def show_shapes(*shapes):
@@ -124,6 +127,26 @@ class TestTopologyCreate(unittest.TestCase):
         self.assertIsInstance(w, Wire)
         self.assertAlmostEqual(w.length, 11.41421, places=5)
 
+    def test_wires_by_edge_endpoints(self):
+        e1 = EdgeByPoints((10., 0., 0.), (11., 1., 0.)).edge
+        e2 = EdgeByPoints((20., 0., 0.), (21., 0., 0.)).edge
+        e3 = EdgeByPoints((10., 0., 0.), (0., 0., 0.)).edge
+        builder = WiresByEdgeEndpoints([e1, e2, e3])
+        self.assertEqual(builder.nwires, 2)
+        w = builder.wires[0]
+        self.assertIsInstance(w, Wire)
+        self.assertAlmostEqual(w.length, 11.41421, places=5)
+        self.assertEqual(builder.edge_order(0), [0, 2])
+        self.assertEqual(builder.is_reversed(0), [True, False])
+        self.assertFalse(builder.is_closed(0))
+
+        face = BoxBySize(10., 10., 10.).solid.faces[0]
+        builder = WiresByEdgeEndpoints(list(reversed(face.edges)))
+        self.assertEqual(builder.nwires, 1)
+        self.assertTrue(builder.is_closed(0))
+        self.assertTrue(builder.wires[0].closed)
+        self.assertAlmostEqual(builder.wires[0].length, 40., places=5)
+
     def test_wire_by_points(self):
         p1 = (0., 0., 0.)
         p2 = (1., 0., 0.)
@@ -349,6 +372,28 @@ class TestTopologyBop(unittest.TestCase):
         fuse.build()
         self.assertTrue(fuse.is_done)
 
+    def test_fuse_shapes_traced(self):
+        e1 = EdgeByPoints((0., 0., 0.), (10., 0., 0.)).edge
+        e2 = EdgeByPoints((5., 1., 0.), (5., -1., 0.)).edge
+        Tracer.enable()
+        try:
+            with Tracer.span('outer'):
+                FuseShapes(e1, e2)
+        finally:
+            Tracer.disable()
+        spans = Tracer.spans()
+        self.assertEqual(len(spans), 2)
+        build, outer = spans
+        self.assertEqual(build.name, 'BopCore.build')
+        self.assertIs(build.parent, outer)
+        self.assertEqual(build.depth, 1)
+        self.assertEqual(build.attrs['op'], 'FuseShapes')
+        self.assertEqual(build.attrs['n_args'], 1)
+        self.assertEqual(build.attrs['n_tools'], 1)
+        self.assertTrue(build.attrs['is_done'])
+        self.assertIn('BopCore.build', Tracer.summary())
+        Tracer.clear()
+
     def test_cut_shapes(self):
         e1 = EdgeByPoints((0., 0., 0.), (10., 0., 0.)).edge
         e2 = EdgeByPoints((5., 0., 0.), (6., 0., 0.)).edge
@@ -542,6 +587,51 @@ class TestTopologyDistance(unittest.TestCase):
         self.assertAlmostEqual(tool.sorted_distances[0], 5.)
         self.assertAlmostEqual(tool.sorted_distances[1], 10.)
 
+    def test_distance_point_to_shapes_index(self):
+        c = NurbsCurveByPoints([(0., 0., 0.), (10., 0., 0.)]).curve
+        index = CurveIndex([c])
+        self.assertRaises(TypeError, DistancePointToShapes, (5., 1., 0.),
+                          index)
+        e = EdgeByCurve(c).edge
+        tool = DistancePointToShapes((5., 1., 0.), CurveIndex([e]))
+        self.assertAlmostEqual(tool.dmin, 1.)
+        self.assertTrue(tool.nearest_shape.is_same(e))
+
+
+class TestTopologyEntities(unittest.TestCase):
+    """
+    Test cases for afem.topology.entities.
+    """
+
+    def test_shape_ancestors(self):
+        box = BoxBySize(10., 10., 10.).solid
+        self.assertEqual(box.num_edges, 12)
+        edge = box.edges[0]
+        self.assertTrue(box.contains(edge))
+        self.assertEqual(box.index_of(edge), 0)
+        self.assertEqual(len(box.edge_faces(edge)), 2)
+        self.assertEqual(len(box.vertex_edges(box.vertices[0])), 3)
+        face = box.faces[0]
+        self.assertEqual(len(box.shared_edges(face)), 4)
+        other = BoxBySize(1., 1., 1.).solid
+        self.assertFalse(box.contains(other.edges[0]))
+        self.assertEqual(box.index_of(other.edges[0]), -1)
+        self.assertListEqual(box.edge_faces(other.edges[0]), [])
+
+    def test_shape_sub_shapes_are_new(self):
+        box = BoxBySize(10., 10., 10.).solid
+        face = box.faces[0]
+        self.assertIsNot(box.faces[0], face)
+        orientation = face.object.Orientation()
+        face.reverse()
+        self.assertEqual(box.faces[0].object.Orientation(), orientation)
+
+    def test_shape_tolerance_of_sub_shape(self):
+        box = BoxBySize(10., 10., 10.).solid
+        self.assertLess(box.tol_max, 0.1)
+        FixShape.set_tolerance(box.vertices[0], 0.1, Shape.VERTEX)
+        self.assertAlmostEqual(box.tol_max, 0.1)
+
 
 class TestTopologyExplore(unittest.TestCase):
     """
@@ -660,5 +750,84 @@ class TestTopologyProps(unittest.TestCase):
         self.assertAlmostEqual(p.z, 0.5)
 
 
+class TestTopologyTessellate(unittest.TestCase):
+    """
+    Test cases for afem.topology.tessellate.
+    """
+
+    def tearDown(self):
+        TessellationCache.clear()
+
+    def test_tessellation_cache(self):
+        box = BoxBySize(10., 10., 10.).solid
+        tess = TessellationCache.get(box, 0.01)
+        self.assertEqual(tess.ntris, 12)
+        self.assertIs(TessellationCache.get(box, 0.01), tess)
+        self.assertEqual(TessellationCache.size(), 1)
+        pmin, pmax = tess.bounds(0.)
+        self.assertListEqual(pmin.tolist(), [0., 0., 0.])
+        self.assertListEqual(pmax.tolist(), [10., 10., 10.])
+        d = tess.nearest_distance([(11., 10., 10.)])
+        self.assertAlmostEqual(d[0], 1.)
+        TessellationCache.discard(box)
+        self.assertEqual(TessellationCache.size(), 0)
+
+    def test_tessellation_of_instance(self):
+        box = BoxBySize(10., 10., 10.).solid
+        tess = TessellationCache.get(box, 0.01)
+        pln = PlaneByAxes(axes='xz').plane
+        mirrored = mirror_shape(box, pln, True)
+        tess2 = TessellationCache.get(mirrored, 0.01)
+        self.assertEqual(tess2.ntris, tess.ntris)
+        pmin, pmax = tess2.bounds(0.)
+        self.assertListEqual(pmin.tolist(), [0., -10., 0.])
+        self.assertListEqual(pmax.tolist(), [10., 0., 10.])
+        TessellationCache.discard(box)
+        self.assertEqual(TessellationCache.size(), 0)
+
+    def test_tessellation_of_reversed(self):
+        box = BoxBySize(10., 10., 10.).solid
+        tess = TessellationCache.get(box, 0.01)
+        tess2 = TessellationCache.get(box.reversed(), 0.01)
+        self.assertIsNot(tess2, tess)
+        self.assertTrue(tess2.shape.object.IsEqual(box.reversed().object))
+        self.assertListEqual(tess2.normals.tolist(),
+                             (-tess.normals).tolist())
+
+    def test_tessellation_of_versions(self):
+        box = BoxBySize(10., 10., 10.).solid
+        holder = ShapeHolder('box', box)
+        tess = TessellationCache.get(holder, 0.01)
+        self.assertIs(TessellationCache.get(holder, 0.01), tess)
+        holder.notify('shape', box, box)
+        self.assertIsNot(TessellationCache.get(holder, 0.01), tess)
+        self.assertEqual(TessellationCache.size(), 1)
+
+
+class TestTopologyTransform(unittest.TestCase):
+    """
+    Test cases for afem.topology.transform.
+    """
+
+    def test_mirror_shape_instance(self):
+        box = BoxBySize(10., 10., 10.).solid
+        pln = PlaneByAxes(axes='xz').plane
+        mirrored = mirror_shape(box, pln, True)
+        self.assertTrue(mirrored.is_partner(box))
+        self.assertFalse(mirrored.is_same(box))
+        self.assertAlmostEqual(mirrored.volume, 1000.)
+        bbox = BBox()
+        bbox.add_shape(mirrored)
+        self.assertAlmostEqual(bbox.ymax, 0., places=5)
+        self.assertAlmostEqual(bbox.ymin, -10., places=5)
+
+    def test_mirror_shape_copy(self):
+        box = BoxBySize(10., 10., 10.).solid
+        pln = PlaneByAxes(axes='xz').plane
+        mirrored = mirror_shape(box, pln)
+        self.assertFalse(mirrored.is_partner(box))
+        self.assertAlmostEqual(mirrored.volume, 1000.)
+
+
 if __name__ == '__main__':
     unittest.main()